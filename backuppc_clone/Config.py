@@ -1,8 +1,6 @@
 import configparser
 from pathlib import Path
 
-from backuppc_clone.DataLayer import DataLayer
-
 
 class Config:
     """
@@ -32,6 +30,11 @@ class Config:
         The path to the configuration file of the clone.
         """
 
+        self.__config_clone: configparser.ConfigParser | None = None
+        """
+        The configuration of the clone.
+        """
+
         self.__stats_filename: str | None = None
         """
         The path to the stats file.
@@ -62,6 +65,207 @@ class Config:
         The pc dir of the original.
         """
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __get_config_clone(self) -> configparser.ConfigParser:
+        """
+        Returns the configuration of the clone.
+        """
+        if self.__config_clone is None:
+            self.__config_clone = configparser.ConfigParser()
+            self.__config_clone.read(self.__config_path)
+
+        return self.__config_clone
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def scratch_dir_path(self) -> Path | None:
+        """
+        Returns the path to the directory for the scratch database or None when the scratch database must be kept in
+        memory.
+        """
+        scratch_dir = self.__get_config_clone().get('Database', 'scratch_dir', fallback=None)
+        if scratch_dir is None:
+            return self.tmp_clone_path
+
+        if scratch_dir == 'memory':
+            return None
+
+        return Path(scratch_dir).resolve(True)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def metrics_textfile_path(self) -> Path | None:
+        """
+        Returns the path to the textfile for the textfile collector of the Prometheus node exporter or None when no
+        textfile must be written.
+        """
+        textfile = self.__get_config_clone().get('Metrics', 'textfile', fallback=None)
+        if not textfile:
+            return None
+
+        return Path(textfile)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def slow_query_time(self) -> float:
+        """
+        Returns the execution time in seconds above which SQL statements are logged when SQL statistics are enabled.
+        """
+        return self.__get_config_clone().getfloat('Database', 'slow_query_time', fallback=1.0)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def sql_stats(self) -> bool:
+        """
+        Returns whether the execution times and row counts of SQL statements must be recorded.
+        """
+        return self.__get_config_clone().getboolean('Database', 'sql_stats', fallback=False)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def sql_stats_top(self) -> int:
+        """
+        Returns the number of SQL statements shown in the summary of the SQL statistics.
+        """
+        return self.__get_config_clone().getint('Database', 'sql_stats_top', fallback=10)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def storage_profile(self) -> str:
+        """
+        Returns the name of the storage profile of the metadata database.
+        """
+        return self.__get_config_clone().get('Database', 'profile', fallback='safe')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def scanner_backend(self) -> str:
+        """
+        Returns the name of the backend for scanning the pools and host backups: native, find, or auto.
+        """
+        return self.__get_config_clone().get('Scanner', 'backend', fallback='auto')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def copy_digest(self) -> bool:
+        """
+        Returns whether the digest of a pool file must be computed while copying the pool file.
+        """
+        return self.__get_config_clone().getboolean('Copy', 'digest', fallback=False)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def copy_prefetch(self) -> int:
+        """
+        Returns the number of queued pool files ahead of the current pool file to prefetch into the page cache.
+        """
+        return self.__get_config_clone().getint('Copy', 'prefetch', fallback=0)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def copy_pipeline(self) -> bool:
+        """
+        Returns whether a host backup must be scanned, copied, and populated in a pipeline of chunks.
+        """
+        return self.__get_config_clone().getboolean('Copy', 'pipeline', fallback=False)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def copy_drop_cache(self) -> bool:
+        """
+        Returns whether the cached pages of a copied file (source and target) must be dropped after copying.
+        """
+        return self.__get_config_clone().getboolean('Copy', 'drop_cache', fallback=False)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def copy_direct_io_size(self) -> int:
+        """
+        Returns the minimal size in bytes of files copied with direct I/O (0 for no direct I/O).
+        """
+        return int(self.__get_config_clone().getfloat('Copy', 'direct_io_size', fallback=0.0) * 1024 * 1024)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def durability(self) -> str:
+        """
+        Returns the durability mode of the files of the clone: none, batch, or strict.
+        """
+        return self.__get_config_clone().get('Copy', 'durability', fallback='none')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def governor_workers(self) -> int:
+        """
+        Returns the maximum number of concurrent I/O operations of the parallel engines.
+        """
+        return self.__get_config_clone().getint('Governor', 'workers', fallback=1)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def governor_rate(self) -> float:
+        """
+        Returns the maximum number of bytes moved per second (0 for no limit).
+        """
+        return self.__get_config_clone().getfloat('Governor', 'rate', fallback=0.0) * 1024 * 1024
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def governor_latency_budget(self) -> float:
+        """
+        Returns the latency budget of I/O operations in seconds (0 for no adaptive control).
+        """
+        return self.__get_config_clone().getfloat('Governor', 'latency_budget', fallback=0.0) / 1000.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def governor_ioprio(self) -> str | None:
+        """
+        Returns the I/O scheduling class of the process or None for the default class.
+        """
+        return self.__get_config_clone().get('Governor', 'ioprio', fallback=None)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def governor_nice(self) -> int:
+        """
+        Returns the increment of the niceness of the process.
+        """
+        return self.__get_config_clone().getint('Governor', 'nice', fallback=0)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def plan_reserve(self) -> float:
+        """
+        Returns the fraction of the blocks and inodes of the filesystem of the clone that must remain free after cloning
+        a host backup.
+        """
+        return self.__get_config_clone().getfloat('Plan', 'reserve', fallback=1.0) / 100.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def plan_max_duration(self) -> float:
+        """
+        Returns the maximum estimated duration in seconds of cloning a host backup (0 for no limit).
+        """
+        return self.__get_config_clone().getfloat('Plan', 'max_duration', fallback=0.0) * 60.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def schedule_order(self) -> str:
+        """
+        Returns the order in which backups are cloned: cost or age.
+        """
+        return self.__get_config_clone().get('Schedule', 'order', fallback='cost')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def schedule_batch(self) -> int:
+        """
+        Returns the maximum number of host backups cloned in one batch.
+        """
+        return max(self.__get_config_clone().getint('Schedule', 'batch', fallback=1), 1)
+
     # ------------------------------------------------------------------------------------------------------------------
     @property
     def stats_path(self) -> Path:
@@ -73,12 +277,23 @@ class Config:
 
         return self.__stats_filename
 
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def pool_index_path(self) -> Path:
+        """
+        Returns the path to the pool index file next to the metadata database.
+        """
+        return self.top_clone_path.joinpath('pool.idx')
+
     # ------------------------------------------------------------------------------------------------------------------
     @property
     def last_pool_scan(self) -> int:
         """
         Returns the timestamp of the last original pool scan.
         """
+        # Imported here such that commands without a metadata database (e.g. nagios) do not load sqlite3.
+        from backuppc_clone.DataLayer import DataLayer
+
         return int(DataLayer.instance.parameter_get_value('LAST_POOL_SYNC'))
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -89,6 +304,8 @@ class Config:
 
         @param int value: The timestamp.
         """
+        from backuppc_clone.DataLayer import DataLayer
+
         DataLayer.instance.parameter_update_value('LAST_POOL_SYNC', str(value))
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -109,11 +326,8 @@ class Config:
         Returns the path to the pc directory of the original.
         """
         if self.__pc_dir_original is None:
-            config_clone = configparser.ConfigParser()
-            config_clone.read(self.__config_path)
-
             config_original = configparser.ConfigParser()
-            config_original.read(config_clone['Original']['config'])
+            config_original.read(self.__get_config_clone()['Original']['config'])
 
             self.__pc_dir_original = Path(config_original['Original']['pc_dir']).resolve(True)
 
@@ -148,10 +362,7 @@ class Config:
         Returns the path to the top directory of the original.
         """
         if self.__top_dir_original is None:
-            config_clone = configparser.ConfigParser()
-            config_clone.read(self.__config_path)
-
-            self.__top_dir_original = Path(config_clone['Original']['config']).parent.resolve(True)
+            self.__top_dir_original = Path(self.__get_config_clone()['Original']['config']).parent.resolve(True)
 
         return self.__top_dir_original
 
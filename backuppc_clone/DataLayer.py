@@ -1,8 +1,15 @@
 import csv
+import itertools
+import operator
 import os
 import sqlite3
+import subprocess
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
+
+from backuppc_clone.Durability import Durability
+from backuppc_clone.SqlProfiler import SqlProfiler
+from backuppc_clone.StorageProfile import StorageProfile
 
 
 class DataLayer:
@@ -16,12 +23,20 @@ class DataLayer:
     :type instance: backuppc_clone.DataLayer.DataLayer
     """
 
+    schema_version: int = 8
+    """
+    The version of the schema of the metadata database.
+    """
+
     # ------------------------------------------------------------------------------------------------------------------
-    def __init__(self, database: str):
+    def __init__(self, database: str, scratch_dir: str | None = None, profile: StorageProfile | None = None):
         """
         Object constructor.
 
         @param str database: Path to the SQLite database.
+        @param str|None scratch_dir: Path to the directory for the scratch database. If None the scratch database
+                                     is kept in memory.
+        @param StorageProfile|None profile: The storage profile. If None the safe profile is used.
         """
         if DataLayer.instance is not None:
             raise Exception("This class is a singleton!")
@@ -33,6 +48,16 @@ class DataLayer:
         The path to the SQLite database.
         """
 
+        self.__scratch_dir: str | None = scratch_dir
+        """
+        The path to the directory for the scratch database. If None the scratch database is kept in memory.
+        """
+
+        self.__profile: StorageProfile = profile or StorageProfile.get('safe')
+        """
+        The storage profile.
+        """
+
         self.__connection: sqlite3.Connection = sqlite3.connect(':memory:')
         """
         The connection to the database.
@@ -43,6 +68,16 @@ class DataLayer:
         The last rowid as returns by the last used cursor.
         """
 
+        self.__profiler: SqlProfiler | None = None
+        """
+        The SQL profiler. If None SQL statements are not instrumented.
+        """
+
+        self.__durability: Durability | None = None
+        """
+        The durability of the files of the clone. If None the files are not flushed before a commit.
+        """
+
         self.connect()
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -60,10 +95,198 @@ class DataLayer:
         """
         self.__connection = sqlite3.connect(self.__database, isolation_level="EXCLUSIVE")
 
-        tmp_dir = os.path.join(os.path.dirname(self.__database), 'tmp')
+        tmp_dir = self.__scratch_dir or os.path.join(os.path.dirname(self.__database), 'tmp')
         self.execute_none('pragma temp_store = 1')
         self.execute_none('pragma temp_store_directory = \'{}\''.format(tmp_dir))
-        self.execute_none('pragma main.cache_size = -200000')
+        self.__apply_profile()
+        self.__attach_scratch_database()
+        self.__upgrade_schema()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def profile(self) -> StorageProfile:
+        """
+        Returns the storage profile.
+        """
+        return self.__profile
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @profile.setter
+    def profile(self, profile: StorageProfile) -> None:
+        """
+        Sets the storage profile. The storage profile takes effect at the next connect.
+
+        @param StorageProfile profile: The storage profile.
+        """
+        self.__profile = profile
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def profiler(self) -> SqlProfiler | None:
+        """
+        Returns the SQL profiler.
+        """
+        return self.__profiler
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @profiler.setter
+    def profiler(self, profiler: SqlProfiler | None) -> None:
+        """
+        Sets the SQL profiler. If None SQL statements are not instrumented.
+
+        @param SqlProfiler|None profiler: The SQL profiler.
+        """
+        self.__profiler = profiler
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def durability(self) -> Durability | None:
+        """
+        Returns the durability of the files of the clone.
+        """
+        return self.__durability
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @durability.setter
+    def durability(self, durability: Durability | None) -> None:
+        """
+        Sets the durability of the files of the clone. The files are flushed according to the durability before each
+        commit such that the metadata never refers to files whose data has not reached the disk.
+
+        @param Durability|None durability: The durability.
+        """
+        self.__durability = durability
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __cursor(self) -> sqlite3.Cursor:
+        """
+        Returns a new cursor, an instrumented cursor if a SQL profiler is set.
+        """
+        if self.__profiler is None:
+            return self.__connection.cursor()
+
+        return self.__connection.cursor(self.__profiler.cursor_factory)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __apply_profile(self) -> None:
+        """
+        Applies the storage profile to the connection.
+        """
+        # The page size takes effect only for new databases and after a vacuum in rollback journal mode.
+        self.execute_none('pragma main.page_size = {}'.format(self.__profile.page_size))
+        self.execute_none('pragma main.journal_mode = {}'.format(self.__profile.journal_mode))
+        self.execute_none('pragma main.synchronous = {}'.format(self.__profile.synchronous))
+        self.execute_none('pragma main.mmap_size = {}'.format(self.__profile.mmap_size))
+        self.execute_none('pragma main.cache_size = -{}'.format(self.__profile.cache_size))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def create_database(db_path: str, profile: StorageProfile | None = None) -> None:
+        """
+        Creates a new metadata database.
+
+        @param str db_path: The path to the SQLite database.
+        @param StorageProfile|None profile: The storage profile. If None the safe profile is used.
+        """
+        with open(DataLayer.ddl_path('0100_create_tables.sql')) as file:
+            sql = file.read()
+
+        connection = sqlite3.connect(db_path)
+        cursor = connection.cursor()
+        cursor.execute('pragma page_size = {}'.format((profile or StorageProfile.get('safe')).page_size))
+        cursor.executescript(sql)
+
+        parameters = [('SCHEMA_VERSION', 'schema version', str(DataLayer.schema_version)),
+                      ('LAST_POOL_SYNC', 'timestamp of last original pool scan', '-1')]
+        for parameter in parameters:
+            cursor.execute('insert into BKC_PARAMETER(PRM_CODE, PRM_DESCRIPTION, PRM_VALUE) values(?, ?, ?)',
+                           parameter)
+
+        connection.commit()
+        connection.close()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def ddl_path(filename: str) -> str:
+        """
+        Returns the path to a DDL script.
+
+        @param str filename: The filename of the DDL script.
+
+        :rtype: str
+        """
+        return os.path.join(os.path.dirname(os.path.realpath(__file__)), 'lib', 'ddl', filename)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __attach_scratch_database(self) -> None:
+        """
+        Attaches the scratch database holding the import and temporary tables. The scratch database is private to this
+        connection, has no rollback journal, and is removed by SQLite when the connection is closed.
+        """
+        # An empty filename gives a private on-disk database in the temp store directory.
+        self.execute_none('attach database ? as SCR', ('' if self.__scratch_dir else ':memory:',))
+        self.execute_none('pragma SCR.journal_mode = off')
+        self.execute_none('pragma SCR.synchronous = off')
+
+        with open(self.ddl_path('0200_create_scratch_tables.sql')) as file:
+            self.__connection.executescript(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __upgrade_schema(self) -> None:
+        """
+        Upgrades the schema of the metadata database to the current version.
+        """
+        version = int(self.execute_singleton1("select prm_value from BKC_PARAMETER where prm_code = 'SCHEMA_VERSION'"))
+        # The index on the entries of the host backups is the largest index, hence it is rebuilt at most once.
+        rebuild_backup_tree_index = False
+
+        if version < 3:
+            # The scratch tables have been moved to the scratch database.
+            for table_name in ['IMP_POOL',
+                               'TMP_BACKUP_TREE',
+                               'TMP_CLONE_POOL_OBSOLETE',
+                               'TMP_CLONE_POOL_REQUIRED',
+                               'TMP_ID',
+                               'TMP_POOL']:
+                self.execute_none('drop table if exists main.{}'.format(table_name))
+
+        if version < 4:
+            # The digest of a pool file is computed while copying the pool file.
+            self.execute_none('alter table main.BKC_POOL add column bpl_digest BLOB')
+
+        if version < 5:
+            # The entries of a host backup are read in scan order through a covering index.
+            rebuild_backup_tree_index = True
+
+        if version < 6:
+            # The sizes of the original backups are used for scheduling.
+            self.execute_none('alter table main.BKC_ORIGINAL_BACKUP add column bob_n_files INTEGER')
+            self.execute_none('alter table main.BKC_ORIGINAL_BACKUP add column bob_size INTEGER')
+            self.execute_none('alter table main.BKC_ORIGINAL_BACKUP add column bob_size_new INTEGER')
+
+        if version < 7:
+            # The size, number of links, and mtime of each file are recorded by the scan of a host backup.
+            self.execute_none('alter table main.BKC_BACKUP_TREE add column bbt_size INTEGER')
+            self.execute_none('alter table main.BKC_BACKUP_TREE add column bbt_nlink INTEGER')
+            self.execute_none('alter table main.BKC_BACKUP_TREE add column bbt_mtime INTEGER')
+            rebuild_backup_tree_index = True
+
+        if version < 8:
+            # The work of cloning pre-scanned host backups is kept for scheduling until the next pool synchronization.
+            self.execute_none('create table main.BKC_SCHEDULE_WORK (bsw_host TEXT NOT NULL, '
+                              'bsw_number INTEGER NOT NULL, bsw_pool_sync INTEGER NOT NULL, '
+                              'bsw_entries INTEGER NOT NULL, bsw_files INTEGER NOT NULL, bsw_bytes INTEGER)')
+            self.execute_none('create unique index main.IX_BKC_SCHEDULE_WORK1 on BKC_SCHEDULE_WORK (bsw_host, '
+                              'bsw_number)')
+
+        if rebuild_backup_tree_index:
+            self.execute_none('drop index if exists main.IX_BKC_BACKUP_TREE1')
+            self.execute_none('create index main.IX_BKC_BACKUP_TREE1 on BKC_BACKUP_TREE (bck_id, bbt_seq, '
+                              'bbt_inode_original, bbt_nlink, bbt_size, bbt_dir, bbt_name)')
+
+        if version < DataLayer.schema_version:
+            self.parameter_update_value('SCHEMA_VERSION', str(DataLayer.schema_version))
+            self.commit()
 
     # ------------------------------------------------------------------------------------------------------------------
     def backup_delete(self, bck_id: int) -> None:
@@ -97,6 +320,56 @@ class DataLayer:
 
         return self.execute_rows(sql)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_get_candidates(self, end_time: int) -> List[Dict]:
+        """
+        Selects the backups to clone in the order of DataLayer.backup_get_next, including their sizes and whether the
+        host has a cloned backup.
+
+        @param int end_time: Only backups that ended before this time are selected. -1 for all backups.
+        """
+        sql = """
+              select BOB.BOB_HOST
+                   , BOB.BOB_NUMBER
+                   , BOB.BOB_END_TIME
+                   , BOB.BOB_LEVEL
+                   , BOB.BOB_TYPE
+                   , BOB.BOB_N_FILES
+                   , BOB.BOB_SIZE
+                   , BOB.BOB_SIZE_NEW
+                   , exists( select 1
+                             from BKC_BACKUP BCK2
+                             where BCK2.HST_ID = HST.HST_ID
+                               and ifnull(BCK2.BCK_IN_PROGRESS, 1) = 0 ) as HST_CLONED
+              from BKC_ORIGINAL_BACKUP        BOB
+                   left outer join BKC_HOST   HST on HST.HST_NAME = BOB.BOB_HOST
+                   left outer join BKC_BACKUP BCK on BCK.HST_ID = HST.HST_ID and
+                                                     BCK.BCK_NUMBER = BOB.BOB_NUMBER
+              where BCK.BCK_ID is null
+                and BOB.BOB_TYPE in ('full', 'incr')
+                and BOB.BOB_END_TIME is not null
+                and (BOB.BOB_END_TIME < ? or ? = -1)
+              order by BOB.BOB_TYPE
+                     , BOB.BOB_END_TIME desc"""
+
+        return self.execute_rows(sql, (end_time, end_time))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def host_has_cloned_backup(self, host: str) -> bool:
+        """
+        Returns whether a host has a completely cloned backup.
+
+        @param str host: The name of the host.
+        """
+        sql = """
+              select exists( select 1
+                             from BKC_HOST              HST
+                                  inner join BKC_BACKUP BCK on BCK.HST_ID = HST.HST_ID
+                             where HST.HST_NAME = ?
+                               and ifnull(BCK.BCK_IN_PROGRESS, 1) = 0 )"""
+
+        return bool(self.execute_singleton1(sql, (host,)))
+
     # ------------------------------------------------------------------------------------------------------------------
     def backup_get_next(self, end_time: int) -> Dict:
         """
@@ -198,29 +471,162 @@ class DataLayer:
         return self.execute_row1(sql, (bck_id,))
 
     # ------------------------------------------------------------------------------------------------------------------
-    def backup_prepare_required_clone_pool_files(self, bck_id: int) -> int:
+    def backup_get_plan(self, bck_id: int) -> Dict:
         """
-        Prepares the files required for a host backup that are not yet copied from the original pool to the clone pool.
+        Selects the work for cloning a scanned host backup: the number of pool files not yet copied to the clone pool,
+        hardlinks to pool files, files not linked to the pool, and directories, and the total size of the pool files
+        not yet copied and of the files not linked to the pool. The sizes are None when the scan did not record the
+        sizes of the files (i.e. a pre-scan written by an older version).
+
+        Files with one link are not in the pool, hence are classified without looking up the pool.
+
+        @param int bck_id: The ID of the host backup.
+        """
+        sql = """
+              select count(distinct case when BPL.BPL_INODE_CLONE is null
+                                         then BPL.BPL_INODE_ORIGINAL end)                       as '#pool_files'
+                   , count(BPL.BPL_ID)                                                          as '#links'
+                   , ifnull(sum(case when BBT.BBT_INODE_ORIGINAL is not null and
+                                          BPL.BPL_ID is null then 1 else 0 end), 0)             as '#files'
+                   , ifnull(sum(case when BBT.BBT_INODE_ORIGINAL is null then 1 else 0 end), 0) as '#dirs'
+                   , ifnull(sum(case when BBT.BBT_INODE_ORIGINAL is not null and
+                                          BPL.BPL_ID is null then BBT.BBT_SIZE end), 0)         as 'file_bytes'
+                   , ifnull(sum(case when BBT.BBT_INODE_ORIGINAL is not null and
+                                          BBT.BBT_SIZE is null then 1 else 0 end), 0)           as '#unknown_sizes'
+              from BKC_BACKUP_TREE          BBT
+                   left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = case when ifnull(BBT.BBT_NLINK, 2) > 1
+                                                                                 then BBT.BBT_INODE_ORIGINAL end
+              where BBT.BCK_ID = ?"""
+
+        work = self.execute_row1(sql, (bck_id,))
+
+        sql = """
+              select ifnull(sum(BBT_SIZE), 0)
+              from ( select distinct BPL.BPL_INODE_ORIGINAL
+                                   , BBT.BBT_SIZE
+                     from BKC_BACKUP_TREE     BBT
+                          inner join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = BBT.BBT_INODE_ORIGINAL
+                     where BBT.BCK_ID = ?
+                       and BBT.BBT_NLINK > 1
+                       and BPL.BPL_INODE_CLONE is null )"""
+
+        work['pool_bytes'] = self.execute_singleton1(sql, (bck_id,))
+
+        if work.pop('#unknown_sizes'):
+            work['pool_bytes'] = None
+            work['file_bytes'] = None
+
+        return work
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_get_plan_v4(self) -> Dict:
+        """
+        Selects the work for cloning a scanned BackupPC v4 host backup (imported into IMP_BACKUP_POOL): the number of
+        pool files not yet copied to the clone pool. The directories and attrib files of the host backup are not
+        counted.
+        """
+        sql = """
+              select count(distinct BPL.BPL_INODE_ORIGINAL) as '#pool_files'
+                   , 0                                      as '#links'
+                   , 0                                      as '#files'
+                   , 0                                      as '#dirs'
+                   , null                                   as 'pool_bytes'
+                   , null                                   as 'file_bytes'
+              from IMP_BACKUP_POOL     IMP
+                   inner join BKC_POOL BPL on BPL.BPL_DIR = IMP.IMP_DIR and
+                                              BPL.BPL_NAME = IMP.IMP_NAME
+              where BPL.BPL_INODE_CLONE is null"""
+
+        return self.execute_row1(sql)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_get_pre_scan_stats(self) -> Dict:
+        """
+        Selects the number of entries of a pre-scan of a host backup (imported into IMP_PRE_SCAN), the number of files
+        to copy, i.e. pool files not yet in the clone pool and files not in the pool, and the total size of these
+        files. The size is None when the pre-scan did not record the sizes of the files.
+        """
+        sql = """
+              select count(*)                                                        as '#entries'
+                   , count(distinct case when BPL.BPL_INODE_CLONE is null
+                                         then IMP.BBT_INODE_ORIGINAL end)            as '#files'
+                   , count(case when IMP.BBT_INODE_ORIGINAL is not null and
+                                     IMP.BBT_SIZE is null then 1 end)                as '#unknown_sizes'
+              from IMP_PRE_SCAN             IMP
+                   left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = IMP.BBT_INODE_ORIGINAL"""
+
+        stats = self.execute_row1(sql)
+
+        sql = """
+              select ifnull(sum(BBT_SIZE), 0)
+              from ( select distinct IMP.BBT_INODE_ORIGINAL
+                                   , IMP.BBT_SIZE
+                     from IMP_PRE_SCAN             IMP
+                          left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = IMP.BBT_INODE_ORIGINAL
+                     where IMP.BBT_INODE_ORIGINAL is not null
+                       and BPL.BPL_INODE_CLONE is null )"""
+
+        stats['#bytes'] = None if stats.pop('#unknown_sizes') else self.execute_singleton1(sql)
+
+        return stats
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_insert_tree(self, bck_id: int, rows: List[Tuple]) -> None:
+        """
+        Inserts entries of a host backup.
 
         @param int bck_id: The ID of the host backup.
+        @param list[tuple] rows: The entries (bbt_seq, bbt_inode_original, bbt_dir, bbt_name, bbt_size, bbt_nlink,
+                                 bbt_mtime).
+        """
+        sql = """
+              insert into BKC_BACKUP_TREE( BBT_SEQ
+                                         , BBT_INODE_ORIGINAL
+                                         , BBT_DIR
+                                         , BBT_NAME
+                                         , BBT_SIZE
+                                         , BBT_NLINK
+                                         , BBT_MTIME
+                                         , BCK_ID )
+              values( ?, ?, ?, ?, ?, ?, ?, ? )"""
+
+        cursor = self.__cursor()
+        cursor.executemany(sql, [row + (bck_id,) for row in rows])
+        cursor.close()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_prepare_required_clone_pool_files(self, bck_ids: List[int]) -> int:
+        """
+        Prepares the files required for one or more host backups that are not yet copied from the original pool to the
+        clone pool. A pool file required by several host backups is prepared once.
+
+        @param list[int] bck_ids: The IDs of the host backups.
 
         :rtype: int
         """
         self.execute_none('delete from TMP_CLONE_POOL_REQUIRED')
+        self.execute_none('delete from TMP_ID')
+        for bck_id in bck_ids:
+            self.execute_none('insert into TMP_ID(TMP_ID) values(?)', (bck_id,))
 
         sql = """
               insert into TMP_CLONE_POOL_REQUIRED( BPL_INODE_ORIGINAL
                                                  , BPL_DIR
-                                                 , BPL_NAME)
-              select distinct BPL_INODE_ORIGINAL
-                            , BPL_DIR
-                            , BPL_NAME
-              from BKC_BACKUP_TREE     BBT
-                   inner join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = BBT.BBT_INODE_ORIGINAL
-              where BBT.BCK_ID = ?
-                and BPL.BPL_INODE_CLONE is null"""
+                                                 , BPL_NAME
+                                                 , BPL_SIZE )
+              select BPL.BPL_INODE_ORIGINAL
+                   , BPL.BPL_DIR
+                   , BPL.BPL_NAME
+                   , max(BBT.BBT_SIZE)
+              from TMP_ID                     TMP
+                   inner join BKC_BACKUP_TREE BBT on BBT.BCK_ID = TMP.TMP_ID
+                   inner join BKC_POOL        BPL on BPL.BPL_INODE_ORIGINAL = BBT.BBT_INODE_ORIGINAL
+              where BPL.BPL_INODE_CLONE is null
+              group by BPL.BPL_INODE_ORIGINAL
+                     , BPL.BPL_DIR
+                     , BPL.BPL_NAME"""
 
-        self.execute_none(sql, (bck_id,))
+        self.execute_none(sql)
 
         sql = """
               select count(distinct BPL_INODE_ORIGINAL)
@@ -229,103 +635,162 @@ class DataLayer:
         return self.execute_singleton1(sql)
 
     # ------------------------------------------------------------------------------------------------------------------
-    def backup_prepare_tree(self, bck_id: int) -> int:
+    def backup_prepare_required_clone_pool_files_chunk(self, bck_id: int, min_seq: int, max_seq: int) -> int:
         """
-        Selects the file entries of a host backup.
+        Prepares the files required for a chunk of the entries of a host backup that are not yet copied from the
+        original pool to the clone pool.
 
         @param int bck_id: The ID of the host backup.
+        @param int min_seq: The first sequence number of the chunk.
+        @param int max_seq: The last sequence number of the chunk.
 
         :rtype: int
         """
-        self.execute_none('delete from TMP_BACKUP_TREE')
+        self.execute_none('delete from TMP_CLONE_POOL_REQUIRED')
 
         sql = """
-              insert into TMP_BACKUP_TREE( BPL_INODE_ORIGINAL
-                                         , BPL_DIR
-                                         , BPL_NAME
-                                         , BBT_SEQ
-                                         , BBT_INODE_ORIGINAL
-                                         , BBT_DIR
-                                         , BBT_NAME)
+              insert into TMP_CLONE_POOL_REQUIRED( BPL_INODE_ORIGINAL
+                                                 , BPL_DIR
+                                                 , BPL_NAME
+                                                 , BPL_SIZE )
               select BPL.BPL_INODE_ORIGINAL
                    , BPL.BPL_DIR
                    , BPL.BPL_NAME
+                   , max(BBT.BBT_SIZE)
+              from BKC_BACKUP_TREE     BBT
+                   inner join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = BBT.BBT_INODE_ORIGINAL
+              where BBT.BCK_ID = ?
+                and BBT.BBT_SEQ between ? and ?
+                and BPL.BPL_INODE_CLONE is null
+              group by BPL.BPL_INODE_ORIGINAL
+                     , BPL.BPL_DIR
+                     , BPL.BPL_NAME"""
 
-                   , BBT.BBT_SEQ
-                   , BBT.BBT_INODE_ORIGINAL
-                   , BBT.BBT_DIR
-                   , BBT.BBT_NAME
-              from BKC_BACKUP_TREE          BBT
-                   left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = BBT.BBT_INODE_ORIGINAL
-              where BBT.BCK_ID = ?"""
+        self.execute_none(sql, (bck_id, min_seq, max_seq))
+
+        return self.execute_singleton1('select count(*) from TMP_CLONE_POOL_REQUIRED')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_get_required_clone_pool_bytes(self) -> int | None:
+        """
+        Returns the total size of the required pool files (prepared in TMP_CLONE_POOL_REQUIRED) or None if the size of
+        any of these pool files is unknown.
+        """
+        sql = """
+              select case when count(*) = count(BPL_SIZE) then ifnull(sum(BPL_SIZE), 0) end
+              from TMP_CLONE_POOL_REQUIRED"""
+
+        return self.execute_singleton1(sql)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_prepare_required_clone_pool_files_v4(self) -> int:
+        """
+        Prepares the files required for a BackupPC v4 host backup (imported into IMP_BACKUP_POOL) that are not yet
+        copied from the original pool to the clone pool.
+
+        :rtype: int
+        """
+        self.execute_none('delete from TMP_CLONE_POOL_REQUIRED')
 
-        self.execute_none(sql, (bck_id,))
+        sql = """
+              insert into TMP_CLONE_POOL_REQUIRED( BPL_INODE_ORIGINAL
+                                                 , BPL_DIR
+                                                 , BPL_NAME)
+              select distinct BPL.BPL_INODE_ORIGINAL
+                            , BPL.BPL_DIR
+                            , BPL.BPL_NAME
+              from IMP_BACKUP_POOL     IMP
+                   inner join BKC_POOL BPL on BPL.BPL_DIR = IMP.IMP_DIR and
+                                              BPL.BPL_NAME = IMP.IMP_NAME
+              where BPL.BPL_INODE_CLONE is null"""
+
+        self.execute_none(sql)
 
         sql = """
               select count(*)
-              from TMP_BACKUP_TREE"""
+              from TMP_CLONE_POOL_REQUIRED"""
 
         return self.execute_singleton1(sql)
 
     # ------------------------------------------------------------------------------------------------------------------
-    def backup_yield_required_clone_pool_files(self):
+    def backup_count_unknown_pool_files_v4(self) -> int:
         """
-        Selects the pool files required for a host backup that are not yet copied from the original pool to the clone
-        pool.
+        Returns the number of distinct files required for a BackupPC v4 host backup (imported into IMP_BACKUP_POOL)
+        that are not in the pool metadata.
+
+        :rtype: int
         """
-        self.__connection.row_factory = DataLayer.dict_factory
+        sql = """
+              select count(*)
+              from ( select distinct IMP.IMP_DIR
+                                   , IMP.IMP_NAME
+                     from IMP_BACKUP_POOL          IMP
+                          left outer join BKC_POOL BPL on BPL.BPL_DIR = IMP.IMP_DIR and
+                                                          BPL.BPL_NAME = IMP.IMP_NAME
+                     where BPL.BPL_ID is null )"""
+
+        return self.execute_singleton1(sql)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def backup_yield_required_clone_pool_files(self) -> Iterator[List[Tuple]]:
+        """
+        Selects the pool files required for one or more host backups that are not yet copied from the original pool to
+        the clone pool. Yields batches of tuples (bpl_inode_original, bpl_dir, bpl_name).
+
+        The pool files are selected in the order of their inodes. The names of pool files are digests, hence the order
+        of names is random with respect to the location on disk, whereas the order of inodes follows the inode tables
+        and, by and large, the allocation of the data blocks of the original pool.
+        """
         sql = """
               select BPL_INODE_ORIGINAL
                    , BPL_DIR
                    , BPL_NAME
               from TMP_CLONE_POOL_REQUIRED
-              order by BPL_DIR
-                     , BPL_NAME"""
+              order by BPL_INODE_ORIGINAL"""
 
-        cursor = self.__connection.cursor()
-        cursor.execute(sql)
-        while True:
-            rows = cursor.fetchmany(10000)
-            if not rows:
-                cursor.close()
-                return
-            yield rows
+        yield from self.__yield_rows(sql)
 
     # ------------------------------------------------------------------------------------------------------------------
-    def backup_yield_tree(self):
+    def backup_yield_tree(self, bck_id: int, min_seq: int = 0, max_seq: int = 2 ** 63 - 1) -> Iterator[List[Tuple]]:
         """
-        Selects the file entries of a host backup.
-        """
-        self.__connection.row_factory = DataLayer.dict_factory
+        Selects the file entries of a host backup in scan order, i.e. a directory before its entries. Yields batches of
+        tuples (bpl_inode_original, bpl_dir, bpl_name, bbt_inode_original, bbt_dir, bbt_name, bbt_size).
 
+        The entries are read in scan order from the covering index IX_BKC_BACKUP_TREE1 and the pool files are looked up
+        through the index IX_BKC_POOL2 while iterating, hence the entries are neither copied nor sorted. Files with one
+        link are not in the pool and are not looked up.
+
+        @param int bck_id: The ID of the host backup.
+        @param int min_seq: The first sequence number of the entries (default all entries).
+        @param int max_seq: The last sequence number of the entries (default all entries).
+        """
         sql = """
-              select BPL_INODE_ORIGINAL
-                   , BPL_DIR
-                   , BPL_NAME
+              select BPL.BPL_INODE_ORIGINAL
+                   , BPL.BPL_DIR
+                   , BPL.BPL_NAME
 
-                   , BBT_INODE_ORIGINAL
-                   , BBT_DIR
-                   , BBT_NAME
-              from TMP_BACKUP_TREE
-              order by BBT_SEQ
-                     , BPL_DIR
-                     , BPL_NAME"""
+                   , BBT.BBT_INODE_ORIGINAL
+                   , BBT.BBT_DIR
+                   , BBT.BBT_NAME
+                   , BBT.BBT_SIZE
+              from BKC_BACKUP_TREE          BBT
+                   left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = case when ifnull(BBT.BBT_NLINK, 2) > 1
+                                                                                 then BBT.BBT_INODE_ORIGINAL end
+              where BBT.BCK_ID = ?
+                and BBT.BBT_SEQ between ? and ?
+              order by BBT.BBT_SEQ"""
 
-        cursor = self.__connection.cursor()
-        cursor.execute(sql)
-        while True:
-            rows = cursor.fetchmany(10000)
-            if not rows:
-                cursor.close()
-                return
-            yield rows
+        yield from self.__yield_rows(sql, (bck_id, min_seq, max_seq))
 
     # ------------------------------------------------------------------------------------------------------------------
     def commit(self) -> None:
         """
-        Commits the current transaction.
+        Commits the current transaction. Before the commit the files of the clone are flushed according to the
+        durability.
         """
+        if self.__durability is not None:
+            self.__durability.sync_filesystem()
+
         self.__connection.commit()
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -341,7 +806,7 @@ class DataLayer:
         """
         new_row = {}
         for index, col in enumerate(cursor.description):
-            new_row[col[0]] = old_row[index]
+            new_row[col[0].lower()] = old_row[index]
 
         return new_row
 
@@ -355,7 +820,7 @@ class DataLayer:
         """
         self.__connection.row_factory = None
 
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
         cursor.execute(sql, *params)
         self.__last_rowid = cursor.lastrowid
         row_count = cursor.rowcount
@@ -375,7 +840,7 @@ class DataLayer:
         """
         self.__connection.row_factory = DataLayer.dict_factory
 
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
         cursor.execute(sql, *params)
         rows = cursor.fetchall()
         self.__last_rowid = cursor.lastrowid
@@ -398,7 +863,7 @@ class DataLayer:
         """
         self.__connection.row_factory = DataLayer.dict_factory
 
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
         cursor.execute(sql, *params)
         rows = cursor.fetchall()
         self.__last_rowid = cursor.lastrowid
@@ -418,7 +883,7 @@ class DataLayer:
         """
         self.__connection.row_factory = DataLayer.dict_factory
 
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
         cursor.execute(sql, *params)
         rows = cursor.fetchall()
         self.__last_rowid = cursor.lastrowid
@@ -438,7 +903,7 @@ class DataLayer:
         """
         self.__connection.row_factory = None
 
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
         cursor.execute(sql, *params)
         row = cursor.fetchone()
         if row:
@@ -462,7 +927,7 @@ class DataLayer:
         """
         self.__connection.row_factory = None
 
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
         cursor.execute(sql, *params)
         ret = cursor.fetchone()[0]
         self.__last_rowid = cursor.lastrowid
@@ -470,6 +935,26 @@ class DataLayer:
 
         return ret
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __yield_rows(self, sql: str, *params) -> Iterator[List[Tuple]]:
+        """
+        Executes a SQL statement that selects 0, 1, or more rows and yields the rows in batches of plain tuples. Use
+        this method for queries selecting many rows, the rows are not converted to dictionaries.
+
+        @param str sql: The SQL statement.
+        @param iterable params: The arguments for the SQL statement.
+        """
+        self.__connection.row_factory = None
+
+        cursor = self.__cursor()
+        cursor.execute(sql, *params)
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                cursor.close()
+                return
+            yield rows
+
     # ------------------------------------------------------------------------------------------------------------------
     def get_host_id(self, hostname: str) -> int:
         """
@@ -550,31 +1035,80 @@ class DataLayer:
                    column_names: List[str],
                    path: Path,
                    truncate: bool = True,
-                   defaults: Dict = None):
+                   defaults: Dict = None,
+                   bulk: bool = True,
+                   presort: bool = False,
+                   defer_indexes: bool | None = False) -> int:
         """
-        Import a CSV file into a table.
+        Import a CSV file into a table. Returns the number of imported rows.
 
         @param table_name: The name of the table.
         @param column_names: The column names.
         @param path: The path to the CSV file.
         @param truncate: If True, the table will be truncated first.
         @param defaults: The default values for columns not in the CSV file.
+        @param bulk: If True, the bulk loader will be used. Otherwise, the row by row loader will be used.
+        @param presort: If True and using the bulk loader, the CSV file is sorted numerically on its first column
+                        before loading. Use this when the first column is the integer primary key of the table.
+        @param defer_indexes: If True and using the bulk loader, the secondary indexes of the table are dropped before
+                              and recreated after loading. If None, this is done only when the number of rows in the CSV
+                              file exceeds the (estimated) number of rows in the table.
         """
         if truncate:
             self.execute_none('delete from {}'.format(table_name))
 
+        column_names = list(column_names)
         default_values = []
         if defaults:
             for column_name in defaults:
                 column_names.append(column_name)
                 default_values.append(defaults[column_name])
 
+        if not bulk:
+            return self.__import_csv_row_by_row(table_name, column_names, path, default_values)
+
+        if defer_indexes is None:
+            defer_indexes = self.__count_lines(path) > self.__estimate_row_count(table_name)
+
+        index_sqls = self.__drop_secondary_indexes(table_name) if defer_indexes else []
+
+        sorted_path = self.__sort_csv(path) if presort else None
+        try:
+            row_count = self.__import_csv_bulk(table_name,
+                                               column_names,
+                                               sorted_path or path,
+                                               len(column_names) - len(default_values),
+                                               default_values)
+        finally:
+            if sorted_path:
+                sorted_path.unlink()
+
+        for sql in index_sqls:
+            self.execute_none(sql)
+
+        return row_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __import_csv_row_by_row(self,
+                                table_name: str,
+                                column_names: List[str],
+                                path: Path,
+                                default_values: List) -> int:
+        """
+        Import a CSV file into a table row by row. Returns the number of imported rows.
+
+        @param table_name: The name of the table.
+        @param column_names: The column names.
+        @param path: The path to the CSV file.
+        @param default_values: The values for the columns not in the CSV file.
+        """
         place_holders = []
         for _ in range(0, len(column_names)):
             place_holders.append('?')
 
         sql = 'insert into {}({}) values ({})'.format(table_name, ', '.join(column_names), ', '.join(place_holders))
-        cursor = self.__connection.cursor()
+        cursor = self.__cursor()
+        row_count = 0
         rows = []
         with open(path, 'r') as csv_file:
             csv_reader = csv.reader(csv_file)
@@ -584,10 +1118,11 @@ class DataLayer:
                     if field == '':
                         row[index] = None
 
-                if defaults:
+                if default_values:
                     row.extend(default_values)
 
                 rows.append(row)
+                row_count += 1
 
                 if len(rows) == 1000:
                     cursor.executemany(sql, rows)
@@ -598,13 +1133,117 @@ class DataLayer:
 
         cursor.close()
 
+        return row_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __import_csv_bulk(self,
+                          table_name: str,
+                          column_names: List[str],
+                          path: Path,
+                          csv_column_count: int,
+                          default_values: List) -> int:
+        """
+        Import a CSV file into a table in a single pass. Returns the number of imported rows.
+
+        The rows of the CSV reader are fed directly to the SQLite statement without any Python code per row: empty
+        strings are replaced with NULL by SQLite and the default values are appended by map().
+
+        @param table_name: The name of the table.
+        @param column_names: The column names.
+        @param path: The path to the CSV file.
+        @param csv_column_count: The number of columns in the CSV file.
+        @param default_values: The values for the columns not in the CSV file.
+        """
+        place_holders = ['nullif(?, \'\')'] * csv_column_count + ['?'] * len(default_values)
+
+        sql = 'insert into {}({}) values ({})'.format(table_name, ', '.join(column_names), ', '.join(place_holders))
+        cursor = self.__cursor()
+        with open(path, 'r') as csv_file:
+            rows = csv.reader(csv_file)
+            if default_values:
+                rows = map(operator.add, rows, itertools.repeat(default_values))
+            cursor.executemany(sql, rows)
+        row_count = cursor.rowcount
+        cursor.close()
+
+        return row_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __drop_secondary_indexes(self, table_name: str) -> List[str]:
+        """
+        Drops the secondary indexes of a table in the main database. Returns the SQL statements for recreating the
+        dropped indexes.
+
+        @param table_name: The name of the table.
+        """
+        sql = """
+              select name
+                   , sql
+              from main.sqlite_master
+              where type = 'index'
+                and tbl_name = ? collate nocase
+                and sql is not null"""
+
+        rows = self.execute_rows(sql, (table_name,))
+        for row in rows:
+            self.execute_none('drop index main.{}'.format(row['name']))
+
+        return [row['sql'] for row in rows]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __estimate_row_count(self, table_name: str) -> int:
+        """
+        Returns an estimate of the number of rows in a table without scanning the table.
+
+        @param table_name: The name of the table.
+        """
+        return self.execute_singleton1('select ifnull(max(rowid), 0) from {}'.format(table_name))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __count_lines(path: Path) -> int:
+        """
+        Returns the number of lines in a file.
+
+        @param path: The path to the file.
+        """
+        count = 0
+        with open(path, 'rb') as file:
+            while chunk := file.read(1024 * 1024):
+                count += chunk.count(b'\n')
+
+        return count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __sort_csv(path: Path) -> Path:
+        """
+        Sorts a CSV file numerically on its first column using sort(1). Returns the path to the sorted CSV file.
+
+        @param path: The path to the CSV file.
+        """
+        sorted_path = path.with_name(path.stem + '-sorted' + path.suffix)
+        subprocess.run(['sort',
+                        '--field-separator=,',
+                        '--key=1,1n',
+                        '--temporary-directory={}'.format(path.parent),
+                        '--output={}'.format(sorted_path),
+                        str(path)],
+                       env=dict(os.environ, LC_ALL='C'),
+                       check=True)
+
+        return sorted_path
+
     # ------------------------------------------------------------------------------------------------------------------
     def original_backup_insert(self,
                                bob_host: str,
                                bob_number: int,
                                bob_end_time: str,
                                bob_level: int,
-                               bob_type: str) -> None:
+                               bob_type: str,
+                               bob_n_files: str | None = None,
+                               bob_size: str | None = None,
+                               bob_size_new: str | None = None) -> None:
         """
         Inserts an original host backup.
         """
@@ -613,14 +1252,27 @@ class DataLayer:
                                              , bob_number
                                              , bob_end_time
                                              , bob_level
-                                             , bob_type)
+                                             , bob_type
+                                             , bob_n_files
+                                             , bob_size
+                                             , bob_size_new)
               values
                   ( ?
                   , ?
                   , ?
                   , ?
+                  , ?
+                  , ?
+                  , ?
                   , ?)"""
-        self.execute_none(sql, (bob_host, bob_number, bob_end_time, bob_level, bob_type))
+        self.execute_none(sql, (bob_host,
+                                bob_number,
+                                bob_end_time,
+                                bob_level,
+                                bob_type,
+                                bob_n_files,
+                                bob_size,
+                                bob_size_new))
 
     # ------------------------------------------------------------------------------------------------------------------
     def original_backup_get_stats(self) -> Dict:
@@ -731,6 +1383,19 @@ class DataLayer:
         """
         self.execute_none('delete from BKC_POOL where bpl_id=?', (bpl_id,))
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def pool_get_average_size(self) -> float | None:
+        """
+        Selects the average size of the pool files copied to the clone pool. Returns None if no pool file has been
+        copied yet.
+        """
+        sql = """
+              select avg(BPL_SIZE)
+              from BKC_POOL
+              where BPL_INODE_CLONE is not null"""
+
+        return self.execute_singleton1(sql)
+
     # ------------------------------------------------------------------------------------------------------------------
     def pool_insert_new_original(self) -> None:
         """
@@ -775,6 +1440,22 @@ class DataLayer:
 
         self.execute_none(sql)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def pool_yield_index(self) -> Iterator[List[Tuple]]:
+        """
+        Selects the files of the original pool ordered by inode number through the index IX_BKC_POOL2. Yields batches
+        of tuples (bpl_inode_original, bpl_dir, bpl_name).
+        """
+        sql = """
+              select BPL_INODE_ORIGINAL
+                   , BPL_DIR
+                   , BPL_NAME
+              from BKC_POOL
+              where BPL_INODE_ORIGINAL is not null
+              order by BPL_INODE_ORIGINAL"""
+
+        yield from self.__yield_rows(sql)
+
     # ------------------------------------------------------------------------------------------------------------------
     def clone_pool_obsolete_files_prepare(self) -> int:
         """
@@ -836,52 +1517,257 @@ class DataLayer:
                                       bpl_inode_original: int,
                                       bpl_inode_clone: int,
                                       pbl_size: int,
-                                      pbl_mtime: int) -> None:
+                                      pbl_mtime: int,
+                                      bpl_digest: bytes | None = None) -> None:
         """
-        Sets the inode number of the clone, mtime and size of a file in the pool given an inode number of a file the
-        original pool.
+        Sets the inode number of the clone, mtime, size, and digest of a file in the pool given an inode number of a
+        file the original pool.
 
         @param int bpl_inode_original: The inode number of a file in the original pool.
         @param int bpl_inode_clone: The inode number of the pool file in the clone.
         @param int pbl_size: The size of the pool file.
         @param int pbl_mtime: The mtime of the pool file.
+        @param bytes|None bpl_digest: The SHA-256 digest of the content of the pool file or None if not computed.
         """
         sql = """
               update BKC_POOL
               set bpl_inode_clone = ?
                 , bpl_size        = ?
                 , bpl_mtime       = ?
+                , bpl_digest      = ?
               where BPL_INODE_ORIGINAL = ?"""
 
-        self.execute_none(sql, (bpl_inode_clone, pbl_size, pbl_mtime, bpl_inode_original))
+        self.execute_none(sql, (bpl_inode_clone, pbl_size, pbl_mtime, bpl_digest, bpl_inode_original))
 
     # ------------------------------------------------------------------------------------------------------------------
-    def clone_pool_obsolete_files_yield(self):
+    def clone_pool_obsolete_files_yield(self) -> Iterator[List[Tuple]]:
         """
-        Selects the clone pool files that are obsolete (i.e., no longer in the original pool).
+        Selects the clone pool files that are obsolete (i.e., no longer in the original pool). Yields batches of tuples
+        (bpl_id, bpl_dir, bpl_name).
         """
-        self.__connection.row_factory = DataLayer.dict_factory
-
         sql = """
               select bpl_id
                    , bpl_dir
                    , bpl_name
               from TMP_CLONE_POOL_OBSOLETE"""
 
-        cursor = self.__connection.cursor()
-        cursor.execute(sql)
-        while True:
-            rows = cursor.fetchmany(10000)
-            if not rows:
-                cursor.close()
-                return
-            yield rows
+        yield from self.__yield_rows(sql)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def schedule_work_delete_stale(self, pool_sync: int) -> None:
+        """
+        Deletes the work of cloning host backups computed before a pool synchronization.
+
+        @param int pool_sync: The timestamp of the last pool synchronization.
+        """
+        self.execute_none('delete from BKC_SCHEDULE_WORK where bsw_pool_sync <> ?', (pool_sync,))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def schedule_work_get(self, host: str, number: int, pool_sync: int) -> Dict | None:
+        """
+        Selects the work of cloning a host backup computed since a pool synchronization: the number of entries, the
+        number of files to copy, and the total size of these files (None if unknown).
+
+        @param str host: The name of the host.
+        @param int number: The number of the host backup.
+        @param int pool_sync: The timestamp of the last pool synchronization.
+        """
+        sql = """
+              select bsw_entries as '#entries'
+                   , bsw_files   as '#files'
+                   , bsw_bytes   as '#bytes'
+              from BKC_SCHEDULE_WORK
+              where bsw_host      = ?
+                and bsw_number    = ?
+                and bsw_pool_sync = ?"""
+
+        return self.execute_row0(sql, (host, number, pool_sync))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def schedule_work_set(self, host: str, number: int, pool_sync: int, work: Dict) -> None:
+        """
+        Saves the work of cloning a host backup computed since a pool synchronization.
+
+        @param str host: The name of the host.
+        @param int number: The number of the host backup.
+        @param int pool_sync: The timestamp of the last pool synchronization.
+        @param dict work: The work as selected by DataLayer.backup_get_pre_scan_stats.
+        """
+        sql = """
+              insert or replace into BKC_SCHEDULE_WORK( bsw_host
+                                                      , bsw_number
+                                                      , bsw_pool_sync
+                                                      , bsw_entries
+                                                      , bsw_files
+                                                      , bsw_bytes )
+              values( ?, ?, ?, ?, ?, ? )"""
+
+        self.execute_none(sql, (host, number, pool_sync, work['#entries'], work['#files'], work['#bytes']))
 
     # ------------------------------------------------------------------------------------------------------------------
     def vacuum(self) -> None:
         """
-        Executes the vacuum command.
+        Executes the vacuum command. The database is rebuilt with the page size of the storage profile.
         """
+        # The page size can not be changed in WAL mode.
+        self.execute_none('pragma main.journal_mode = delete')
+        self.execute_none('pragma main.page_size = {}'.format(self.__profile.page_size))
         self.execute_none('vacuum')
+        self.execute_none('pragma main.journal_mode = {}'.format(self.__profile.journal_mode))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_select_backups(self, hst_name: str | None, bck_number: int | None) -> List[Dict]:
+        """
+        Selects the completely cloned host backups to be verified and stores their IDs in TMP_ID.
+
+        @param str|None hst_name: The name of the host or None for all hosts.
+        @param int|None bck_number: The backup number or None for all backups of the host(s).
+
+        :rtype: list[dict]
+        """
+        self.execute_none('delete from TMP_ID')
+
+        sql = """
+              select HST.HST_NAME
+                   , BCK.BCK_ID
+                   , BCK.BCK_NUMBER
+              from BKC_HOST              HST
+                   inner join BKC_BACKUP BCK on BCK.HST_ID = HST.HST_ID
+              where ifnull(BCK.BCK_IN_PROGRESS, 1) = 0
+                and (? is null or HST.HST_NAME = ?)
+                and (? is null or BCK.BCK_NUMBER = ?)
+              order by HST.HST_NAME
+                     , BCK.BCK_NUMBER"""
+
+        backups = self.execute_rows(sql, (hst_name, hst_name, bck_number, bck_number))
+        for backup in backups:
+            self.execute_none('insert into TMP_ID(TMP_ID) values(?)', (backup['bck_id'],))
+
+        return backups
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_prepare_pool_files(self,
+                                  top_original_path: str,
+                                  top_clone_path: str,
+                                  use_digest: bool,
+                                  all_files: bool) -> None:
+        """
+        Adds the cloned pool files to the files to be verified. Each pool file, i.e. each distinct inode, is added only
+        once.
+
+        @param str top_original_path: The top directory of the original.
+        @param str top_clone_path: The top directory of the clone.
+        @param bool use_digest: If True pool files with a recorded digest are verified against this digest, otherwise
+                                all pool files are verified against the original pool.
+        @param bool all_files: If True all cloned pool files are added, otherwise only the pool files referenced by the
+                               selected host backups (in TMP_ID and IMP_BACKUP_POOL).
+        """
+        sql = """
+              insert into TMP_VERIFY( VFY_ORIGINAL_PATH
+                                    , VFY_CLONE_PATH
+                                    , VFY_SIZE
+                                    , VFY_DIGEST)
+              select ? || '/' || BPL.BPL_DIR || '/' || BPL.BPL_NAME
+                   , ? || '/' || BPL.BPL_DIR || '/' || BPL.BPL_NAME
+                   , BPL.BPL_SIZE
+                   , case when ? = 1 then BPL.BPL_DIGEST end
+              from BKC_POOL BPL
+              where BPL.BPL_INODE_CLONE is not null
+                and (? = 1 or
+                     BPL.BPL_INODE_ORIGINAL in (select BBT.BBT_INODE_ORIGINAL
+                                                from TMP_ID                     TMP
+                                                     inner join BKC_BACKUP_TREE BBT on BBT.BCK_ID = TMP.TMP_ID) or
+                     (BPL.BPL_DIR, BPL.BPL_NAME) in (select IMP_DIR
+                                                          , IMP_NAME
+                                                     from IMP_BACKUP_POOL))"""
+
+        self.execute_none(sql, (top_original_path, top_clone_path, 1 if use_digest else 0, 1 if all_files else 0))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_prepare_backup_files(self, pc_original_path: str, pc_clone_path: str) -> None:
+        """
+        Adds the files of the selected host backups (in TMP_ID) not linked to the pool to the files to be verified.
+
+        @param str pc_original_path: The pc directory of the original.
+        @param str pc_clone_path: The pc directory of the clone.
+        """
+        sql = """
+              insert into TMP_VERIFY( VFY_ORIGINAL_PATH
+                                    , VFY_CLONE_PATH
+                                    , VFY_SIZE
+                                    , VFY_DIGEST)
+              select ? || '/' || HST.HST_NAME || '/' || BCK.BCK_NUMBER || '/' || ENTRY
+                   , ? || '/' || HST.HST_NAME || '/' || BCK.BCK_NUMBER || '/' || ENTRY
+                   , null
+                   , null
+              from ( select BBT.BCK_ID
+                          , case when ifnull(BBT.BBT_DIR, '') = '' then ''
+                                 else BBT.BBT_DIR || '/'
+                            end || BBT.BBT_NAME as ENTRY
+                     from TMP_ID                     TMP
+                          inner join BKC_BACKUP_TREE BBT on BBT.BCK_ID = TMP.TMP_ID
+                          left outer join BKC_POOL   BPL on BPL.BPL_INODE_ORIGINAL = BBT.BBT_INODE_ORIGINAL
+                     where BBT.BBT_INODE_ORIGINAL is not null
+                       and BPL.BPL_ID is null ) ENT
+                   inner join BKC_BACKUP BCK on BCK.BCK_ID = ENT.BCK_ID
+                   inner join BKC_HOST   HST on HST.HST_ID = BCK.HST_ID"""
+
+        self.execute_none(sql, (pc_original_path, pc_clone_path))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_sample(self, sample_size: int) -> None:
+        """
+        Keeps a random sample of the files to be verified.
+
+        @param int sample_size: The size of the sample.
+        """
+        sql = """
+              delete from TMP_VERIFY
+              where ROWID not in (select ROWID
+                                  from TMP_VERIFY
+                                  order by random()
+                                  limit ?)"""
+
+        self.execute_none(sql, (sample_size,))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_get_stats(self) -> Dict:
+        """
+        Selects the number and the known total size of the files to be verified.
+
+        :rtype: dict
+        """
+        self.__connection.row_factory = DataLayer.dict_factory
+
+        sql = """
+              select count(*)               as '#files'
+                   , ifnull(sum(VFY_SIZE), 0) as 'size'
+              from TMP_VERIFY"""
+
+        return self.execute_row1(sql)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_truncate(self) -> None:
+        """
+        Truncates the files to be verified.
+        """
+        self.execute_none('delete from TMP_VERIFY')
+        self.execute_none('delete from IMP_BACKUP_POOL')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify_yield_files(self) -> Iterator[List[Tuple]]:
+        """
+        Selects the files to be verified. Yields batches of tuples (vfy_original_path, vfy_clone_path, vfy_size,
+        vfy_digest).
+        """
+        sql = """
+              select VFY_ORIGINAL_PATH
+                   , VFY_CLONE_PATH
+                   , VFY_SIZE
+                   , VFY_DIGEST
+              from TMP_VERIFY
+              order by VFY_CLONE_PATH"""
+
+        yield from self.__yield_rows(sql)
 
 # ----------------------------------------------------------------------------------------------------------------------
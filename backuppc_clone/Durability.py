@@ -0,0 +1,103 @@
+import ctypes
+import os
+from pathlib import Path
+from typing import List
+
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+
+
+class Durability:
+    """
+    Flushes the files of the clone to disk according to the durability mode:
+
+    * none: the files are not flushed (the kernel flushes the files eventually);
+    * batch: the filesystem of the clone is flushed once before each commit of the metadata database;
+    * strict: like batch and each copied file is flushed immediately after it has been copied.
+    """
+    modes: List[str] = ['none', 'batch', 'strict']
+    """
+    The available durability modes.
+    """
+
+    __libc = None
+    """
+    The C library (for syncfs).
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, mode: str, path: Path):
+        """
+        Object constructor.
+
+        @param str mode: The durability mode.
+        @param Path path: A path on the filesystem of the clone.
+        """
+        if mode not in Durability.modes:
+            raise BackupPcCloneException('Unknown durability mode {}, available modes: {}'.
+                                         format(mode, ', '.join(Durability.modes)))
+
+        self.__mode: str = mode
+        """
+        The durability mode.
+        """
+
+        self.__path: Path = path
+        """
+        A path on the filesystem of the clone.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def mode(self) -> str:
+        """
+        Returns the durability mode.
+        """
+        return self.__mode
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def syncfs(path: Path) -> None:
+        """
+        Flushes the filesystem holding a path to disk. Falls back to flushing all filesystems when syncfs is not
+        available.
+
+        @param Path path: The path.
+        """
+        if Durability.__libc is None:
+            Durability.__libc = ctypes.CDLL(None, use_errno=True)
+
+        if not hasattr(Durability.__libc, 'syncfs'):
+            os.sync()
+            return
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if Durability.__libc.syncfs(fd) != 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), str(path))
+        finally:
+            os.close(fd)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def sync_file(self, path: str | Path) -> None:
+        """
+        Flushes a copied file to disk in strict mode.
+
+        @param str|Path path: The path to the file.
+        """
+        if self.__mode == 'strict':
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def sync_filesystem(self) -> None:
+        """
+        Flushes the filesystem of the clone to disk in batch and strict mode.
+        """
+        if self.__mode != 'none':
+            Durability.syncfs(self.__path)
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,131 @@
+import sqlite3
+import time
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    A cursor that measures the execution time and the row count of its statement and reports them to a SqlProfiler
+    when closed. Note: SQLite executes a select statement while its rows are fetched, hence fetching is measured too.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, connection: sqlite3.Connection, profiler):
+        """
+        Object constructor.
+
+        @param sqlite3.Connection connection: The connection.
+        @param SqlProfiler profiler: The profiler.
+        """
+        sqlite3.Cursor.__init__(self, connection)
+
+        self.__profiler = profiler
+        """
+        The profiler.
+        """
+
+        self.__sql: str | None = None
+        """
+        The executed SQL statement.
+        """
+
+        self.__params = ()
+        """
+        The arguments of the SQL statement, None for executemany.
+        """
+
+        self.__duration: float = 0.0
+        """
+        The time spent in SQLite.
+        """
+
+        self.__row_count: int = 0
+        """
+        The number of fetched rows.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def execute(self, sql: str, params=()):
+        """
+        Executes a SQL statement.
+
+        @param str sql: The SQL statement.
+        @param iterable params: The arguments for the SQL statement.
+        """
+        self.__sql = sql
+        self.__params = params
+
+        start = time.perf_counter()
+        cursor = sqlite3.Cursor.execute(self, sql, params)
+        self.__duration += time.perf_counter() - start
+
+        return cursor
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def executemany(self, sql: str, seq_of_params):
+        """
+        Executes a SQL statement against all arguments in a sequence.
+
+        @param str sql: The SQL statement.
+        @param iterable seq_of_params: The sequence of arguments for the SQL statement.
+        """
+        self.__sql = sql
+        self.__params = None
+
+        start = time.perf_counter()
+        cursor = sqlite3.Cursor.executemany(self, sql, seq_of_params)
+        self.__duration += time.perf_counter() - start
+
+        return cursor
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def fetchone(self):
+        """
+        Fetches the next row.
+        """
+        start = time.perf_counter()
+        row = sqlite3.Cursor.fetchone(self)
+        self.__duration += time.perf_counter() - start
+        if row is not None:
+            self.__row_count += 1
+
+        return row
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def fetchmany(self, size: int = 1):
+        """
+        Fetches the next set of rows.
+
+        @param int size: The maximum number of rows.
+        """
+        start = time.perf_counter()
+        rows = sqlite3.Cursor.fetchmany(self, size)
+        self.__duration += time.perf_counter() - start
+        self.__row_count += len(rows)
+
+        return rows
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def fetchall(self):
+        """
+        Fetches all remaining rows.
+        """
+        start = time.perf_counter()
+        rows = sqlite3.Cursor.fetchall(self)
+        self.__duration += time.perf_counter() - start
+        self.__row_count += len(rows)
+
+        return rows
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def close(self) -> None:
+        """
+        Reports the execution time and row count to the profiler and closes the cursor.
+        """
+        if self.__sql is not None:
+            row_count = self.__row_count if self.description else max(self.rowcount, 0)
+            self.__profiler.record(self.connection, self.__sql, self.__params, self.__duration, row_count)
+            self.__sql = None
+
+        sqlite3.Cursor.close(self)
+
+# ----------------------------------------------------------------------------------------------------------------------
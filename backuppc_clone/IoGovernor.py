@@ -0,0 +1,295 @@
+import contextlib
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from typing import ContextManager, Iterator, List
+
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.helper.RateLimiter import RateLimiter
+
+
+class IoGovernor:
+    """
+    Singleton class governing the I/O of the scan, copy, and populate engines such that a running BackupPC on the same
+    disks is not starved.
+
+    Each engine runs its I/O operations (e.g. scanning a directory, copying a file, creating a link) through
+    operation(). When a latency budget has been configured the governor measures the latency of the operations and
+    adjusts, once per window, the number of concurrent operations, the byte rate, and a delay between operations in
+    AIMD style: when the 90th percentile of the latencies exceeds the budget the number of workers is halved, or, if
+    only one worker is left, the byte rate is halved, or, if no bytes are moved, the delay is doubled. When the latency
+    is within the budget these measures are relaxed one step at a time.
+    """
+    instance = None
+    """
+    The singleton instance of this class.
+
+    :type instance: backuppc_clone.IoGovernor.IoGovernor
+    """
+
+    window: float = 1.0
+    """
+    The length in seconds of the window over which latencies are measured before an adjustment.
+    """
+
+    block_size: int = 1024 * 1024
+    """
+    The latency of an operation moving bytes is taken per block of this size.
+    """
+
+    min_rate: float = 1024 * 1024
+    """
+    The minimal byte rate.
+    """
+
+    rate_step: float = 4 * 1024 * 1024
+    """
+    The additive increase of the byte rate.
+    """
+
+    min_delay: float = 0.001
+    """
+    The minimal (and initial) delay between operations.
+    """
+
+    operation_rate_step: float = 50.0
+    """
+    The additive increase of the rate of operations (i.e. the inverse of the delay between operations).
+    """
+
+    max_delay: float = 1.0
+    """
+    The maximal delay between operations.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, max_workers: int = 1, max_rate: float = 0.0, latency_budget: float = 0.0):
+        """
+        Object constructor.
+
+        @param int max_workers: The maximum number of concurrent operations of the parallel engines.
+        @param float max_rate: The maximum number of bytes moved per second. 0 for no limit.
+        @param float latency_budget: The latency budget in seconds. 0 for no adaptive control.
+        """
+        if IoGovernor.instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            IoGovernor.instance = self
+
+        self.__max_workers: int = max(1, max_workers)
+        """
+        The maximum number of concurrent operations.
+        """
+
+        self.__max_rate: float = max_rate
+        """
+        The maximum number of bytes moved per second.
+        """
+
+        self.__latency_budget: float = latency_budget
+        """
+        The latency budget in seconds.
+        """
+
+        self.__workers: int = 1 if latency_budget > 0.0 else self.__max_workers
+        """
+        The current number of concurrent operations. With a latency budget the governor starts with one worker.
+        """
+
+        self.__rate_limiter: RateLimiter = RateLimiter(max_rate)
+        """
+        The limiter of the number of bytes moved per second.
+        """
+
+        self.__delay: float = 0.0
+        """
+        The current delay in seconds before each operation.
+        """
+
+        self.__active: int = 0
+        """
+        The number of running operations.
+        """
+
+        self.__condition: threading.Condition = threading.Condition()
+        """
+        The condition for waiting for a free worker slot and for updating the measurements.
+        """
+
+        self.__latencies: List[float] = []
+        """
+        The latencies measured in the current window.
+        """
+
+        self.__latency: float = 0.0
+        """
+        The 90th percentile of the latencies of the last window.
+        """
+
+        self.__window_start: float = time.monotonic()
+        """
+        The start of the current window.
+        """
+
+        self.__window_bytes: int = 0
+        """
+        The number of bytes moved in the current window.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def throttling(self) -> bool:
+        """
+        Returns whether the I/O is throttled, i.e. a latency budget or a maximum byte rate has been configured.
+        """
+        return self.__latency_budget > 0.0 or self.__max_rate > 0.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def max_workers(self) -> int:
+        """
+        Returns the maximum number of concurrent operations.
+        """
+        return self.__max_workers
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def status(self) -> str:
+        """
+        Returns the current decisions of the governor in human-readable format.
+        """
+        rate = self.__rate_limiter.rate
+        status = f'{self.__workers} workers'
+        if rate:
+            status += f', {rate / 1024 / 1024:.1f}MiB/s limit'
+        if self.__delay:
+            status += f', {self.__delay * 1000:.0f}ms delay'
+        if self.__latency_budget > 0.0:
+            status += f', p90 {self.__latency * 1000:.1f}ms'
+
+        return status
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def set_priority(io_class: str | None, niceness: int) -> None:
+        """
+        Sets the I/O scheduling class and the niceness of this process. Threads and child processes created afterwards
+        inherit these settings.
+
+        @param str|None io_class: The I/O scheduling class: idle, best-effort, or best-effort:<level> (0 is highest
+                                  and 7 is lowest priority). None for no change.
+        @param int niceness: The increment of the niceness.
+        """
+        if niceness:
+            os.nice(niceness)
+
+        if io_class:
+            classes = {'best-effort': '2', 'idle': '3'}
+            name, _, level = io_class.partition(':')
+            if name not in classes:
+                raise BackupPcCloneException(f'Unknown I/O scheduling class {io_class}, available classes: idle, '
+                                             'best-effort, best-effort:<level>')
+
+            ionice = shutil.which('ionice')
+            if ionice is None:
+                raise BackupPcCloneException('Command ionice not found')
+
+            args = [ionice, '-c', classes[name], '-p', str(os.getpid())]
+            if level:
+                args[3:3] = ['-n', level]
+            subprocess.run(args, check=True)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __adjust(self, now: float) -> None:
+        """
+        Adjusts the number of workers, the byte rate, and the delay based on the latencies of the current window.
+
+        @param float now: The current (monotonic) time.
+        """
+        latencies = sorted(self.__latencies)
+        self.__latency = latencies[int(0.9 * (len(latencies) - 1))]
+        throughput = self.__window_bytes / max(now - self.__window_start, 1e-9)
+        rate = self.__rate_limiter.rate
+
+        if self.__latency > self.__latency_budget:
+            # Multiplicative decrease.
+            if self.__workers > 1:
+                self.__workers = max(1, self.__workers // 2)
+            elif throughput > 0.0 and (rate == 0.0 or rate > self.min_rate):
+                self.__rate_limiter.rate = max(self.min_rate, min(rate or throughput, throughput) / 2)
+            else:
+                self.__delay = min(self.max_delay, max(self.min_delay, 2 * self.__delay))
+        else:
+            # Additive increase.
+            if self.__delay:
+                self.__delay = 1.0 / (1.0 / self.__delay + self.operation_rate_step)
+                if self.__delay < self.min_delay:
+                    self.__delay = 0.0
+            elif rate != self.__max_rate:
+                rate += self.rate_step
+                if self.__max_rate and rate >= self.__max_rate:
+                    rate = self.__max_rate
+                elif not self.__max_rate and rate >= 2 * throughput:
+                    # The byte rate is not the bottleneck (anymore).
+                    rate = 0.0
+                self.__rate_limiter.rate = rate
+            elif self.__workers < self.__max_workers:
+                self.__workers += 1
+                self.__condition.notify_all()
+
+        self.__latencies = []
+        self.__window_start = now
+        self.__window_bytes = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @contextmanager
+    def __operation(self, size: int) -> Iterator[None]:
+        """
+        Runs an I/O operation under the control of the governor.
+
+        @param int size: The number of bytes moved by the operation.
+        """
+        with self.__condition:
+            while self.__active >= self.__workers:
+                self.__condition.wait()
+            self.__active += 1
+            delay = self.__delay
+
+        try:
+            if delay:
+                time.sleep(delay)
+            if size:
+                self.__rate_limiter.acquire(size)
+            start = time.perf_counter()
+            yield
+        finally:
+            with self.__condition:
+                self.__active -= 1
+                self.__condition.notify()
+
+        if self.__latency_budget > 0.0:
+            latency = (time.perf_counter() - start) / max(1, -(-size // self.block_size))
+            with self.__condition:
+                self.__latencies.append(latency)
+                self.__window_bytes += size
+                now = time.monotonic()
+                if now - self.__window_start >= self.window:
+                    self.__adjust(now)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def operation(self, size: int = 0) -> ContextManager[None]:
+        """
+        Returns a context manager for running an I/O operation under the control of the governor. The context manager
+        blocks until a worker slot and the bytes are available.
+
+        @param int size: The (estimated) number of bytes moved by the operation.
+        """
+        if not self.throttling:
+            return contextlib.nullcontext()
+
+        return self.__operation(size)
+
+# ----------------------------------------------------------------------------------------------------------------------
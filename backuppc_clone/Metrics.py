@@ -0,0 +1,175 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator
+
+from backuppc_clone.Config import Config
+from backuppc_clone.Profiler import Profiler
+
+
+class Metrics:
+    """
+    Singleton class recording the wall time, entries processed, bytes moved, and rates of the phases of cloning.
+    """
+    instance = None
+    """
+    The singleton instance of this class.
+
+    :type instance: backuppc_clone.Metrics.Metrics
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        if Metrics.instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            Metrics.instance = self
+
+        self.__phases: Dict[str, Dict] = {}
+        """
+        The metrics of the phases that have been completed by this process.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def phases(self) -> Dict[str, Dict]:
+        """
+        Returns the metrics of the phases that have been completed by this process.
+        """
+        return self.__phases
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def history(self) -> Dict[str, Dict]:
+        """
+        Returns the metrics of the last run of each phase, by this process or by previous processes (taken from the
+        status file).
+        """
+        phases = self.__read_phases(Config.instance.stats_path)
+        phases.update(self.__phases)
+
+        return phases
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict]:
+        """
+        Measures the wall time of a phase. The caller sets the number of processed entries and moved bytes in the
+        yielded dictionary. The metrics are recorded only when the phase completes without an exception. When profiling
+        is enabled the phase is profiled separately.
+
+        @param name: The name of the phase, e.g. pool_scan_original.
+        """
+        counters = {'entries': 0, 'bytes': 0}
+        start = time.monotonic()
+
+        if Profiler.instance is not None:
+            Profiler.instance.enter_phase(name)
+        try:
+            yield counters
+        finally:
+            if Profiler.instance is not None:
+                Profiler.instance.leave_phase()
+
+        self.record(name, time.monotonic() - start, counters['entries'], counters['bytes'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def record(self, name: str, duration: float, entries: int, moved_bytes: int) -> None:
+        """
+        Records the metrics of a phase measured by the caller, e.g. a stage of a pipeline running concurrently with
+        other stages.
+
+        @param name: The name of the phase, e.g. pool_copy.
+        @param duration: The time in seconds spent in the phase.
+        @param entries: The number of processed entries.
+        @param moved_bytes: The number of moved bytes.
+        """
+        self.__phases[name] = {'duration':        duration,
+                               'entries':         entries,
+                               'bytes':           moved_bytes,
+                               'entries_per_sec': entries / max(duration, 1e-9),
+                               'bytes_per_sec':   moved_bytes / max(duration, 1e-9),
+                               'end_time':        int(time.time())}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __read_phases(path: Path) -> Dict[str, Dict]:
+        """
+        Returns the metrics of the phases in an existing status file.
+
+        @param path: The path to the status file.
+        """
+        try:
+            return json.loads(path.read_text()).get('phases', {})
+        except (FileNotFoundError, ValueError, AttributeError):
+            return {}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __replace_file(path: Path, text: str) -> None:
+        """
+        Replaces a file atomically such that readers (e.g. the nagios command or the node exporter) never read a
+        partially written file.
+
+        @param path: The path to the file.
+        @param text: The new content of the file.
+        """
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}')
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __write_textfile(path: Path, stats: Dict, phases: Dict[str, Dict]) -> None:
+        """
+        Writes the overview stats and the metrics of the phases in the text format of Prometheus.
+
+        @param path: The path to the textfile.
+        @param stats: The overview stats.
+        @param phases: The metrics of the phases.
+        """
+        lines = []
+        for key, value in stats.items():
+            if isinstance(value, int):
+                lines.append(f'# TYPE backuppc_clone_{key} gauge')
+                lines.append(f'backuppc_clone_{key} {value}')
+
+        gauges = {'duration':        ('phase_duration_seconds', 'Wall time of the last run of the phase.'),
+                  'entries':         ('phase_entries', 'Number of entries processed by the last run of the phase.'),
+                  'bytes':           ('phase_bytes', 'Number of bytes moved by the last run of the phase.'),
+                  'entries_per_sec': ('phase_entries_per_second', 'Entries per second of the last run of the phase.'),
+                  'bytes_per_sec':   ('phase_bytes_per_second', 'Bytes per second of the last run of the phase.'),
+                  'end_time':        ('phase_end_time_seconds', 'End time of the last run of the phase.')}
+        for key, (name, description) in gauges.items():
+            lines.append(f'# HELP backuppc_clone_{name} {description}')
+            lines.append(f'# TYPE backuppc_clone_{name} gauge')
+            for phase, metrics in sorted(phases.items()):
+                if key in metrics:
+                    lines.append(f'backuppc_clone_{name}{{phase="{phase}"}} {metrics[key]}')
+
+        Metrics.__replace_file(path, '\n'.join(lines) + '\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def write_status(self, stats: Dict) -> None:
+        """
+        Writes the overview stats and the metrics of the phases to the status file and, if configured, to the textfile
+        for the node exporter. The metrics of phases not run by this process are taken from the existing status file.
+
+        @param stats: The overview stats.
+        """
+        phases = self.history
+
+        status = dict(stats)
+        status['phases'] = phases
+        self.__replace_file(Config.instance.stats_path, json.dumps(status, indent=4))
+
+        textfile_path = Config.instance.metrics_textfile_path
+        if textfile_path:
+            self.__write_textfile(textfile_path, stats, phases)
+
+# ----------------------------------------------------------------------------------------------------------------------
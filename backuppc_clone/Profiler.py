@@ -0,0 +1,236 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+
+class Profiler:
+    """
+    Singleton class profiling a command and its phases with cProfile and a sampling profiler. Writes pstats files and
+    collapsed stacks (the input format of flamegraph.pl and speedscope) per command and per phase.
+    """
+    instance = None
+    """
+    The singleton instance of this class.
+
+    :type instance: backuppc_clone.Profiler.Profiler
+    """
+
+    sample_interval: float = 0.005
+    """
+    The interval in seconds between two samples of the stack of the main thread.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, command_name: str, output_path: Path):
+        """
+        Object constructor.
+
+        @param command_name: The name of the profiled command.
+        @param output_path: The path to the directory for the profiling data.
+        """
+        if Profiler.instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            Profiler.instance = self
+
+        self.__command_name: str = command_name
+        """
+        The name of the profiled command.
+        """
+
+        self.__output_path: Path = output_path
+        """
+        The path to the directory for the profiling data.
+        """
+
+        self.__profile: cProfile.Profile = cProfile.Profile()
+        """
+        The profile of the command outside phases.
+        """
+
+        self.__phase_profiles: Dict[str, cProfile.Profile] = {}
+        """
+        The profiles of the phases.
+        """
+
+        self.__phase: str | None = None
+        """
+        The name of the current phase.
+        """
+
+        self.__outer_phases: List[str | None] = []
+        """
+        The names of the phases enclosing the current phase, the outermost first. None stands for the command outside
+        phases.
+        """
+
+        self.__samples: Counter = Counter()
+        """
+        The number of samples per phase and collapsed stack.
+        """
+
+        self.__thread_id: int = threading.get_ident()
+        """
+        The ID of the profiled (i.e. main) thread.
+        """
+
+        self.__stop: threading.Event = threading.Event()
+        """
+        Signals the sampler to stop.
+        """
+
+        self.__sampler: threading.Thread | None = None
+        """
+        The sampler thread.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __run_sampler(self) -> None:
+        """
+        Samples the stack of the profiled thread until stopped.
+        """
+        while not self.__stop.wait(Profiler.sample_interval):
+            frame = sys._current_frames().get(self.__thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            self.__samples[(self.__phase, ';'.join(reversed(stack)))] += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def start(self) -> None:
+        """
+        Starts profiling.
+        """
+        self.__stop.clear()
+        self.__sampler = threading.Thread(target=self.__run_sampler, daemon=True)
+        self.__sampler.start()
+        self.__profile.enable()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def restart(self, command_name: str) -> None:
+        """
+        Discards the profiling data and starts profiling again, e.g. in a forked child process (a fork inherits the
+        profiling data of its parent but not the sampler thread).
+
+        @param command_name: The name of the profiled command.
+        """
+        self.__leave_all_phases()
+        self.__profile.disable()
+
+        self.__command_name = command_name
+        self.__profile = cProfile.Profile()
+        self.__phase_profiles = {}
+        self.__phase = None
+        self.__outer_phases = []
+        self.__samples = Counter()
+        self.__thread_id = threading.get_ident()
+        self.__stop = threading.Event()
+
+        self.start()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def enter_phase(self, name: str) -> None:
+        """
+        Switches profiling to a phase.
+
+        @param name: The name of the phase.
+        """
+        if name not in self.__phase_profiles:
+            self.__phase_profiles[name] = cProfile.Profile()
+
+        self.__current_profile().disable()
+        self.__outer_phases.append(self.__phase)
+        self.__phase = name
+        self.__phase_profiles[name].enable()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def leave_phase(self) -> None:
+        """
+        Switches profiling from the current phase back to the enclosing phase or, if the current phase is not nested,
+        to the command.
+        """
+        if self.__phase is not None:
+            self.__phase_profiles[self.__phase].disable()
+            self.__phase = self.__outer_phases.pop()
+            self.__current_profile().enable()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __leave_all_phases(self) -> None:
+        """
+        Switches profiling from the current phase and all enclosing phases back to the command.
+        """
+        while self.__phase is not None:
+            self.leave_phase()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __current_profile(self) -> cProfile.Profile:
+        """
+        Returns the profile of the current phase or, outside phases, the profile of the command.
+        """
+        if self.__phase is None:
+            return self.__profile
+
+        return self.__phase_profiles[self.__phase]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __write_collapsed(self, path: Path, phase: str | None) -> None:
+        """
+        Writes collapsed stacks.
+
+        @param path: The path to the output file.
+        @param phase: The name of the phase. If None the stacks of all phases and outside phases are written.
+        """
+        stacks: Counter = Counter()
+        for (sample_phase, stack), count in self.__samples.items():
+            if phase is None or sample_phase == phase:
+                stacks[stack] += count
+
+        with open(path, 'w') as file:
+            for stack, count in sorted(stacks.items()):
+                file.write(f'{stack} {count}\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def stop(self) -> List[Path]:
+        """
+        Stops profiling and writes the profiling data. Returns the paths to the written files.
+        """
+        self.__leave_all_phases()
+        self.__profile.disable()
+        self.__stop.set()
+        if self.__sampler is not None:
+            self.__sampler.join()
+
+        self.__output_path.mkdir(parents=True, exist_ok=True)
+        prefix = f'profile-{self.__command_name}-{os.getpid()}'
+        paths = []
+
+        stats = pstats.Stats(self.__profile)
+        for phase, profile in self.__phase_profiles.items():
+            stats.add(profile)
+
+            path = self.__output_path.joinpath(f'{prefix}-{phase}.pstats')
+            profile.dump_stats(path)
+            paths.append(path)
+
+            path = self.__output_path.joinpath(f'{prefix}-{phase}.collapsed')
+            self.__write_collapsed(path, phase)
+            paths.append(path)
+
+        path = self.__output_path.joinpath(f'{prefix}.pstats')
+        stats.dump_stats(path)
+        paths.append(path)
+
+        path = self.__output_path.joinpath(f'{prefix}.collapsed')
+        self.__write_collapsed(path, None)
+        paths.append(path)
+
+        return paths
+
+# ----------------------------------------------------------------------------------------------------------------------
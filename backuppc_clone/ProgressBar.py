@@ -1,13 +1,21 @@
+import threading
 import time
 
 from cleo.io.io import IO
 from cleo.io.outputs.output import Output
 from cleo.ui.progress_bar import ProgressBar as CleoProgressBar
 
+from backuppc_clone.IoGovernor import IoGovernor
+from backuppc_clone.misc import sizeof_fmt, time_fmt
+
 
 class ProgressBar(CleoProgressBar):
     """
     Customized version of Cleo's ProgressBar.
+
+    Hot loops only bump the plain counters count and bytes (or call advance()). Hot loops running in several threads at
+    the same time call add() instead. A background ticker thread renders the progress bar every refresh_interval seconds
+    including the instantaneous rates.
     """
     refresh_interval: int = 10
     """
@@ -15,61 +23,187 @@ class ProgressBar(CleoProgressBar):
     """
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __init__(self, io: IO | Output, maximum: int = 0):
+    def __init__(self, io: IO | Output, maximum: int = 0, unit: str = 'files', maximum_bytes: int = 0):
         """
         Constructor.
 
         @param Output output: The output object.
         @param int maximum: Maximum steps (0 if unknown).
+        @param str unit: The unit of the steps, e.g. files or directories.
+        @param int maximum_bytes: The total number of bytes to process (0 if unknown). If known, the remaining time is
+                                  estimated from the processed bytes instead of the steps.
         """
         CleoProgressBar.__init__(self, io, maximum)
 
-        self.__last_display: int = -1
+        self.count: int = 0
+        """
+        The current progress. Bumped by the hot loops, rendered by the ticker.
+        """
+
+        self.bytes: int = 0
         """
-        The last epoch the progress bar was printed.
+        The number of processed bytes (if applicable). Bumped by the hot loops, rendered by the ticker.
+        """
+
+        self.__lock: threading.Lock = threading.Lock()
+        """
+        Guards the counters against lost updates by concurrent threads.
+        """
+
+        self.__unit: str = unit
+        """
+        The unit of the steps.
+        """
+
+        self.__maximum_bytes: int = maximum_bytes
+        """
+        The total number of bytes to process.
+        """
+
+        self.__count_rate: float = 0.0
+        """
+        The number of steps per second.
+        """
+
+        self.__bytes_rate: float = 0.0
+        """
+        The number of bytes per second.
+        """
+
+        self.__start_time: float = time.monotonic()
+        """
+        The time the progress bar was started.
+        """
+
+        self.__tick_time: float = self.__start_time
+        """
+        The time of the last tick.
+        """
+
+        self.__tick_count: int = 0
+        """
+        The progress at the last tick.
+        """
+
+        self.__tick_bytes: int = 0
+        """
+        The processed bytes at the last tick.
         """
 
         # Show now "0/max [>------] ) 0%" (instead of after step 1: "1/max [>------] 0% very long time".
         self.set_format(' %current%/%max% [%bar%] %percent:3s%%')
-        self.set_progress(0)
+        CleoProgressBar.set_progress(self, 0)
+
+        # Display the remaining time and rates.
+        self.set_format(' %current%/%max% [%bar%] %percent:3s%% %remaining% %rate%')
+
+        self.__stop: threading.Event = threading.Event()
+        """
+        Signals the ticker to stop.
+        """
+
+        self.__ticker: threading.Thread = threading.Thread(target=self.__run_ticker, daemon=True)
+        """
+        The ticker thread.
+        """
+        self.__ticker.start()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __run_ticker(self) -> None:
+        """
+        Renders the progress bar every refresh interval until stopped.
+        """
+        while not self.__stop.wait(ProgressBar.refresh_interval):
+            now = time.monotonic()
+            count = self.count
+            size = self.bytes
+
+            interval = max(now - self.__tick_time, 1e-9)
+            self.__count_rate = (count - self.__tick_count) / interval
+            self.__bytes_rate = (size - self.__tick_bytes) / interval
+
+            self.__tick_time = now
+            self.__tick_count = count
+            self.__tick_bytes = size
 
-        # Display the remaining time.
-        self.set_format(' %current%/%max% [%bar%] %percent:3s%% %remaining%')
+            CleoProgressBar.set_progress(self, count)
 
     # ------------------------------------------------------------------------------------------------------------------
-    def finish(self) -> None:
+    def _formatter_rate(self) -> str:
         """
-        Finish the progress output.
+        Returns the rate of steps and (if applicable) bytes per second and the decisions of the I/O governor.
         """
-        # Force set_progress to call the parent method.
-        self.__last_display = -1
+        rate = f'{self.__count_rate:.0f} {self.__unit}/s'
+        if self.__bytes_rate:
+            rate += f' {sizeof_fmt(self.__bytes_rate)}/s'
+        if IoGovernor.instance is not None and IoGovernor.instance.throttling:
+            rate += f' ({IoGovernor.instance.status})'
 
-        # No more remaining time, display the total elapsed time.
-        self.set_format(' %current%/%max% [%bar%] %percent:3s%% %elapsed%')
+        return rate
 
-        CleoProgressBar.finish(self)
-        self._io.write_line('')
+    # ------------------------------------------------------------------------------------------------------------------
+    def _formatter_remaining(self) -> str:
+        """
+        Returns the estimated remaining time.
+        """
+        if self.__maximum_bytes and self.bytes:
+            remaining = round((time.time() - self._start_time) / self.bytes * max(self.__maximum_bytes - self.bytes, 0))
+
+            return time_fmt(remaining)
+
+        if not self._step or not self._max:
+            return time_fmt(0)
+
+        remaining = round((time.time() - self._start_time) / self._step * max(self._max - self._step, 0))
+
+        return time_fmt(remaining)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def advance(self, step: int = 1) -> None:
+        """
+        Advances the progress. Rendering is left to the ticker.
+
+        @param int step: The number of steps.
+        """
+        self.count += step
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def add(self, step: int = 0, size: int = 0) -> None:
+        """
+        Advances the progress and the number of processed bytes. Unlike bumping the counters, this method is thread
+        safe. Rendering is left to the ticker.
+
+        @param int step: The number of steps.
+        @param int size: The number of bytes.
+        """
+        with self.__lock:
+            self.count += step
+            self.bytes += size
 
     # ------------------------------------------------------------------------------------------------------------------
     def set_progress(self, step: int) -> None:
         """
-        Sets the current progress.
+        Sets the current progress. Rendering is left to the ticker.
 
         @param int step: The current progress.
         """
-        if self._should_overwrite:
-            now = time.time()
-            if self.__last_display == -1 or (now - self.__last_display) > ProgressBar.refresh_interval:
-                CleoProgressBar.set_progress(self, step)
-                self.__last_display = now
-            else:
-                if self._max and step > self._max:
-                    self._max = step
-                elif step < 0:
-                    step = 0
-                self._step = step
-
-        else:
-            CleoProgressBar.set_progress(self, step)
+        self.count = step
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def finish(self) -> None:
+        """
+        Finish the progress output.
+        """
+        self.__stop.set()
+        self.__ticker.join()
+
+        # No more remaining time, display the total elapsed time and the average rates.
+        duration = max(time.monotonic() - self.__start_time, 1e-9)
+        self.__count_rate = self.count / duration
+        self.__bytes_rate = self.bytes / duration
+        self.set_format(' %current%/%max% [%bar%] %percent:3s%% %elapsed% %rate%')
+
+        CleoProgressBar.set_progress(self, max(self.count, self._max))
+        self._io.write_line('')
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,129 @@
+import re
+import sqlite3
+from typing import Callable, Dict, List
+
+from cleo.formatters.formatter import Formatter
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.InstrumentedCursor import InstrumentedCursor
+
+
+class SqlProfiler:
+    """
+    Opt-in instrumentation of the SQL statements executed by the DataLayer. Records the execution time and row counts
+    per statement, logs slow statements with their query plan, and shows the top statements.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO, slow_query_time: float, top: int):
+        """
+        Object constructor.
+
+        @param CloneIO io: The output style.
+        @param float slow_query_time: Statements taking longer than this number of seconds are logged.
+        @param int top: The number of statements in the summary.
+        """
+        self.__io: CloneIO = io
+        """
+        The output style.
+        """
+
+        self.__slow_query_time: float = slow_query_time
+        """
+        Statements taking longer than this number of seconds are logged.
+        """
+
+        self.__top: int = top
+        """
+        The number of statements in the summary.
+        """
+
+        self.__stats: Dict[str, Dict] = {}
+        """
+        The statistics per (normalized) SQL statement.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def cursor_factory(self) -> Callable[[sqlite3.Connection], sqlite3.Cursor]:
+        """
+        Returns the factory for cursors reporting to this profiler.
+        """
+        return lambda connection: InstrumentedCursor(connection, self)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __explain(connection: sqlite3.Connection, sql: str, params) -> List[str]:
+        """
+        Returns the query plan of a SQL statement.
+
+        @param sqlite3.Connection connection: The connection to the database.
+        @param str sql: The SQL statement.
+        @param iterable params: The arguments for the SQL statement.
+        """
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute('explain query plan ' + sql, params)
+            rows = cursor.fetchall()
+        except sqlite3.Error as error:
+            rows = [(0, 0, 0, str(error))]
+        finally:
+            cursor.close()
+
+        depths = {0: -1}
+        lines = []
+        for node_id, parent_id, _, detail in rows:
+            depths[node_id] = depths.get(parent_id, -1) + 1
+            lines.append('  ' * depths[node_id] + detail)
+
+        return lines
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def record(self, connection: sqlite3.Connection, sql: str, params, duration: float, row_count: int) -> None:
+        """
+        Records the execution of a SQL statement.
+
+        @param sqlite3.Connection connection: The connection on which the SQL statement was executed.
+        @param str sql: The SQL statement.
+        @param iterable|None params: The arguments for the SQL statement, None for executemany.
+        @param float duration: The execution time in seconds.
+        @param int row_count: The number of fetched or affected rows.
+        """
+        key = re.sub(r'\s+', ' ', sql).strip()
+        stats = self.__stats.get(key)
+        if stats is None:
+            stats = {'count': 0, 'duration': 0.0, 'max': 0.0, 'rows': 0}
+            self.__stats[key] = stats
+
+        stats['count'] += 1
+        stats['duration'] += duration
+        stats['max'] = max(stats['max'], duration)
+        stats['rows'] += row_count
+
+        if duration >= self.__slow_query_time:
+            self.__io.text(f'Slow statement ({duration:.3f}s, {row_count} rows): <sql>{Formatter.escape(key)}</sql>')
+            if params is not None and key.lower().startswith(('select', 'insert', 'update', 'delete', 'with')):
+                self.__io.text([Formatter.escape(line) for line in self.__explain(connection, sql, params)])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def show_summary(self) -> None:
+        """
+        Shows the statements with the largest total execution time.
+        """
+        if not self.__stats:
+            return
+
+        self.__io.write_line('')
+        self.__io.sub_title('SQL statements')
+
+        lines = ['   total      max  calls       rows  statement']
+        ranking = sorted(self.__stats.items(), key=lambda item: item[1]['duration'], reverse=True)
+        for key, stats in ranking[:self.__top]:
+            statement = key if len(key) <= 70 else key[:67] + '...'
+            lines.append(f"{stats['duration']:7.2f}s {stats['max']:7.2f}s {stats['count']:6d} {stats['rows']:10d}  "
+                         f"{Formatter.escape(statement)}")
+        self.__io.text(lines)
+        self.__io.write_line('')
+
+# ----------------------------------------------------------------------------------------------------------------------
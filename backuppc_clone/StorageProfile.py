@@ -0,0 +1,85 @@
+from typing import Dict
+
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+
+
+class StorageProfile:
+    """
+    A named set of SQLite storage settings for the metadata database.
+    """
+    profiles: Dict[str, 'StorageProfile'] = {}
+    """
+    The available storage profiles.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self,
+                 name: str,
+                 journal_mode: str,
+                 synchronous: str,
+                 mmap_size: int,
+                 page_size: int,
+                 cache_size: int):
+        """
+        Object constructor.
+
+        @param name: The name of the profile.
+        @param journal_mode: The journal mode.
+        @param synchronous: The synchronous flag.
+        @param mmap_size: The maximum number of bytes of the database file that will be accessed using memory-mapped
+                          I/O.
+        @param page_size: The page size for new databases.
+        @param cache_size: The cache size in KiB.
+        """
+        self.name: str = name
+        """
+        The name of the profile.
+        """
+
+        self.journal_mode: str = journal_mode
+        """
+        The journal mode.
+        """
+
+        self.synchronous: str = synchronous
+        """
+        The synchronous flag.
+        """
+
+        self.mmap_size: int = mmap_size
+        """
+        The maximum number of bytes of the database file that will be accessed using memory-mapped I/O.
+        """
+
+        self.page_size: int = page_size
+        """
+        The page size for new databases.
+        """
+
+        self.cache_size: int = cache_size
+        """
+        The cache size in KiB.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def get(name: str) -> 'StorageProfile':
+        """
+        Returns a storage profile given its name.
+
+        @param name: The name of the profile.
+        """
+        if name not in StorageProfile.profiles:
+            raise BackupPcCloneException('Unknown storage profile {}, available profiles: {}'.
+                                         format(name, ', '.join(StorageProfile.profiles)))
+
+        return StorageProfile.profiles[name]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+StorageProfile.profiles = {profile.name: profile for profile in
+                           [StorageProfile('safe', 'delete', 'full', 0, 4096, 200000),
+                            StorageProfile('fast-ssd', 'wal', 'normal', 1024 * 1024 * 1024, 8192, 400000),
+                            StorageProfile('low-memory', 'delete', 'full', 0, 4096, 16000)]}
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -1,23 +1,36 @@
-from cleo.application import Application
+import importlib
+from typing import Callable, Dict
 
-from backuppc_clone.command.AutoCommand import AutoCommand
-from backuppc_clone.command.BackupCloneCommand import BackupCloneCommand
-from backuppc_clone.command.BackupDeleteCommand import BackupDeleteCommand
-from backuppc_clone.command.BackupPreScanCommand import BackupPreScanCommand
-from backuppc_clone.command.HostDeleteCommand import HostDeleteCommand
-from backuppc_clone.command.InitCloneCommand import InitCloneCommand
-from backuppc_clone.command.InitOriginalCommand import InitOriginalCommand
-from backuppc_clone.command.NagiosCommand import NagiosCommand
-from backuppc_clone.command.PoolCommand import PoolCommand
-from backuppc_clone.command.SyncAuxiliaryCommand import SyncAuxiliaryCommand
-from backuppc_clone.command.TraversePerformanceTestCommand import TraversePerformanceTestCommand
-from backuppc_clone.command.VacuumCommand import VacuumCommand
+from cleo.application import Application
+from cleo.commands.command import Command
+from cleo.io.inputs.definition import Definition
+from cleo.io.inputs.option import Option
+from cleo.loaders.factory_command_loader import FactoryCommandLoader
 
 
 class BackupPcCloneApplication(Application):
     """
     The BackupPC Clone application.
     """
+    commands: Dict[str, str] = {'auto':                      'AutoCommand',
+                                'backup-clone':              'BackupCloneCommand',
+                                'backup-delete':             'BackupDeleteCommand',
+                                'backup-pre-scan':           'BackupPreScanCommand',
+                                'benchmark':                 'BenchmarkCommand',
+                                'host-delete':               'HostDeleteCommand',
+                                'init-clone':                'InitCloneCommand',
+                                'init-original':             'InitOriginalCommand',
+                                'nagios':                    'NagiosCommand',
+                                'plan':                      'PlanCommand',
+                                'pool':                      'PoolCommand',
+                                'sync-auxiliary':            'SyncAuxiliaryCommand',
+                                'traverse-performance-test': 'TraversePerformanceTestCommand',
+                                'vacuum':                    'VacuumCommand',
+                                'verify':                    'VerifyCommand'}
+    """
+    The names of the commands and their classes. The module of a command is imported only when the command is run (or
+    listed).
+    """
 
     # ------------------------------------------------------------------------------------------------------------------
     def __init__(self):
@@ -26,17 +39,37 @@ class BackupPcCloneApplication(Application):
         """
         Application.__init__(self, 'backuppc-clone', '0.0.0')
 
-        self.add(AutoCommand())
-        self.add(BackupCloneCommand())
-        self.add(BackupDeleteCommand())
-        self.add(BackupPreScanCommand())
-        self.add(HostDeleteCommand())
-        self.add(InitCloneCommand())
-        self.add(InitOriginalCommand())
-        self.add(NagiosCommand())
-        self.add(PoolCommand())
-        self.add(SyncAuxiliaryCommand())
-        self.add(TraversePerformanceTestCommand())
-        self.add(VacuumCommand())
+        factories = {name: self.__command_factory(class_name) for name, class_name in self.commands.items()}
+        self.set_command_loader(FactoryCommandLoader(factories))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def _default_definition(self) -> Definition:
+        """
+        Returns the options and arguments available for all commands.
+        """
+        definition = Application._default_definition.fget(self)
+        definition.add_option(Option('--profile',
+                                     flag=True,
+                                     description='Write profiling data (pstats and collapsed stacks) to the tmp '
+                                                 'directory of the clone.'))
+
+        return definition
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __command_factory(class_name: str) -> Callable[[], Command]:
+        """
+        Returns a factory that imports the module of a command and creates the command.
+
+        @param class_name: The name of the class of the command.
+        """
+
+        def factory() -> Command:
+            module = importlib.import_module(f'backuppc_clone.command.{class_name}')
+
+            return getattr(module, class_name)()
+
+        return factory
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,151 @@
+import abc
+import csv
+import random
+from pathlib import Path
+from typing import Dict, List
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.StorageProfile import StorageProfile
+
+
+class Benchmark(metaclass=abc.ABCMeta):
+    """
+    Abstract parent class for all performance benchmarks.
+    """
+    name: str = ''
+    """
+    The name of the benchmark.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO, work_path: Path, size: int):
+        """
+        Object constructor.
+
+        @param io: The output style.
+        @param work_path: The path to the directory for temporary files.
+        @param size: The size of the benchmark, e.g. the number of rows or files.
+        """
+        self._io: CloneIO = io
+        """
+        The output style.
+        """
+
+        self._work_path: Path = work_path
+        """
+        The path to the directory for temporary files.
+        """
+
+        self._size: int = size
+        """
+        The size of the benchmark.
+        """
+
+        self.__results: List[Dict] = []
+        """
+        The results of the benchmark.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def results(self) -> List[Dict]:
+        """
+        Returns the results of the benchmark.
+        """
+        return self.__results
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _record(self, variant: str, count: int, unit: str, duration: float) -> None:
+        """
+        Records the result of a variant of the benchmark.
+
+        @param variant: The name of the variant.
+        @param count: The number of processed units.
+        @param unit: The unit, e.g. rows or files.
+        @param duration: The duration in seconds.
+        """
+        self.__results.append({'benchmark': self.name,
+                               'variant':   variant,
+                               'count':     count,
+                               'unit':      unit,
+                               'duration':  duration,
+                               'rate':      count / max(duration, 1e-9)})
+
+        self._io.log_verbose(f'{variant}: {count} {unit} in {duration:.3f}s')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _new_database(self, profile: StorageProfile | None = None) -> None:
+        """
+        Creates a new and empty metadata database in the work directory and connects to it.
+
+        @param profile: The storage profile. If None the safe profile is used.
+        """
+        db_path = self._work_path.joinpath('benchmark.db')
+        profile = profile or StorageProfile.get('safe')
+
+        if DataLayer.instance is not None:
+            DataLayer.instance.disconnect()
+
+        for path in [db_path, Path(f'{db_path}-journal'), Path(f'{db_path}-wal'), Path(f'{db_path}-shm')]:
+            if path.exists():
+                path.unlink()
+        DataLayer.create_database(str(db_path), profile)
+
+        if DataLayer.instance is None:
+            DataLayer(str(db_path), str(self._work_path), profile)
+        else:
+            DataLayer.instance.profile = profile
+            DataLayer.instance.connect()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_pool_csv(self, path: Path) -> List[int]:
+        """
+        Writes a CSV file like a scan of a pool in random inode order. Returns the inodes of the pool files.
+
+        @param path: The path to the CSV file.
+        """
+        generator = random.Random(1)
+        inodes = generator.sample(range(1, 10 * self._size), self._size)
+
+        with open(path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            for inode in inodes:
+                name = '{:032x}'.format(generator.getrandbits(128))
+                csv_writer.writerow((inode, 'cpool/{}/{}/{}'.format(name[0], name[1], name[2]), name))
+
+        return inodes
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_tree_csv(self, path: Path, inodes: List[int]) -> None:
+        """
+        Writes a CSV file like a scan of a host backup with 20 files per directory linked to random pool files.
+
+        @param path: The path to the CSV file.
+        @param inodes: The inodes of the pool files.
+        """
+        generator = random.Random(2)
+
+        with open(path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            seq = 0
+            dir_name = None
+            for index in range(self._size):
+                if index % 21 == 0:
+                    seq += 1
+                    sub_dir_name = 'fdir{}'.format(index)
+                    csv_writer.writerow((seq, None, dir_name, sub_dir_name))
+                    dir_name = sub_dir_name
+                    seq += 1
+                else:
+                    csv_writer.writerow((seq, generator.choice(inodes), dir_name, 'ffile{}'.format(index)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @abc.abstractmethod
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        raise NotImplementedError()
+
+# ----------------------------------------------------------------------------------------------------------------------
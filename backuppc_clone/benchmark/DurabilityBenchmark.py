@@ -0,0 +1,71 @@
+import os
+import random
+import shutil
+import time
+
+from backuppc_clone.benchmark.Benchmark import Benchmark
+from backuppc_clone.Durability import Durability
+
+
+class DurabilityBenchmark(Benchmark):
+    """
+    Compares the durability modes on copying files like pool files followed by a commit checkpoint.
+    """
+    name = 'durability'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __generate(self) -> int:
+        """
+        Generates the source files with sizes between 1KiB and 64KiB. Returns the total size of the files.
+        """
+        generator = random.Random(1)
+        total_size = 0
+        for index in range(self._size):
+            dir_path = self._work_path.joinpath('source', f'{index % 256:02x}')
+            dir_path.mkdir(parents=True, exist_ok=True)
+            size = generator.randint(1024, 64 * 1024)
+            dir_path.joinpath(f'file{index}').write_bytes(os.urandom(size))
+            total_size += size
+
+        return total_size
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __copy(self, mode: str) -> None:
+        """
+        Copies the source files with a durability mode.
+
+        @param mode: The durability mode.
+        """
+        source_path = self._work_path.joinpath('source')
+        target_path = self._work_path.joinpath(f'target-{mode}')
+        durability = Durability(mode, self._work_path)
+
+        # Start without dirty pages of previous runs.
+        os.sync()
+
+        start = time.perf_counter()
+        for index in range(self._size):
+            dir_name = f'{index % 256:02x}'
+            target_dir_path = target_path.joinpath(dir_name)
+            target_dir_path.mkdir(parents=True, exist_ok=True)
+            target_file_path = target_dir_path.joinpath(f'file{index}')
+            shutil.copy(source_path.joinpath(dir_name, f'file{index}'), target_file_path)
+            durability.sync_file(target_file_path)
+        durability.sync_filesystem()
+
+        self._record(f'{mode} copy', self._size, 'files', time.perf_counter() - start)
+
+        shutil.rmtree(target_path)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        total_size = self.__generate()
+        self._io.log_verbose(f'Generated {self._size} files with {total_size} bytes')
+
+        for mode in Durability.modes:
+            self.__copy(mode)
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,201 @@
+import configparser
+import hashlib
+import os
+import random
+from pathlib import Path
+from typing import List, Tuple
+
+from backuppc_clone.DataLayer import DataLayer
+
+
+class FixtureGenerator:
+    """
+    Generates a synthetic BackupPC v3 original and an empty clone of the original.
+
+    The original has a compressed pool with hashed shards (cpool/x/y/z/<hash>), hosts with host backups
+    (pc/<host>/<number>) with a backupInfo file, an attrib file in each directory, and files hard linked to the pool
+    (and a few files not in the pool). Successive host backups share most of their pool files like incremental backups.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, work_path: Path, size: int, host_count: int = 2, backup_count: int = 2):
+        """
+        Object constructor.
+
+        @param work_path: The path to the directory for the original and the clone.
+        @param size: The number of files in the pool of the original.
+        @param host_count: The number of hosts.
+        @param backup_count: The number of backups per host.
+        """
+        self.__work_path: Path = work_path
+        """
+        The path to the directory for the original and the clone.
+        """
+
+        self.__size: int = size
+        """
+        The number of files in the pool of the original.
+        """
+
+        self.__host_count: int = host_count
+        """
+        The number of hosts.
+        """
+
+        self.__backup_count: int = backup_count
+        """
+        The number of backups per host.
+        """
+
+        self.__generator: random.Random = random.Random(1)
+        """
+        The random generator. Seeded for reproducible fixtures.
+        """
+
+        self.file_count: int = 0
+        """
+        The number of generated files (including hard links).
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def original_path(self) -> Path:
+        """
+        Returns the path to the top directory of the original.
+        """
+        return self.__work_path.joinpath('original')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def clone_path(self) -> Path:
+        """
+        Returns the path to the top directory of the clone.
+        """
+        return self.__work_path.joinpath('clone')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def clone_config_path(self) -> Path:
+        """
+        Returns the path to the configuration file of the clone.
+        """
+        return self.clone_path.joinpath('clone.cfg')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def backups(self) -> List[Tuple[str, int]]:
+        """
+        Returns the hosts and numbers of the host backups.
+        """
+        return [(f'host{host_index}', backup_no)
+                for host_index in range(self.__host_count)
+                for backup_no in range(self.__backup_count)]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __generate_pool(self) -> List[Path]:
+        """
+        Generates the files in the compressed pool of the original. Returns the paths to the pool files.
+        """
+        paths = []
+        for index in range(self.__size):
+            name = hashlib.md5(str(index).encode()).hexdigest()
+            dir_path = self.original_path.joinpath('cpool', name[0], name[1], name[2])
+            dir_path.mkdir(parents=True, exist_ok=True)
+
+            path = dir_path.joinpath(name)
+            path.write_bytes(self.__generator.randbytes(self.__generator.randint(1, 4096)))
+            paths.append(path)
+            self.file_count += 1
+
+        return paths
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __generate_backup(self, pool_paths: List[Path], host_index: int, backup_no: int) -> None:
+        """
+        Generates a host backup.
+
+        @param pool_paths: The paths to the pool files.
+        @param host_index: The index of the host.
+        @param backup_no: The number of the backup.
+        """
+        host_path = self.original_path.joinpath('pc', f'host{host_index}')
+        backup_path = host_path.joinpath(str(backup_no))
+        backup_path.mkdir(parents=True)
+        host_path.joinpath('backups').write_text('')
+
+        file_count = self.__size // 2
+        offset = 7 * backup_no + 13 * host_index
+        dir_path = None
+        for index in range(file_count):
+            if index % 20 == 0:
+                dir_path = backup_path.joinpath('f%2f', f'fdir{index // 400}', f'fdir{index // 20}')
+                dir_path.mkdir(parents=True)
+                dir_path.joinpath('attrib').write_bytes(self.__generator.randbytes(64))
+                self.file_count += 1
+
+            file_path = dir_path.joinpath(f'ffile{index}')
+            if index % 100 == 99:
+                # A file not in the pool.
+                file_path.write_bytes(self.__generator.randbytes(self.__generator.randint(1, 4096)))
+            else:
+                os.link(pool_paths[(index + offset) % len(pool_paths)], file_path)
+            self.file_count += 1
+
+        backup_path.joinpath('attrib').write_bytes(self.__generator.randbytes(64))
+        backup_path.joinpath('backupInfo').write_text("%backupInfo = (\n"
+                                                      f"  'nFiles' => '{file_count}',\n"
+                                                      f"  'endTime' => '{1700000000 + 86400 * backup_no}',\n"
+                                                      f"  'level' => '{0 if backup_no == 0 else 1}',\n"
+                                                      f"  'type' => '{'full' if backup_no == 0 else 'incr'}',\n"
+                                                      ");\n")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __generate_original(self) -> None:
+        """
+        Generates the original.
+        """
+        for dir_name in ['cpool', 'pool', 'pc']:
+            self.original_path.joinpath(dir_name).mkdir(parents=True)
+
+        config = configparser.ConfigParser()
+        config['BackupPC Clone'] = {'role': 'original',
+                                    'name': 'fixture'}
+        config['Original'] = {'top_dir':  str(self.original_path),
+                              'conf_dir': str(self.original_path),
+                              'log_dir':  str(self.original_path),
+                              'pc_dir':   str(self.original_path.joinpath('pc'))}
+        with open(self.original_path.joinpath('original.cfg'), 'w') as file:
+            config.write(file)
+
+        pool_paths = self.__generate_pool()
+        for host_index in range(self.__host_count):
+            for backup_no in range(self.__backup_count):
+                self.__generate_backup(pool_paths, host_index, backup_no)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __generate_clone(self) -> None:
+        """
+        Generates an empty clone of the original.
+        """
+        for dir_name in ['cpool', 'pool', 'etc', 'pc', 'tmp', 'trash']:
+            self.clone_path.joinpath(dir_name).mkdir(parents=True)
+
+        config = configparser.ConfigParser()
+        config['BackupPC Clone'] = {'role': 'clone',
+                                    'name': 'fixture-clone'}
+        config['Original'] = {'config': str(self.original_path.joinpath('original.cfg')),
+                              'name':   'fixture'}
+        with open(self.clone_config_path, 'w') as file:
+            config.write(file)
+
+        DataLayer.create_database(str(self.clone_path.joinpath('clone.db')))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def generate(self) -> None:
+        """
+        Generates the original and the clone.
+        """
+        self.__generate_original()
+        self.__generate_clone()
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,80 @@
+import time
+from pathlib import Path
+
+from backuppc_clone.benchmark.Benchmark import Benchmark
+from backuppc_clone.DataLayer import DataLayer
+
+
+class ImportBenchmark(Benchmark):
+    """
+    Compares the row by row loader and the bulk loader of DataLayer.import_csv.
+    """
+    name = 'import'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __import(self, variant: str, table_name: str, column_names, path: Path, **kwargs) -> None:
+        """
+        Imports a CSV file into a new database and records the duration.
+
+        @param variant: The name of the variant.
+        @param table_name: The name of the table.
+        @param column_names: The column names.
+        @param path: The path to the CSV file.
+        @param kwargs: The arguments for DataLayer.import_csv.
+        """
+        self._new_database()
+
+        if table_name == 'BKC_BACKUP_TREE':
+            # Mimic a clone with a previous backup of the same size.
+            DataLayer.instance.import_csv(table_name, column_names, path, False, {'bck_id': 1})
+            DataLayer.instance.commit()
+
+        start = time.perf_counter()
+        row_count = DataLayer.instance.import_csv(table_name, column_names, path, **kwargs)
+        DataLayer.instance.commit()
+        self._record(variant, row_count, 'rows', time.perf_counter() - start)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        pool_csv_path = self._work_path.joinpath('pool.csv')
+        tree_csv_path = self._work_path.joinpath('tree.csv')
+
+        inodes = self._write_pool_csv(pool_csv_path)
+        self._write_tree_csv(tree_csv_path, inodes)
+
+        pool_columns = ['imp_inode', 'imp_dir', 'imp_name']
+        self.__import('IMP_POOL row by row', 'IMP_POOL', pool_columns, pool_csv_path, bulk=False)
+        self.__import('IMP_POOL bulk', 'IMP_POOL', pool_columns, pool_csv_path)
+        self.__import('IMP_POOL bulk presorted', 'IMP_POOL', pool_columns, pool_csv_path, presort=True)
+
+        tree_columns = ['bbt_seq', 'bbt_inode_original', 'bbt_dir', 'bbt_name']
+        tree_defaults = {'bck_id': 2}
+        self.__import('BKC_BACKUP_TREE row by row',
+                      'BKC_BACKUP_TREE',
+                      tree_columns,
+                      tree_csv_path,
+                      truncate=False,
+                      defaults=tree_defaults,
+                      bulk=False)
+        self.__import('BKC_BACKUP_TREE bulk',
+                      'BKC_BACKUP_TREE',
+                      tree_columns,
+                      tree_csv_path,
+                      truncate=False,
+                      defaults=tree_defaults)
+        self.__import('BKC_BACKUP_TREE bulk deferred indexes',
+                      'BKC_BACKUP_TREE',
+                      tree_columns,
+                      tree_csv_path,
+                      truncate=False,
+                      defaults=tree_defaults,
+                      defer_indexes=True)
+
+        DataLayer.instance.disconnect()
+        pool_csv_path.unlink()
+        tree_csv_path.unlink()
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,158 @@
+import configparser
+import time
+from typing import Dict
+
+from cleo.io.outputs.null_output import NullOutput
+
+from backuppc_clone.benchmark.Benchmark import Benchmark
+from backuppc_clone.benchmark.FixtureGenerator import FixtureGenerator
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Config import Config
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.Durability import Durability
+from backuppc_clone.helper.BackupChunkWriter import BackupChunkWriter
+from backuppc_clone.helper.BackupClone import BackupClone
+from backuppc_clone.helper.BackupDelete import BackupDelete
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.helper.PoolSync import PoolSync
+from backuppc_clone.IoGovernor import IoGovernor
+from backuppc_clone.Metrics import Metrics
+
+
+class PhaseBenchmark(Benchmark):
+    """
+    Runs the real phases of cloning on a synthetic BackupPC v3 original: inventorying the backups, synchronizing the
+    pool, cloning all host backups (scan, import, pool copy, populate), and deleting the cloned host backups. The phases
+    run twice: first as configured by default, then with host backups cloned in a pipeline of several chunks while the
+    I/O governor is throttling.
+    """
+    name = 'phases'
+
+    pipeline_chunk_size: int = 24
+    """
+    The minimal number of entries in a chunk of the pipelined run. Chunks are small such that the scanner runs ahead of
+    the pipeline and chunks end within and after directories.
+    """
+
+    pipeline_rate: int = 1024
+    """
+    The maximum number of MiB copied per second in the pipelined run. High enough not to limit the benchmark, but the
+    I/O governor is throttling.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO, work_path, size: int):
+        """
+        Object constructor.
+
+        @param io: The output style.
+        @param work_path: The path to the directory for temporary files.
+        @param size: The number of files in the pool of the original.
+        """
+        Benchmark.__init__(self, io, work_path, size)
+
+        self.__totals: Dict[str, Dict] = {}
+        """
+        The metrics per phase summed over all runs of the phase.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __collect(self, prefix: str) -> None:
+        """
+        Adds the metrics of the phases run since the last call to the totals.
+
+        @param prefix: The prefix of the names of the phases in the totals.
+        """
+        for phase, metrics in Metrics.instance.phases.items():
+            totals = self.__totals.setdefault(prefix + phase, {'duration': 0.0, 'entries': 0, 'bytes': 0})
+            totals['duration'] += metrics['duration']
+            totals['entries'] += metrics['entries']
+            totals['bytes'] += metrics['bytes']
+
+        Metrics.instance.phases.clear()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __run_phases(self, fixture: FixtureGenerator, io: CloneIO, prefix: str) -> None:
+        """
+        Runs the phases of cloning all host backups of the fixture and deleting the cloned host backups.
+
+        @param fixture: The fixture.
+        @param io: The output style of the helpers.
+        @param prefix: The prefix of the names of the phases in the totals.
+        """
+        BackupInfoScanner(io).scan()
+        DataLayer.instance.commit()
+        self.__collect(prefix)
+
+        PoolSync(io).synchronize()
+        DataLayer.instance.commit()
+        self.__collect(prefix)
+
+        for host, backup_no in fixture.backups:
+            BackupClone(io).clone_backup(host, backup_no)
+            DataLayer.instance.commit()
+            self.__collect(prefix)
+
+        for host, backup_no in fixture.backups:
+            BackupDelete(io).delete_backup(host, backup_no)
+            self.__collect(prefix)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __configure_pipeline(self, fixture: FixtureGenerator) -> None:
+        """
+        Configures the clone of the fixture for cloning host backups in a pipeline while the I/O governor is throttling.
+        With a throttling I/O governor the native scanner backend is used, which scans a directory holding a worker
+        slot of the I/O governor, while the copying and populating workers of the pipeline wait for a worker slot.
+
+        @param fixture: The fixture.
+        """
+        config = configparser.ConfigParser()
+        config.read(fixture.clone_config_path)
+        config['Copy'] = {'pipeline': 'on'}
+        config['Governor'] = {'rate': str(self.pipeline_rate)}
+        with open(fixture.clone_config_path, 'w') as file:
+            config.write(file)
+
+        # The configuration and the I/O governor are singletons without a reload, hence are replaced.
+        Config.instance = None
+        Config(fixture.clone_config_path)
+        IoGovernor.instance = None
+        IoGovernor(Config.instance.governor_workers, Config.instance.governor_rate)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        fixture = FixtureGenerator(self._work_path, self._size)
+        start = time.perf_counter()
+        fixture.generate()
+        self._io.log_verbose(f'Generated {fixture.file_count} files in {time.perf_counter() - start:.1f}s')
+
+        Config(fixture.clone_config_path)
+        DataLayer(str(fixture.clone_path.joinpath('clone.db')), str(Config.instance.tmp_clone_path))
+        DataLayer.instance.durability = Durability(Config.instance.durability, Config.instance.top_clone_path)
+        Metrics()
+        IoGovernor()
+
+        # The helpers write progress to a null output.
+        io = CloneIO(self._io.input, NullOutput(), NullOutput())
+
+        self.__run_phases(fixture, io, '')
+
+        self.__configure_pipeline(fixture)
+        chunk_size = BackupChunkWriter.chunk_size
+        BackupChunkWriter.chunk_size = self.pipeline_chunk_size
+        try:
+            self.__run_phases(fixture, io, 'pipelined ')
+        finally:
+            BackupChunkWriter.chunk_size = chunk_size
+
+        DataLayer.instance.disconnect()
+
+        for phase, totals in self.__totals.items():
+            self._record(phase, totals['entries'], 'entries', totals['duration'])
+            if totals['bytes']:
+                self._io.log_verbose(f"{phase}: {totals['bytes']} bytes")
+
+# ----------------------------------------------------------------------------------------------------------------------
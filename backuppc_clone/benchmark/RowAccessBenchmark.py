@@ -0,0 +1,104 @@
+import time
+
+from backuppc_clone.benchmark.Benchmark import Benchmark
+from backuppc_clone.DataLayer import DataLayer
+
+
+class RowAccessBenchmark(Benchmark):
+    """
+    Compares the per row cost of dictionary rows and plain tuple rows when iterating over the tree of a host backup.
+    """
+    name = 'rows'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    __sql = """
+            select BPL.BPL_INODE_ORIGINAL
+                 , BPL.BPL_DIR
+                 , BPL.BPL_NAME
+
+                 , BBT.BBT_INODE_ORIGINAL
+                 , BBT.BBT_DIR
+                 , BBT.BBT_NAME
+                 , BBT.BBT_SIZE
+            from BKC_BACKUP_TREE          BBT
+                 left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL = case when ifnull(BBT.BBT_NLINK, 2) > 1
+                                                                               then BBT.BBT_INODE_ORIGINAL end
+            where BBT.BCK_ID = 1
+            order by BBT.BBT_SEQ"""
+    """
+    The same query as in DataLayer.backup_yield_tree.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __populate(self) -> None:
+        """
+        Populates the pool and the tree of a host backup with ID 1.
+        """
+        pool_csv_path = self._work_path.joinpath('pool.csv')
+        tree_csv_path = self._work_path.joinpath('tree.csv')
+
+        inodes = self._write_pool_csv(pool_csv_path)
+        self._write_tree_csv(tree_csv_path, inodes)
+
+        DataLayer.instance.import_csv('BKC_POOL', ['bpl_inode_original', 'bpl_dir', 'bpl_name'], pool_csv_path)
+        DataLayer.instance.import_csv('BKC_BACKUP_TREE',
+                                      ['bbt_seq', 'bbt_inode_original', 'bbt_dir', 'bbt_name'],
+                                      tree_csv_path,
+                                      defaults={'bck_id': 1})
+        DataLayer.instance.commit()
+
+        pool_csv_path.unlink()
+        tree_csv_path.unlink()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __dict_rows(self) -> float:
+        """
+        Iterates over the tree with dictionary rows and key lookups. Returns the duration.
+        """
+        start = time.perf_counter()
+        count = 0
+        for row in DataLayer.instance.execute_rows(self.__sql):
+            if row['bbt_dir'] is None:
+                row['bbt_dir'] = ''
+            if row['bpl_inode_original']:
+                count += len(row['bpl_dir']) + len(row['bpl_name']) + len(row['bbt_name'])
+        duration = time.perf_counter() - start
+        self._record('dict rows', self._size, 'rows', duration)
+
+        return duration
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __tuple_rows(self) -> float:
+        """
+        Iterates over the tree with tuple rows as yielded by DataLayer.backup_yield_tree. Returns the duration.
+        """
+        start = time.perf_counter()
+        count = 0
+        for rows in DataLayer.instance.backup_yield_tree(1):
+            for bpl_inode_original, bpl_dir, bpl_name, bbt_inode_original, bbt_dir, bbt_name, bbt_size in rows:
+                if bbt_dir is None:
+                    bbt_dir = ''
+                if bpl_inode_original:
+                    count += len(bpl_dir) + len(bpl_name) + len(bbt_name)
+        duration = time.perf_counter() - start
+        self._record('tuple rows', self._size, 'rows', duration)
+
+        return duration
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        self._new_database()
+        self.__populate()
+
+        dict_duration = self.__dict_rows()
+        tuple_duration = self.__tuple_rows()
+
+        saved = (dict_duration - tuple_duration) / max(self._size, 1) * 1e9
+        self._io.log_verbose(f'Saved {saved:.0f}ns per row')
+
+        DataLayer.instance.disconnect()
+
+# ----------------------------------------------------------------------------------------------------------------------
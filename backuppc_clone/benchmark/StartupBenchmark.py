@@ -0,0 +1,78 @@
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import backuppc_clone
+from backuppc_clone.application.BackupPcCloneApplication import BackupPcCloneApplication
+from backuppc_clone.benchmark.Benchmark import Benchmark
+
+
+class StartupBenchmark(Benchmark):
+    """
+    Measures the cost of importing the application and dispatching to each command in a fresh Python interpreter.
+    """
+    name = 'startup'
+
+    repeat: int = 5
+    """
+    The number of fresh interpreters per command. The median is reported.
+    """
+
+    __script = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from backuppc_clone.application.BackupPcCloneApplication import BackupPcCloneApplication
+application = BackupPcCloneApplication()
+application.find(sys.argv[1])
+duration = time.perf_counter() - start
+
+print(json.dumps({'duration': duration, 'modules': len(sys.modules), 'sqlite3': 'sqlite3' in sys.modules}))
+"""
+    """
+    The script run in each fresh interpreter.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __measure(self, command_name: str) -> None:
+        """
+        Measures the import and dispatch cost of a command.
+
+        @param command_name: The name of the command.
+        """
+        # Run from the parent directory of the package such that the fresh interpreter imports this very package.
+        cwd = Path(backuppc_clone.__file__).parent.parent
+
+        durations = []
+        wall_durations = []
+        result = {}
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, '-c', self.__script, command_name],
+                                    cwd=cwd,
+                                    check=True,
+                                    capture_output=True,
+                                    text=True).stdout
+            wall_durations.append(time.perf_counter() - start)
+            result = json.loads(output)
+            durations.append(result['duration'])
+
+        self._record(command_name, 1, 'start', statistics.median(durations))
+        sqlite3 = 'loaded' if result['sqlite3'] else 'not loaded'
+        self._io.log_very_verbose(f"{command_name}: {statistics.median(wall_durations):.3f}s including interpreter, "
+                                  f"{result['modules']} modules, sqlite3 {sqlite3}")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        for command_name in BackupPcCloneApplication.commands:
+            self.__measure(command_name)
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,82 @@
+import time
+
+from backuppc_clone.benchmark.Benchmark import Benchmark
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.StorageProfile import StorageProfile
+
+
+class StorageProfileBenchmark(Benchmark):
+    """
+    Compares the storage profiles of the metadata database on the database work of the import and clone phases.
+    """
+    name = 'profiles'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __import_phase(self, profile: StorageProfile, bck_id: int) -> None:
+        """
+        Imports a scan of the original pool and a scan of a host backup.
+
+        @param profile: The storage profile.
+        @param bck_id: The ID of the host backup.
+        """
+        start = time.perf_counter()
+
+        row_count = DataLayer.instance.import_csv('IMP_POOL',
+                                                  ['imp_inode', 'imp_dir', 'imp_name'],
+                                                  self._work_path.joinpath('pool.csv'),
+                                                  presort=True)
+        DataLayer.instance.pool_insert_new_original()
+        row_count += DataLayer.instance.import_csv('BKC_BACKUP_TREE',
+                                                   ['bbt_seq', 'bbt_inode_original', 'bbt_dir', 'bbt_name'],
+                                                   self._work_path.joinpath('tree.csv'),
+                                                   False,
+                                                   {'bck_id': bck_id},
+                                                   defer_indexes=None)
+        DataLayer.instance.commit()
+
+        self._record(f'{profile.name} import', row_count, 'rows', time.perf_counter() - start)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __clone_phase(self, profile: StorageProfile, bck_id: int) -> None:
+        """
+        Does the database work for copying the required pool files and populating a host backup.
+
+        @param profile: The storage profile.
+        @param bck_id: The ID of the host backup.
+        """
+        start = time.perf_counter()
+
+        row_count = 0
+        DataLayer.instance.backup_prepare_required_clone_pool_files([bck_id])
+        for rows in DataLayer.instance.backup_yield_required_clone_pool_files():
+            for bpl_inode_original, _, _ in rows:
+                DataLayer.instance.pool_update_by_inode_original(bpl_inode_original, bpl_inode_original, 0, 0)
+                row_count += 1
+
+        for rows in DataLayer.instance.backup_yield_tree(bck_id):
+            row_count += len(rows)
+
+        DataLayer.instance.backup_set_in_progress(bck_id, 0)
+        DataLayer.instance.commit()
+
+        self._record(f'{profile.name} clone', row_count, 'rows', time.perf_counter() - start)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        inodes = self._write_pool_csv(self._work_path.joinpath('pool.csv'))
+        self._write_tree_csv(self._work_path.joinpath('tree.csv'), inodes)
+
+        for profile in StorageProfile.profiles.values():
+            self._new_database(profile)
+
+            bck_id = DataLayer.instance.get_bck_id(DataLayer.instance.get_host_id('host'), 1)
+
+            self.__import_phase(profile, bck_id)
+            self.__clone_phase(profile, bck_id)
+
+        DataLayer.instance.disconnect()
+
+# ----------------------------------------------------------------------------------------------------------------------
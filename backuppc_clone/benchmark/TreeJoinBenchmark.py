@@ -0,0 +1,133 @@
+import statistics
+import time
+
+from backuppc_clone.benchmark.Benchmark import Benchmark
+from backuppc_clone.DataLayer import DataLayer
+
+
+class TreeJoinBenchmark(Benchmark):
+    """
+    Compares materializing the tree of a host backup joined with the pool in a scratch table and sorting it with
+    streaming the join in scan order from the covering index of the tree. Both variants look up each entry in the index
+    on the inodes of the pool, the streaming join saves the scratch table and the sort.
+    """
+    name = 'tree'
+
+    repeat: int = 3
+    """
+    The number of runs per variant. The variants run alternately and the median is reported.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __populate(self) -> None:
+        """
+        Populates the pool and the tree of a host backup with ID 1.
+        """
+        pool_csv_path = self._work_path.joinpath('pool.csv')
+        tree_csv_path = self._work_path.joinpath('tree.csv')
+
+        inodes = self._write_pool_csv(pool_csv_path)
+        self._write_tree_csv(tree_csv_path, inodes)
+
+        DataLayer.instance.import_csv('BKC_POOL', ['bpl_inode_original', 'bpl_dir', 'bpl_name'], pool_csv_path)
+        DataLayer.instance.import_csv('BKC_BACKUP_TREE',
+                                      ['bbt_seq', 'bbt_inode_original', 'bbt_dir', 'bbt_name'],
+                                      tree_csv_path,
+                                      defaults={'bck_id': 1})
+        DataLayer.instance.commit()
+
+        pool_csv_path.unlink()
+        tree_csv_path.unlink()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __materialized(self) -> float:
+        """
+        Copies the joined tree into a scratch table, counts, and iterates over the sorted scratch table. Returns the
+        duration.
+        """
+        start = time.perf_counter()
+        DataLayer.instance.execute_none("""
+                                        create table SCR.BNC_BACKUP_TREE as
+                                        select BPL.BPL_INODE_ORIGINAL
+                                             , BPL.BPL_DIR
+                                             , BPL.BPL_NAME
+
+                                             , BBT.BBT_SEQ
+                                             , BBT.BBT_INODE_ORIGINAL
+                                             , BBT.BBT_DIR
+                                             , BBT.BBT_NAME
+                                        from BKC_BACKUP_TREE          BBT
+                                             left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL =
+                                                                             BBT.BBT_INODE_ORIGINAL
+                                        where BBT.BCK_ID = 1""")
+        DataLayer.instance.execute_singleton1('select count(*) from SCR.BNC_BACKUP_TREE')
+
+        count = 0
+        for row in DataLayer.instance.execute_rows("""
+                                                   select BPL_INODE_ORIGINAL
+                                                        , BPL_DIR
+                                                        , BPL_NAME
+
+                                                        , BBT_INODE_ORIGINAL
+                                                        , BBT_DIR
+                                                        , BBT_NAME
+                                                   from SCR.BNC_BACKUP_TREE
+                                                   order by BBT_SEQ
+                                                          , BPL_DIR
+                                                          , BPL_NAME"""):
+            count += 1
+        duration = time.perf_counter() - start
+
+        DataLayer.instance.execute_none('drop table SCR.BNC_BACKUP_TREE')
+
+        return duration
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __streaming(self) -> float:
+        """
+        Counts like DataLayer.backup_get_stats and iterates over the join like DataLayer.backup_yield_tree. Returns the
+        duration.
+        """
+        start = time.perf_counter()
+        DataLayer.instance.backup_get_stats(1)
+
+        count = 0
+        for row in DataLayer.instance.execute_rows("""
+                                                   select BPL.BPL_INODE_ORIGINAL
+                                                        , BPL.BPL_DIR
+                                                        , BPL.BPL_NAME
+
+                                                        , BBT.BBT_INODE_ORIGINAL
+                                                        , BBT.BBT_DIR
+                                                        , BBT.BBT_NAME
+                                                        , BBT.BBT_SIZE
+                                                   from BKC_BACKUP_TREE          BBT
+                                                        left outer join BKC_POOL BPL on BPL.BPL_INODE_ORIGINAL =
+                                                                  case when ifnull(BBT.BBT_NLINK, 2) > 1
+                                                                       then BBT.BBT_INODE_ORIGINAL end
+                                                   where BBT.BCK_ID = 1
+                                                   order by BBT.BBT_SEQ"""):
+            count += 1
+
+        return time.perf_counter() - start
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def run(self) -> None:
+        """
+        Runs the benchmark.
+        """
+        self._new_database()
+        self.__populate()
+
+        materialized = []
+        streaming = []
+        for _ in range(self.repeat):
+            materialized.append(self.__materialized())
+            streaming.append(self.__streaming())
+
+        self._record('materialized join', self._size, 'rows', statistics.median(materialized))
+        self._record('streaming join', self._size, 'rows', statistics.median(streaming))
+
+        DataLayer.instance.disconnect()
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -1,19 +1,23 @@
-import json
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Set, Tuple
 
 from cleo.helpers import argument
 
 from backuppc_clone.command.BaseCommand import BaseCommand
 from backuppc_clone.Config import Config
 from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.exception.BackupDoesNotFitException import BackupDoesNotFitException
 from backuppc_clone.helper.AuxiliaryFiles import AuxiliaryFiles
 from backuppc_clone.helper.BackupClone import BackupClone
 from backuppc_clone.helper.BackupDelete import BackupDelete
 from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.helper.BackupScheduler import BackupScheduler
 from backuppc_clone.helper.HostDelete import HostDelete
 from backuppc_clone.helper.PoolSync import PoolSync
+from backuppc_clone.helper.ScannerBackend import ScannerBackend
+from backuppc_clone.Metrics import Metrics
+from backuppc_clone.Profiler import Profiler
 
 
 class AutoCommand(BaseCommand):
@@ -24,6 +28,23 @@ class AutoCommand(BaseCommand):
     description = 'Clones the original in automatic mode'
     arguments = [argument(name='clone.cfg', description='The configuration file of the clone.')]
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        super().__init__()
+
+        self.__deferred: Set[Tuple[str, int]] = set()
+        """
+        The hosts and numbers of the host backups deferred during this run.
+        """
+
+        self.__deferred_fd: int = -1
+        """
+        The write end of the pipe through which a forked child reports deferred host backups to its parent.
+        """
+
     # ------------------------------------------------------------------------------------------------------------------
     def __scan_original_backups(self) -> None:
         """
@@ -62,11 +83,9 @@ class AutoCommand(BaseCommand):
     # ------------------------------------------------------------------------------------------------------------------
     def __write_stats(self) -> None:
         """
-        Writes the stats to the stats file.
+        Writes the stats and the metrics of the phases to the stats file.
         """
-        stats = DataLayer.instance.overview_get_stats()
-        text = json.dumps(stats, indent=4)
-        Config.instance.stats_path.write_text(text)
+        Metrics.instance.write_status(DataLayer.instance.overview_get_stats())
 
     # ------------------------------------------------------------------------------------------------------------------
     def __remove_obsolete_hosts(self) -> None:
@@ -127,31 +146,29 @@ class AutoCommand(BaseCommand):
                 self._io.write_line('')
 
     # ------------------------------------------------------------------------------------------------------------------
-    @staticmethod
-    def __get_next_clone_target() -> Dict | None:
+    def __get_next_clone_targets(self) -> List[Dict]:
         """
-        Returns the metadata of the host backup that needs to be cloned.
+        Returns the metadata of the host backups that need to be cloned in the next batch.
         """
-        backup = DataLayer.instance.backup_get_next(Config.instance.last_pool_scan)
-        if not backup:
-            backup = DataLayer.instance.backup_get_next(-1)
+        helper = BackupScheduler(self._io)
 
-        return backup
+        return helper.next_backups(Config.instance.schedule_batch, self.__deferred)
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __resync_pool(self, backup: Dict) -> None:
+    def __resync_pool(self, backups: List[Dict]) -> None:
         """
-        Re-syncs the pool if required for cloning a backup.
+        Re-syncs the pool if required for cloning a batch of backups.
 
-        @param backup: The metadata of the backup.
+        @param list[dict] backups: The metadata of the backups.
         """
-        if Config.instance.last_pool_scan < backup['bob_end_time']:
+        if Config.instance.last_pool_scan < max(backup['bob_end_time'] for backup in backups):
             self._io.title('Maintaining Clone Pool and Pool Metadata')
 
             helper = PoolSync(self._io)
             helper.synchronize()
 
             DataLayer.instance.commit()
+            self.__write_stats()
 
     # ------------------------------------------------------------------------------------------------------------------
     def __clone_backup(self, backup: Dict) -> None:
@@ -169,11 +186,72 @@ class AutoCommand(BaseCommand):
         self.__write_stats()
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __handle_file_not_found(self, backup: Dict, error: FileNotFoundError) -> None:
+    def __clone_backups(self, backups: List[Dict]) -> None:
+        """
+        Clones a batch of backups. The pool files required by the backups are copied in one pass, then each backup is
+        populated. When the batch does not fit on the clone the backups are cloned one by one and only the backups that
+        do not fit by themselves are deferred.
+
+        @param list[dict] backups: The metadata of the backups.
+        """
+        if len(backups) == 1:
+            self.__clone_backup(backups[0])
+            return
+
+        self._io.title('Cloning Pool Files of Backups {}'.
+                       format(', '.join(f'{backup['bob_host']}/{backup['bob_number']}' for backup in backups)))
+
+        helper = BackupClone(self._io)
+        try:
+            helper.copy_pool_files([(backup['bob_host'], backup['bob_number']) for backup in backups])
+        except BackupDoesNotFitException as error:
+            self._io.warning(str(error))
+            self._io.text('Cloning the backups of the batch one by one')
+
+            # The host backups have been scanned already.
+            self.__delete_unfinished_backups(backups)
+            DataLayer.instance.commit()
+
+            for backup in backups:
+                try:
+                    self.__clone_backup(backup)
+                except BackupDoesNotFitException as error:
+                    self.__defer_backups([backup], error)
+            return
+
+        DataLayer.instance.commit()
+        self.__write_stats()
+
+        for backup in backups:
+            self._io.title(f'Cloning Backup {backup['bob_host']}/{backup['bob_number']}')
+
+            helper.populate_backup(backup['bob_host'], backup['bob_number'])
+
+            DataLayer.instance.commit()
+            self.__write_stats()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __delete_unfinished_backups(self, backups: List[Dict]) -> None:
+        """
+        Deletes the backups of a batch that have not been cloned completely.
+
+        @param list[dict] backups: The metadata of the backups.
+        """
+        known = {(row['hst_name'], row['bck_number']) for row in DataLayer.instance.backup_get_all()}
+        partial = {(row['hst_name'], row['bck_number']) for row in DataLayer.instance.backup_partially_cloned()}
+
+        helper = BackupDelete(self._io)
+        for backup in backups:
+            key = (backup['bob_host'], backup['bob_number'])
+            if key not in known or key in partial:
+                helper.delete_backup(backup['bob_host'], backup['bob_number'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __handle_file_not_found(self, backups: List[Dict], error: FileNotFoundError) -> None:
         """
         Handles a FileNotFoundError exception.
 
-        @param dict backup: The metadata of the backup.
+        @param list[dict] backups: The metadata of the backups.
         @param FileNotFoundError error: The exception.
         """
         if self._io.is_verbose():
@@ -181,9 +259,8 @@ class AutoCommand(BaseCommand):
 
         self._io.text('Resynchronization of the pool is required')
 
-        # The host backup might have been partially cloned.
-        helper = BackupDelete(self._io)
-        helper.delete_backup(backup['bob_host'], backup['bob_number'])
+        # The host backups might have been partially cloned.
+        self.__delete_unfinished_backups(backups)
 
         # Force resynchronization of the pool.
         Config.instance.last_pool_scan = -1
@@ -191,17 +268,66 @@ class AutoCommand(BaseCommand):
         # Commit the transaction.
         DataLayer.instance.commit()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __defer_backups(self, backups: List[Dict], error: BackupDoesNotFitException) -> None:
+        """
+        Defers cloning backups that do not fit on the clone to the next run. The other backups are cloned during this
+        run.
+
+        @param list[dict] backups: The metadata of the backups.
+        @param BackupDoesNotFitException error: The exception.
+        """
+        self._io.warning(str(error))
+        for backup in backups:
+            self._io.text(f'Deferring backup {backup['bob_host']}/{backup['bob_number']}')
+            os.write(self.__deferred_fd, f'{backup['bob_number']} {backup['bob_host']}\n'.encode())
+
+        # The host backups have been scanned already.
+        self.__delete_unfinished_backups(backups)
+
+        DataLayer.instance.commit()
+        self.__write_stats()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __read_deferred_backups(self, read_fd: int) -> None:
+        """
+        Reads the host backups deferred by a forked child until the child exits.
+
+        @param int read_fd: The read end of the pipe.
+        """
+        with os.fdopen(read_fd) as pipe:
+            for line in pipe:
+                number, host = line.rstrip('\n').split(' ', 1)
+                self.__deferred.add((host, int(number)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __select_scanner_backend(self) -> None:
+        """
+        Selects the scanner backend on the pool of the original once, such that the forked children inherit the
+        selected scanner backend.
+        """
+        for dir_name in ('cpool', 'pool'):
+            path = Config.instance.top_original_path.joinpath(dir_name)
+            if path.is_dir():
+                ScannerBackend.get(self._io, path)
+                break
+
     # ------------------------------------------------------------------------------------------------------------------
     def _handle_command(self) -> None:
         """
         Executes the command.
         """
         DataLayer.instance.disconnect()
+        self.__select_scanner_backend()
 
         while True:
+            read_fd, self.__deferred_fd = os.pipe()
             pid = os.fork()
 
             if pid == 0:
+                os.close(read_fd)
+                if Profiler.instance is not None:
+                    Profiler.instance.restart('auto-child')
                 DataLayer.instance.connect()
 
                 self.__remove_partially_cloned_backups()
@@ -210,18 +336,22 @@ class AutoCommand(BaseCommand):
                 self.__remove_obsolete_hosts()
                 self.__remove_obsolete_backups()
 
-                backup = self.__get_next_clone_target()
-                if backup is None:
+                backups = self.__get_next_clone_targets()
+                if not backups:
                     exit(1)
 
                 try:
-                    self.__resync_pool(backup)
-                    self.__clone_backup(backup)
+                    self.__resync_pool(backups)
+                    self.__clone_backups(backups)
                 except FileNotFoundError as error:
-                    self.__handle_file_not_found(backup, error)
+                    self.__handle_file_not_found(backups, error)
+                except BackupDoesNotFitException as error:
+                    self.__defer_backups(backups, error)
 
                 exit(0)
 
+            os.close(self.__deferred_fd)
+            self.__read_deferred_backups(read_fd)
             pid, status = os.wait()
             if status != 0:
                 break
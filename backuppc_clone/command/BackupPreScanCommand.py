@@ -1,7 +1,9 @@
 from cleo.helpers import argument
 
-from backuppc_clone.DataLayer import DataLayer
 from backuppc_clone.command.BaseCommand import BaseCommand
+from backuppc_clone.Config import Config
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
 from backuppc_clone.helper.BackupScanner import BackupScanner
 
 
@@ -25,6 +27,10 @@ class BackupPreScanCommand(BaseCommand):
 
         self._io.title('Pre-Scanning Backup {}/{}'.format(host, backup_no))
 
+        if BackupInfoScanner.is_backuppc_v4(Config.instance.backup_original_path(host, backup_no)):
+            self._io.text('A BackupPC v4 host backup is cloned from its attrib files and requires no pre-scan')
+            return
+
         helper = BackupScanner(self._io)
         helper.pre_scan_directory(host, backup_no)
 
@@ -1,6 +1,7 @@
 import abc
 import configparser
 import os
+import tempfile
 from pathlib import Path
 
 from cleo.commands.command import Command
@@ -9,7 +10,13 @@ from cleo.io.io import IO
 from backuppc_clone.CloneIO import CloneIO
 from backuppc_clone.Config import Config
 from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.Durability import Durability
 from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.IoGovernor import IoGovernor
+from backuppc_clone.Metrics import Metrics
+from backuppc_clone.Profiler import Profiler
+from backuppc_clone.SqlProfiler import SqlProfiler
+from backuppc_clone.StorageProfile import StorageProfile
 
 
 class BaseCommand(Command, metaclass=abc.ABCMeta):
@@ -84,7 +91,50 @@ class BaseCommand(Command, metaclass=abc.ABCMeta):
         Initializes the singleton objects.
         """
         Config(Path(self.argument('clone.cfg')))
-        DataLayer(str(Config.instance.top_clone_path.joinpath('clone.db')))
+        scratch_dir_path = Config.instance.scratch_dir_path
+        DataLayer(str(Config.instance.top_clone_path.joinpath('clone.db')),
+                  str(scratch_dir_path) if scratch_dir_path else None,
+                  StorageProfile.get(Config.instance.storage_profile))
+        DataLayer.instance.durability = Durability(Config.instance.durability, Config.instance.top_clone_path)
+        Metrics()
+        IoGovernor(Config.instance.governor_workers,
+                   Config.instance.governor_rate,
+                   Config.instance.governor_latency_budget)
+        IoGovernor.set_priority(Config.instance.governor_ioprio, Config.instance.governor_nice)
+
+        if Config.instance.sql_stats:
+            DataLayer.instance.profiler = SqlProfiler(self._io,
+                                                      Config.instance.slow_query_time,
+                                                      Config.instance.sql_stats_top)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __start_profiler(self) -> None:
+        """
+        Starts profiling this command if the --profile option has been given.
+        """
+        if self.option('profile'):
+            output_path = Config.instance.tmp_clone_path if Config.instance else Path(tempfile.gettempdir())
+            Profiler(self.name, output_path)
+            Profiler.instance.start()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __stop_profiler(self) -> None:
+        """
+        Stops profiling and writes the profiling data.
+        """
+        if Profiler.instance is not None:
+            paths = Profiler.instance.stop()
+            self._io.log_verbose([f'Wrote profiling data <fso>{path}</fso>' for path in paths])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __write_status() -> None:
+        """
+        Writes the metrics of the phases run by this command to the status file, such that the metrics of every command
+        are kept for monitoring and for estimating the duration of cloning.
+        """
+        if Metrics.instance is not None and Metrics.instance.phases:
+            Metrics.instance.write_status(DataLayer.instance.overview_get_stats())
 
     # ------------------------------------------------------------------------------------------------------------------
     @abc.abstractmethod
@@ -110,11 +160,21 @@ class BaseCommand(Command, metaclass=abc.ABCMeta):
             self.__validate_user()
             self.__validate_config()
             self._init_singletons()
+            self.__start_profiler()
+
+            ret = self._handle_command()
+            self.__write_status()
 
-            return self._handle_command()
+            return ret
 
         except BackupPcCloneException as error:
             self._io.write_error_line(str(error))
             return -1
 
+        finally:
+            # Note: the forked children of the auto command pass here too.
+            if DataLayer.instance is not None and DataLayer.instance.profiler is not None:
+                DataLayer.instance.profiler.show_summary()
+            self.__stop_profiler()
+
 # ----------------------------------------------------------------------------------------------------------------------
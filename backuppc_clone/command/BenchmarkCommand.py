@@ -0,0 +1,117 @@
+import json
+import tempfile
+from pathlib import Path
+
+from cleo.commands.command import Command
+from cleo.helpers import argument, option
+from cleo.io.io import IO
+
+from backuppc_clone.benchmark.DurabilityBenchmark import DurabilityBenchmark
+from backuppc_clone.benchmark.ImportBenchmark import ImportBenchmark
+from backuppc_clone.benchmark.PhaseBenchmark import PhaseBenchmark
+from backuppc_clone.benchmark.RowAccessBenchmark import RowAccessBenchmark
+from backuppc_clone.benchmark.StartupBenchmark import StartupBenchmark
+from backuppc_clone.benchmark.StorageProfileBenchmark import StorageProfileBenchmark
+from backuppc_clone.benchmark.TreeJoinBenchmark import TreeJoinBenchmark
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+
+
+class BenchmarkCommand(Command):
+    """
+    Runs a performance benchmark.
+    """
+    name = 'benchmark'
+    description = 'Runs a performance benchmark.'
+    arguments = [argument(name='benchmark',
+                          description='The name of the benchmark: durability, import, phases, profiles, rows, startup, '
+                                      'or tree.')]
+    options = [option(long_name='size',
+                      description='The size of the benchmark, e.g. the number of rows.',
+                      flag=False,
+                      default='100000'),
+               option(long_name='dir',
+                      description='The directory for temporary files (default the system temp directory).',
+                      flag=False),
+               option(long_name='json', description='Writes the results in JSON format.')]
+
+    benchmarks = {DurabilityBenchmark.name:     DurabilityBenchmark,
+                  ImportBenchmark.name:         ImportBenchmark,
+                  PhaseBenchmark.name:          PhaseBenchmark,
+                  StorageProfileBenchmark.name: StorageProfileBenchmark,
+                  RowAccessBenchmark.name:      RowAccessBenchmark,
+                  StartupBenchmark.name:        StartupBenchmark,
+                  TreeJoinBenchmark.name:       TreeJoinBenchmark}
+    """
+    The available benchmarks.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        Command.__init__(self)
+
+        self._io: CloneIO | None = None
+        """
+        The output style.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __report(self, results) -> None:
+        """
+        Prints the results of a benchmark.
+
+        @param list[dict] results: The results.
+        """
+        if self.option('json'):
+            self._io.write_line(json.dumps(results, indent=4))
+            return
+
+        width = max(len(result['variant']) for result in results)
+
+        self._io.write_line('')
+        for result in results:
+            self._io.write_line('{0:{1}}  {2:>12} {3:<7} {4:>9.3f}s {5:>14.0f} {3}/s'.format(result['variant'],
+                                                                                            width,
+                                                                                            result['count'],
+                                                                                            result['unit'],
+                                                                                            result['duration'],
+                                                                                            result['rate']))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def execute(self, io: IO) -> int:
+        """
+        Executes this command.
+
+        :param io: The input/output object.
+        """
+        self._io = CloneIO(io.input, io.output, io.error_output)
+
+        try:
+            return self.handle()
+
+        except BackupPcCloneException as error:
+            self._io.write_error_line(str(error))
+            return -1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def handle(self) -> int:
+        """
+        Executes the command.
+        """
+        name = self.argument('benchmark')
+        if name not in self.benchmarks:
+            raise BackupPcCloneException('Unknown benchmark {}, available benchmarks: {}'.
+                                         format(name, ', '.join(sorted(self.benchmarks))))
+
+        with tempfile.TemporaryDirectory(dir=self.option('dir')) as work_dir:
+            benchmark = self.benchmarks[name](self._io, Path(work_dir), int(self.option('size')))
+            benchmark.run()
+
+        self.__report(benchmark.results)
+
+        return 0
+
+# ----------------------------------------------------------------------------------------------------------------------
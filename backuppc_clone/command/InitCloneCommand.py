@@ -1,8 +1,8 @@
 import configparser
 import os
-import sqlite3
 
 from backuppc_clone.command.BaseCommand import BaseCommand
+from backuppc_clone.DataLayer import DataLayer
 from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
 
 
@@ -14,9 +14,6 @@ class InitCloneCommand(BaseCommand):
     name = 'init-clone'
     description = 'Creates the configuration file for a clone.'
 
-    parameters = [('SCHEMA_VERSION', 'schema version', '2'),
-                  ('LAST_POOL_SYNC', 'timestamp of last original pool scan', '-1')]
-
     # ------------------------------------------------------------------------------------------------------------------
     def __create_dirs(self, top_dir_clone: str) -> None:
         """
@@ -42,27 +39,10 @@ class InitCloneCommand(BaseCommand):
 
         @param str db_path: The path to the SQLite database.
         """
-        sql_path = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                                '..',
-                                'lib',
-                                'ddl',
-                                '0100_create_tables.sql')
-        with open(sql_path) as file:
-            sql = file.read()
-
         self._io.title('Creating metadata database')
 
         self._io.write_line(' Initializing <fso>{}</fso>'.format(db_path))
-        connection = sqlite3.connect(db_path)
-        cursor = connection.cursor()
-        cursor.executescript(sql)
-
-        for parameter in self.parameters:
-            cursor.execute('insert into BKC_PARAMETER(PRM_CODE, PRM_DESCRIPTION, PRM_VALUE) values(?, ?, ?)',
-                           parameter)
-
-        connection.commit()
-        connection.close()
+        DataLayer.create_database(db_path)
 
     # ------------------------------------------------------------------------------------------------------------------
     def __writing_config_clone(self,
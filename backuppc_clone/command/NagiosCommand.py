@@ -36,12 +36,19 @@ class NagiosCommand(Command):
 
         :rtype: str
         """
-        return 'backups={} cloned_backups={} not_cloned_backups={} obsolete_cloned_backups={}' \
+        perf_data = 'backups={} cloned_backups={} not_cloned_backups={} obsolete_cloned_backups={}' \
             .format(stats['n_backups'],
                     stats['n_cloned_backups'],
                     stats['n_not_cloned_backups'],
                     stats['n_obsolete_cloned_backups'])
 
+        for phase, metrics in sorted(stats.get('phases', {}).items()):
+            perf_data += ' {0}_duration={1:.1f}s {0}_rate={2:.0f}'.format(phase,
+                                                                          metrics['duration'],
+                                                                          metrics['entries_per_sec'])
+
+        return perf_data
+
     # ------------------------------------------------------------------------------------------------------------------
     def handle(self) -> int:
         """
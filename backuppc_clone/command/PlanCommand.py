@@ -0,0 +1,65 @@
+from cleo.helpers import argument
+
+from backuppc_clone.command.BaseCommand import BaseCommand
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.exception.BackupDoesNotFitException import BackupDoesNotFitException
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.helper.BackupClone import BackupClone
+from backuppc_clone.helper.BackupScheduler import BackupScheduler
+from backuppc_clone.helper.ClonePlanner import ClonePlanner
+
+
+class PlanCommand(BaseCommand):
+    """
+    Shows the plan for cloning a host backup without cloning the host backup.
+    """
+    name = 'plan'
+    description = 'Shows the plan for cloning a host backup without cloning the host backup.'
+    arguments = [argument(name='clone.cfg', description='The configuration file of the clone.'),
+                 argument(name='host',
+                          description='The name of the host (default the host of the next backup to clone).',
+                          optional=True),
+                 argument(name='backup#',
+                          description='The backup number (default the next backup to clone).',
+                          optional=True)]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _handle_command(self) -> int:
+        """
+        Executes the command.
+        """
+        host = self.argument('host')
+        backup_no = self.argument('backup#')
+        if host is None or backup_no is None:
+            scheduler = BackupScheduler(self._io)
+            backup = scheduler.next_backup()
+            if not backup:
+                self._io.text('No backup to clone')
+                return 0
+
+            host = backup['bob_host']
+            backup_no = backup['bob_number']
+        else:
+            backup_no = int(backup_no)
+            for backup in DataLayer.instance.backup_get_all():
+                if backup['hst_name'] == host and backup['bck_number'] == backup_no:
+                    raise BackupPcCloneException(f'Backup {host}/{backup_no} has been cloned already')
+
+        self._io.title(f'Planning Backup {host}/{backup_no}')
+
+        helper = BackupClone(self._io)
+        plan = helper.plan_backup(host, backup_no)
+
+        DataLayer.instance.commit()
+
+        try:
+            ClonePlanner.check(plan)
+        except BackupDoesNotFitException as error:
+            self._io.warning(str(error))
+            return 1
+
+        self._io.text(f'Backup {host}/{backup_no} fits on the clone')
+
+        return 0
+
+# ----------------------------------------------------------------------------------------------------------------------
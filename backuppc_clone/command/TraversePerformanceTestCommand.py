@@ -1,11 +1,15 @@
-import os
+import json
+import statistics
 import time
+from typing import Dict, List
 
 from cleo.commands.command import Command
 from cleo.helpers import argument, option
 from cleo.io.io import IO
 
 from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.helper.DirectoryTraverser import DirectoryTraverser
 
 
 class TraversePerformanceTestCommand(Command):
@@ -15,7 +19,26 @@ class TraversePerformanceTestCommand(Command):
     name = 'traverse-performance-test'
     description = 'Traversing recursively a directory performance test.'
     arguments = [argument(name='dir', description='The start directory.')]
-    options = [option(long_name='stat', description='Get status of each file.')]
+    options = [option(long_name='stat', description='Get status of each file.'),
+               option(long_name='strategy',
+                      description='The traversal strategies (comma separated): recursive, iterative, threaded, fwalk, '
+                                  'find, or all.',
+                      flag=False,
+                      default='all'),
+               option(long_name='workers',
+                      description='The number of worker threads of the threaded strategy.',
+                      flag=False,
+                      default='8'),
+               option(long_name='repeat',
+                      description='The number of runs per strategy and cache state.',
+                      flag=False,
+                      default='1'),
+               option(long_name='cache',
+                      description='The cache state: warm, cold (cached pages evicted with posix_fadvise before each '
+                                  'run), or both.',
+                      flag=False,
+                      default='warm'),
+               option(long_name='json', description='Writes the results in JSON format.')]
 
     # ------------------------------------------------------------------------------------------------------------------
     def __init__(self):
@@ -24,65 +47,109 @@ class TraversePerformanceTestCommand(Command):
         """
         Command.__init__(self)
 
-        self.__stat: bool = False
-        """
-        If True stat must be called for each file.
-        """
-
         self._io: CloneIO | None = None
         """
         The output style.
         """
 
-        self.__dir_count: int = 0
+        self.__results: List[Dict] = []
         """
-        The number of directories counted.
+        The results of all runs.
         """
 
-        self.__file_count: int = 0
+    # ------------------------------------------------------------------------------------------------------------------
+    def __strategies(self) -> List[str]:
         """
-        The number of file counted.
+        Returns the names of the strategies to run.
         """
+        strategies = self.option('strategy')
+        if strategies == 'all':
+            return DirectoryTraverser.strategies
 
-        self.__start_time: float = 0
+        names = [name.strip() for name in strategies.split(',')]
+        for name in names:
+            if name not in DirectoryTraverser.strategies:
+                raise BackupPcCloneException('Unknown strategy {}, available strategies: {}'.
+                                             format(name, ', '.join(DirectoryTraverser.strategies)))
+
+        return names
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __cache_states(self) -> List[str]:
         """
-        The timestamp of the start of the performance test.
+        Returns the cache states to run.
         """
+        cache = self.option('cache')
+        if cache == 'both':
+            return ['warm', 'cold']
+
+        if cache not in ['warm', 'cold']:
+            raise BackupPcCloneException('Unknown cache state {}, available cache states: warm, cold, both'.
+                                         format(cache))
+
+        return [cache]
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __traverse(self, path: str) -> None:
+    def __run(self, traverser: DirectoryTraverser, strategy: str, cache: str, run: int, dir_name: str) -> None:
         """
-        Traverse recursively a directory.
+        Traverses the directory once with a strategy and records the result.
 
-        @param str path: The path to the directory.
+        @param DirectoryTraverser traverser: The directory traverser.
+        @param str strategy: The name of the strategy.
+        @param str cache: The cache state.
+        @param int run: The number of the run.
+        @param str dir_name: The start directory.
         """
-        dirs = []
-        for entry in os.scandir(path):
-            if self.__stat and not entry.is_symlink():
-                entry.stat()
+        if cache == 'cold':
+            DirectoryTraverser.evict(dir_name)
 
-            if entry.is_file():
-                self.__file_count += 1
+        start_time = time.perf_counter()
+        dir_count, file_count = traverser.traverse(strategy, dir_name)
+        duration = time.perf_counter() - start_time
 
-            elif entry.is_dir():
-                dirs.append(entry.name)
-                self.__dir_count += 1
+        self.__results.append({'strategy':      strategy,
+                               'cache':         cache,
+                               'run':           run,
+                               'dirs':          dir_count,
+                               'files':         file_count,
+                               'duration':      duration,
+                               'files_per_sec': file_count / max(duration, 1e-9)})
 
-        for name in dirs:
-            self.__traverse(os.path.join(path, name))
+        self._io.log_verbose('{} ({}, run {}): {} directories, {} files in {:.3f}s'.
+                             format(strategy, cache, run, dir_count, file_count, duration))
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __report(self, end_time: float) -> None:
+    def __report(self) -> None:
         """
-        Prints the performance report.
-
-        @param float end_time: The timestamp of the end of the performance test.
+        Prints the performance report. With repeated runs the median duration per strategy and cache state is
+        reported.
         """
+        if self.option('json'):
+            self._io.write_line(json.dumps(self.__results, indent=4))
+            return
+
+        groups: Dict[tuple, List[Dict]] = {}
+        for result in self.__results:
+            groups.setdefault((result['strategy'], result['cache']), []).append(result)
+
         self._io.write_line('')
-        self._io.write_line('number of directories: {}'.format(self.__dir_count))
-        self._io.write_line('number of files      : {}'.format(self.__file_count))
-        self._io.write_line('get status           : {}'.format('yes' if self.__stat else 'no'))
-        self._io.write_line('duration             : {0:.1f}s'.format(end_time - self.__start_time))
+        self._io.write_line('get status: {}'.format('yes' if self.option('stat') else 'no'))
+        self._io.write_line('{:<10} {:<5} {:>12} {:>12} {:>10} {:>12}'.
+                            format('strategy', 'cache', 'directories', 'files', 'duration', 'files/s'))
+        for (strategy, cache), results in groups.items():
+            duration = statistics.median(result['duration'] for result in results)
+            self._io.write_line('{:<10} {:<5} {:>12} {:>12} {:>9.3f}s {:>12.0f}'.
+                                format(strategy,
+                                       cache,
+                                       results[0]['dirs'],
+                                       results[0]['files'],
+                                       duration,
+                                       results[0]['files'] / max(duration, 1e-9)))
+
+        counts = {(result['dirs'], result['files']) for result in self.__results}
+        if len(counts) > 1:
+            self._io.warning('The strategies counted different numbers of directories and files. '
+                             'Was the directory modified during the test?')
 
     # ------------------------------------------------------------------------------------------------------------------
     def execute(self, io: IO) -> int:
@@ -93,23 +160,36 @@ class TraversePerformanceTestCommand(Command):
         """
         self._io = CloneIO(io.input, io.output, io.error_output)
 
-        return self.handle()
+        try:
+            return self.handle()
+
+        except BackupPcCloneException as error:
+            self._io.write_error_line(str(error))
+            return -1
 
     # ------------------------------------------------------------------------------------------------------------------
     def handle(self) -> int:
         """
         Executes the command.
         """
-        self.__stat = self.option('stat')
-        self.__dir_count = 0
-        self.__file_count = 0
-        self.__start_time = time.time()
+        strategies = self.__strategies()
+        cache_states = self.__cache_states()
+        repeat = int(self.option('repeat'))
+        traverser = DirectoryTraverser(self.option('stat'), int(self.option('workers')))
+        self.__results = []
 
         dir_name = self.argument('dir')
 
-        self._io.write_line('Traversing <fso>{}</fso>'.format(dir_name))
-        self.__traverse(dir_name)
-        self.__report(time.time())
+        if not self.option('json'):
+            self._io.write_line('Traversing <fso>{}</fso>'.format(dir_name))
+
+        # Runs are interleaved such that no strategy benefits systematically from a cache warmed by the previous run.
+        for run in range(1, repeat + 1):
+            for cache in cache_states:
+                for strategy in strategies:
+                    self.__run(traverser, strategy, cache, run, dir_name)
+
+        self.__report()
 
         return 0
 
@@ -0,0 +1,69 @@
+from cleo.helpers import argument, option
+
+from backuppc_clone.command.BaseCommand import BaseCommand
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.helper.CloneVerify import CloneVerify
+
+
+class VerifyCommand(BaseCommand):
+    """
+    Verifies the content of the clone against the original.
+    """
+    name = 'verify'
+    description = 'Verifies the content of the clone against the original.'
+    arguments = [argument(name='clone.cfg', description='The configuration file of the clone.'),
+                 argument(name='host', description='The name of the host.', optional=True),
+                 argument(name='backup#', description='The backup number.', optional=True)]
+    options = [option(long_name='workers',
+                      description='The number of files verified in parallel.',
+                      flag=False,
+                      default='4'),
+               option(long_name='confidence',
+                      description='Verifies a random sample of the files such that with this confidence (e.g. 0.99) '
+                                  'at least one corrupt file is found if a fraction tolerance of the files is corrupt.',
+                      flag=False),
+               option(long_name='tolerance',
+                      description='The fraction of corrupt files that must be detected with the given confidence.',
+                      flag=False,
+                      default='0.01'),
+               option(long_name='original',
+                      description='Verifies pool files against the original pool even if their digests have been '
+                                  'recorded while copying.'),
+               option(long_name='rate',
+                      description='The maximum number of MiB read per second (0 for no limit).',
+                      flag=False,
+                      default='0')]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _handle_command(self) -> int:
+        """
+        Executes the command.
+        """
+        host = self.argument('host')
+        backup_no = self.argument('backup#')
+        backup_no = int(backup_no) if backup_no is not None else None
+
+        confidence = self.option('confidence')
+        confidence = float(confidence) if confidence is not None else None
+        tolerance = float(self.option('tolerance'))
+        if confidence is not None and not 0.0 < confidence < 1.0:
+            raise BackupPcCloneException('The confidence must be between 0 and 1')
+        if not 0.0 < tolerance <= 1.0:
+            raise BackupPcCloneException('The tolerance must be between 0 and 1')
+
+        if host is None:
+            self._io.title('Verifying Clone')
+        elif backup_no is None:
+            self._io.title(f'Verifying Host {host}')
+        else:
+            self._io.title(f'Verifying Backup {host}/{backup_no}')
+
+        helper = CloneVerify(self._io,
+                             max(1, int(self.option('workers'))),
+                             float(self.option('rate')) * 1024 * 1024,
+                             not self.option('original'))
+        mismatch_count = helper.verify(host, backup_no, confidence, tolerance)
+
+        return 1 if mismatch_count else 0
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,9 @@
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+
+
+class BackupDoesNotFitException(BackupPcCloneException):
+    """
+    Class for exceptions raised when the plan of a host backup does not fit on the clone, i.e. the clone has not enough
+    disk space or inodes, or the expected duration exceeds the maximum duration.
+    """
+    pass
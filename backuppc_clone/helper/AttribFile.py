@@ -0,0 +1,142 @@
+import zlib
+from typing import Dict, List, Tuple
+
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+
+
+class AttribFile:
+    """
+    Parser for attrib files of BackupPC v4. An attrib file holds the attributes, including the digest of the content in
+    the pool, of all entries in a directory of a host backup.
+    """
+    magic_xattr: int = 0x17565353
+    """
+    The magic number of attrib files with extended attributes (written by BackupPC v4).
+    """
+
+    magic_digest: int = 0x17585451
+    """
+    The magic number of attrib files starting with the digest of the directory.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def decompress(data: bytes) -> bytes:
+        """
+        Decompresses the content of a file in the compressed pool of BackupPC. The content is a sequence of zlib
+        streams. The first byte of a stream is 0xd6 or 0xd7 (instead of 0x78) when rsync checksums have been appended
+        to the stream.
+
+        @param data: The compressed content.
+        """
+        chunks = []
+        while data:
+            if data[0] in (0xd6, 0xd7):
+                data = b'\x78' + data[1:]
+            if data[0] != 0x78:
+                # Not a zlib stream, e.g. appended rsync checksums.
+                break
+
+            decompressor = zlib.decompressobj()
+            try:
+                chunks.append(decompressor.decompress(data))
+            except zlib.error as error:
+                raise BackupPcCloneException(f'Corrupt compressed pool file: {error}')
+            data = decompressor.unused_data
+
+        return b''.join(chunks)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __read_var_int(data: bytes, pos: int) -> Tuple[int, int]:
+        """
+        Reads a variable length integer (little endian base 128). Returns the integer and the position after the
+        integer.
+
+        @param data: The content of the attrib file.
+        @param pos: The position of the integer.
+        """
+        value = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return value, pos
+            shift += 7
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def parse(data: bytes) -> List[Dict]:
+        """
+        Parses the (decompressed) content of an attrib file. Returns the name, type, size, compression level, and
+        digest of each entry.
+
+        @param data: The content of the attrib file.
+        """
+        read_var_int = AttribFile.__read_var_int
+
+        try:
+            magic = int.from_bytes(data[0:4], 'big')
+            pos = 4
+            if magic == AttribFile.magic_digest:
+                length, pos = read_var_int(data, pos)
+                pos += length
+                magic = int.from_bytes(data[pos:pos + 4], 'big')
+                pos += 4
+
+            if magic != AttribFile.magic_xattr:
+                raise BackupPcCloneException(f'Unsupported attrib file format 0x{magic:08x}')
+
+            entries = []
+            end = len(data)
+            while pos < end:
+                length, pos = read_var_int(data, pos)
+                name = data[pos:pos + length]
+                pos += length
+
+                xattr_count, pos = read_var_int(data, pos)
+                file_type, pos = read_var_int(data, pos)
+                for _ in range(4):
+                    # mtime, mode, uid, and gid.
+                    _, pos = read_var_int(data, pos)
+                size, pos = read_var_int(data, pos)
+                _, pos = read_var_int(data, pos)  # inode
+                compress, pos = read_var_int(data, pos)
+                _, pos = read_var_int(data, pos)  # nlinks
+                length, pos = read_var_int(data, pos)
+                digest = data[pos:pos + length]
+                pos += length
+
+                for _ in range(xattr_count):
+                    key_length, pos = read_var_int(data, pos)
+                    value_length, pos = read_var_int(data, pos)
+                    pos += key_length + value_length
+
+                entries.append({'name':     name,
+                                'type':     file_type,
+                                'size':     size,
+                                'compress': compress,
+                                'digest':   digest})
+
+        except IndexError:
+            raise BackupPcCloneException('Truncated attrib file')
+
+        return entries
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def pool_path(digest: bytes, compress: bool) -> Tuple[str, str]:
+        """
+        Returns the directory (relative to the top directory) and the name of a file in the pool of BackupPC v4 given
+        its digest.
+
+        @param digest: The digest of the file.
+        @param compress: Whether the file is in the compressed pool.
+        """
+        pool = 'cpool' if compress else 'pool'
+
+        return f'{pool}/{digest[0] & 0xfe:02x}/{digest[1] & 0xfe:02x}', digest.hex()
+
+# ----------------------------------------------------------------------------------------------------------------------
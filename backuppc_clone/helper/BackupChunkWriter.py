@@ -0,0 +1,120 @@
+import queue
+import threading
+from typing import Iterator, List, Tuple
+
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+
+
+class BackupChunkWriter:
+    """
+    Replaces the CSV writer of a scanner backend of host backups: collects the entries of a host backup into chunks of
+    whole directories and passes the chunks through a bounded queue from the scanning thread to the consuming thread.
+    A chunk never splits the entries with the same sequence number (i.e. the files of a directory).
+    """
+    chunk_size: int = 10000
+    """
+    The minimal number of entries in a chunk (except the last chunk).
+    """
+
+    queue_size: int = 2
+    """
+    The maximal number of chunks scanned ahead of the consumer.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        self.__queue: queue.Queue = queue.Queue(self.queue_size)
+        """
+        The queue with chunks. None marks the end of the scan.
+        """
+
+        self.__rows: List[Tuple] = []
+        """
+        The entries of the current chunk.
+        """
+
+        self.__cancelled: threading.Event = threading.Event()
+        """
+        Signals the scanning thread that the consumer has stopped.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __put(self, item: List[Tuple] | None) -> None:
+        """
+        Puts a chunk in the queue. Raises an exception when the consumer has stopped.
+
+        @param list[tuple]|None item: The chunk.
+        """
+        while True:
+            if self.__cancelled.is_set():
+                raise BackupPcCloneException('Scan cancelled')
+            try:
+                self.__queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Tuple) -> None:
+        """
+        Adds an entry (sequence number, inode, directory, name, size, number of links, mtime) to the current chunk.
+
+        @param tuple row: The entry.
+        """
+        if len(self.__rows) >= self.chunk_size and row[0] != self.__rows[-1][0]:
+            self.__put(self.__rows)
+            self.__rows = []
+
+        seq, inode, dir_name, name, size, nlink, mtime = row
+        self.__rows.append((int(seq),
+                            int(inode) if inode not in (None, '') else None,
+                            str(dir_name) if dir_name not in (None, '') else None,
+                            name,
+                            int(size) if size not in (None, '') else None,
+                            int(nlink) if nlink not in (None, '') else None,
+                            int(mtime) if mtime not in (None, '') else None))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerows(self, rows) -> None:
+        """
+        Adds entries to the current chunk.
+
+        @param iterable rows: The entries.
+        """
+        for row in rows:
+            self.writerow(row)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def close(self) -> None:
+        """
+        Passes the last chunk and marks the end of the scan. Must be called by the scanning thread, also when the scan
+        failed.
+        """
+        if self.__rows:
+            self.__put(self.__rows)
+            self.__rows = []
+        self.__put(None)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def cancel(self) -> None:
+        """
+        Stops the scanning thread at its next chunk. Must be called by the consumer when it stops before the end of the
+        scan.
+        """
+        self.__cancelled.set()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def chunks(self) -> Iterator[List[Tuple]]:
+        """
+        Yields the chunks in scan order until the end of the scan.
+        """
+        while True:
+            rows = self.__queue.get()
+            if rows is None:
+                return
+            yield rows
+
+# ----------------------------------------------------------------------------------------------------------------------
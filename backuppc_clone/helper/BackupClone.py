@@ -1,11 +1,26 @@
 import os
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from cleo.io.outputs.null_output import NullOutput
 
 from backuppc_clone.CloneIO import CloneIO
 from backuppc_clone.Config import Config
 from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.Durability import Durability
+from backuppc_clone.helper.BackupChunkWriter import BackupChunkWriter
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
 from backuppc_clone.helper.BackupScanner import BackupScanner
+from backuppc_clone.helper.BackupV4Scanner import BackupV4Scanner
+from backuppc_clone.helper.ClonePlanner import ClonePlanner
+from backuppc_clone.helper.FileCopy import FileCopy
+from backuppc_clone.helper.PoolIndex import PoolIndex
+from backuppc_clone.helper.ScannerBackend import ScannerBackend
+from backuppc_clone.IoGovernor import IoGovernor
+from backuppc_clone.Metrics import Metrics
 from backuppc_clone.misc import sizeof_fmt
 from backuppc_clone.ProgressBar import ProgressBar
 
@@ -38,6 +53,24 @@ class BackupClone:
         The number of the backup.
         """
 
+        self.__file_copy: FileCopy = FileCopy(Config.instance.copy_digest,
+                                              Config.instance.copy_drop_cache,
+                                              Config.instance.copy_direct_io_size)
+        """
+        The copier of pool files. Computes the digest of a pool file while copying the pool file (if enabled).
+        """
+
+        self.__prefetch: int = Config.instance.copy_prefetch
+        """
+        The number of queued pool files ahead of the current pool file to prefetch into the page cache.
+        """
+
+        self.__durability: Durability = DataLayer.instance.durability
+        """
+        The durability of the copied files. Shared with the metadata database, which flushes the files before each
+        commit.
+        """
+
     # ------------------------------------------------------------------------------------------------------------------
     def __scan_host_backup(self, csv_path: Path) -> None:
         """
@@ -47,8 +80,10 @@ class BackupClone:
         """
         self.__io.sub_title('Original backup')
 
-        scanner = BackupScanner(self.__io)
-        scanner.scan_directory(self.__host, self.__backup_no, csv_path)
+        with Metrics.instance.phase('backup_scan') as metrics:
+            scanner = BackupScanner(self.__io)
+            scanner.scan_directory(self.__host, self.__backup_no, csv_path)
+            metrics['entries'] = scanner.file_count + scanner.dir_count
 
         self.__io.write_line('')
         self.__io.write_line(f' Files found:       {scanner.file_count}')
@@ -68,11 +103,18 @@ class BackupClone:
         bck_id = DataLayer.instance.get_bck_id(hst_id, int(self.__backup_no))
 
         DataLayer.instance.backup_empty(bck_id)
-        DataLayer.instance.import_csv('BKC_BACKUP_TREE',
-                                      ['bbt_seq', 'bbt_inode_original', 'bbt_dir', 'bbt_name'],
-                                      csv_path,
-                                      False,
-                                      {'bck_id': bck_id})
+
+        with Metrics.instance.phase('backup_import') as metrics:
+            metrics['entries'] = DataLayer.instance.import_csv('BKC_BACKUP_TREE',
+                                                               BackupScanner.csv_column_names(csv_path),
+                                                               csv_path,
+                                                               False,
+                                                               {'bck_id': bck_id},
+                                                               defer_indexes=None)
+
+        metrics = Metrics.instance.phases['backup_import']
+        self.__io.log_very_verbose(f" Imported {metrics['entries']} rows in {metrics['duration']:.1f}s "
+                                   f"({metrics['entries_per_sec']:.0f} rows/s)")
 
     # ------------------------------------------------------------------------------------------------------------------
     def __import_pre_scan_csv(self, csv_path: Path) -> None:
@@ -95,15 +137,15 @@ class BackupClone:
         self.__io.write_line('')
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __copy_pool_file(self, dir_name: str, file_name: str, bpl_inode_original: int) -> int:
+    def __copy_pool_file(self, bpl_inode_original: int, dir_name: str, file_name: str) \
+            -> Tuple[os.stat_result, os.stat_result, bytes | None]:
         """
-        Copies a pool file from the Original pool to the clone pool. Returns the size of the file.
+        Copies a pool file from the Original pool to the clone pool. Returns the status of the original file, the
+        status of the clone file, and the digest of the content (if computed). This method is thread safe.
 
+        @param int bpl_inode_original: The inode of the original pool file.
         @param str dir_name: The directory name relative to the top dir.
         @param str file_name: The file name.
-        @param int bpl_inode_original: The inode of the original pool file.
-
-        :rtype: int
         """
         original_path = os.path.join(Config.instance.top_original_path, dir_name, file_name)
         clone_dir = Config.instance.top_clone_path.joinpath(dir_name)
@@ -115,52 +157,188 @@ class BackupClone:
         if stats_original.st_ino != bpl_inode_original:
             raise FileNotFoundError(f"Filename '{original_path}' and inode {bpl_inode_original} do not match")
 
-        if not os.path.exists(clone_dir):
-            os.makedirs(clone_dir)
+        os.makedirs(clone_dir, exist_ok=True)
 
-        shutil.copy(original_path, clone_path)
+        with IoGovernor.instance.operation(stats_original.st_size):
+            digest = self.__file_copy.copy(original_path, str(clone_path), stats_original.st_size)
+            self.__durability.sync_file(clone_path)
 
         stats_clone = os.stat(clone_path)
         os.chmod(clone_path, stats_original.st_mode)
         os.utime(clone_path, (stats_original.st_mtime, stats_original.st_mtime))
 
-        DataLayer.instance.pool_update_by_inode_original(stats_original.st_ino,
-                                                         stats_clone.st_ino,
-                                                         stats_original.st_size,
-                                                         stats_original.st_mtime)
-
-        return stats_original.st_size
+        return stats_original, stats_clone, digest
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __update_clone_pool(self) -> None:
+    def __copy_pool_file_prefetch(self, rows: List[Tuple[int, str, str]], index: int) \
+            -> Tuple[os.stat_result, os.stat_result, bytes | None]:
         """
-        Copies required pool files from the original pool to the clone pool.
+        Prefetches the pool file queued a number of files ahead and copies a pool file. This method is thread safe.
+
+        @param list rows: The queued pool files.
+        @param int index: The index of the pool file to copy.
         """
-        self.__io.sub_title('Clone pool')
-        self.__io.write_line(' Adding files ...')
-        self.__io.write_line('')
+        if self.__prefetch and index + self.__prefetch < len(rows):
+            _, dir_name, file_name = rows[index + self.__prefetch]
+            FileCopy.will_need(os.path.join(Config.instance.top_original_path, dir_name, file_name))
 
-        hst_id = DataLayer.instance.get_host_id(self.__host)
-        bck_id = DataLayer.instance.get_bck_id(hst_id, self.__backup_no)
+        return self.__copy_pool_file(*rows[index])
 
-        file_count = DataLayer.instance.backup_prepare_required_clone_pool_files(bck_id)
-        progress = ProgressBar(self.__io.output, file_count)
+    # ------------------------------------------------------------------------------------------------------------------
+    def __copy_required_pool_files(self,
+                                   executor: ThreadPoolExecutor,
+                                   progress: ProgressBar,
+                                   count_files: bool = True) -> Tuple[int, int]:
+        """
+        Copies the required pool files (prepared in TMP_CLONE_POOL_REQUIRED) with the workers of an executor and
+        updates the metadata. Returns the number of copied files and the total size of the copied files.
 
+        @param ThreadPoolExecutor executor: The executor.
+        @param ProgressBar progress: The progress bar.
+        @param bool count_files: Whether to advance the progress by the copied files (otherwise by bytes only).
+        """
         total_size = 0
         file_count = 0
         for rows in DataLayer.instance.backup_yield_required_clone_pool_files():
-            for row in rows:
-                total_size += self.__copy_pool_file(row['bpl_dir'], row['bpl_name'], row['bpl_inode_original'])
+            if self.__prefetch:
+                for _, dir_name, file_name in rows[:self.__prefetch]:
+                    FileCopy.will_need(os.path.join(Config.instance.top_original_path, dir_name, file_name))
+            results = executor.map(lambda index: self.__copy_pool_file_prefetch(rows, index), range(len(rows)))
+            for stats_original, stats_clone, digest in results:
+                DataLayer.instance.pool_update_by_inode_original(stats_original.st_ino,
+                                                                 stats_clone.st_ino,
+                                                                 stats_original.st_size,
+                                                                 stats_original.st_mtime,
+                                                                 digest)
+                total_size += stats_original.st_size
                 file_count += 1
-                progress.advance()
+                # In a pipeline the populating thread advances the progress at the same time.
+                progress.add(1 if count_files else 0, stats_original.st_size)
+
+        return file_count, total_size
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __update_clone_pool(self, file_count: int) -> None:
+        """
+        Copies the required pool files (prepared in TMP_CLONE_POOL_REQUIRED) from the original pool to the clone pool.
+        The files are copied by the workers of the I/O governor, the metadata is updated by the main thread.
+
+        @param file_count: The number of required pool files.
+        """
+        self.__io.sub_title('Clone pool')
+        self.__io.write_line(' Adding files ...')
+        self.__io.write_line('')
+
+        progress = ProgressBar(self.__io.output,
+                               file_count,
+                               maximum_bytes=DataLayer.instance.backup_get_required_clone_pool_bytes() or 0)
+
+        with Metrics.instance.phase('pool_copy') as metrics:
+            with ThreadPoolExecutor(max_workers=IoGovernor.instance.max_workers) as executor:
+                file_count, total_size = self.__copy_required_pool_files(executor, progress)
 
-        progress.finish()
+            progress.finish()
+            metrics['entries'] = file_count
+            metrics['bytes'] = total_size
 
         self.__io.write_line('')
         self.__io.write_line(f' Number of files copied: {file_count}')
         self.__io.write_line(f' Total bytes copied    : {sizeof_fmt(total_size)} ({total_size}B)')
         self.__io.write_line('')
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __populate_rows(self,
+                        rows: List[Tuple],
+                        backup_clone_path: Path,
+                        backup_original_path: Path,
+                        progress: ProgressBar) -> Tuple[int, int, int]:
+        """
+        Populates entries of the host backup: creates the hardlinks to the clone pool, copies the files not linked to
+        the pool, and creates the directories. Returns the number of copied files, created hardlinks, and created
+        directories. Advances the progress by one per entry and by the size of each copied file. This method does not
+        access the metadata database.
+
+        @param list[tuple] rows: The entries as selected by DataLayer.backup_yield_tree.
+        @param Path backup_clone_path: The path to the host backup in the clone.
+        @param Path backup_original_path: The path to the host backup in the original.
+        @param ProgressBar progress: The progress bar.
+        """
+        top_clone_path = Config.instance.top_clone_path
+        very_verbose = self.__io.is_very_verbose()
+        operation = IoGovernor.instance.operation
+        file_count = 0
+        link_count = 0
+        dir_count = 0
+        for bpl_inode_original, bpl_dir, bpl_name, bbt_inode_original, bbt_dir, bbt_name, bbt_size in rows:
+            if bbt_dir is None:
+                bbt_dir = ''
+            copy_size = 0
+
+            target_clone = os.path.join(backup_clone_path, bbt_dir, bbt_name)
+
+            if bpl_inode_original:
+                # Entry is a file linked to the pool.
+                source_clone = os.path.join(top_clone_path, bpl_dir, bpl_name)
+                if very_verbose:
+                    self.__io.text(f'Linking to <fso>{source_clone}</fso> from <fso>{target_clone}</fso>')
+                with operation():
+                    os.link(source_clone, target_clone)
+                link_count += 1
+
+            elif bbt_inode_original:
+                # Entry is a file not linked to the pool.
+                source_original = os.path.join(backup_original_path, bbt_dir, bbt_name)
+                if very_verbose:
+                    self.__io.text(f'Copying <fso>{source_original}</fso> to <fso>{target_clone}</fso>')
+                if bbt_size is None:
+                    bbt_size = os.path.getsize(source_original)
+                with operation(bbt_size):
+                    shutil.copy2(source_original, target_clone)
+                    self.__durability.sync_file(target_clone)
+                file_count += 1
+                copy_size = bbt_size
+            else:
+                # Entry is a directory
+                with operation():
+                    os.mkdir(target_clone)
+                dir_count += 1
+
+            # In a pipeline the main thread advances the progress at the same time.
+            progress.add(1, copy_size)
+
+        return file_count, link_count, dir_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __populate_chunk(self,
+                         chunk: List[Tuple],
+                         pool_index: PoolIndex,
+                         backup_clone_path: Path,
+                         backup_original_path: Path,
+                         progress: ProgressBar) -> Tuple[int, int, int]:
+        """
+        Looks up the pool files of the entries of a chunk in the pool index and populates the entries. Returns the
+        number of copied files, created hardlinks, and created directories. This method does not access the metadata
+        database.
+
+        @param list[tuple] chunk: The entries as scanned by the scanner backend.
+        @param PoolIndex pool_index: The pool index.
+        @param Path backup_clone_path: The path to the host backup in the clone.
+        @param Path backup_original_path: The path to the host backup in the original.
+        @param ProgressBar progress: The progress bar.
+        """
+        rows = []
+        for _, bbt_inode_original, bbt_dir, bbt_name, bbt_size, bbt_nlink, _ in chunk:
+            # Like DataLayer.backup_yield_tree files with one link are not looked up.
+            pool_file = None
+            if bbt_inode_original is not None and (bbt_nlink is None or bbt_nlink > 1):
+                pool_file = pool_index.lookup(bbt_inode_original)
+            if pool_file:
+                rows.append((bbt_inode_original, *pool_file, bbt_inode_original, bbt_dir, bbt_name, bbt_size))
+            else:
+                rows.append((None, None, None, bbt_inode_original, bbt_dir, bbt_name, bbt_size))
+
+        return self.__populate_rows(rows, backup_clone_path, backup_original_path, progress)
+
     # ------------------------------------------------------------------------------------------------------------------
     def __clone_backup(self) -> None:
         """
@@ -180,70 +358,407 @@ class BackupClone:
         backup_clone_path.mkdir(parents=True, exist_ok=True)
 
         backup_original_path = Config.instance.backup_original_path(self.__host, self.__backup_no)
-        top_clone_path = Config.instance.top_clone_path
 
-        file_count = DataLayer.instance.backup_prepare_tree(bck_id)
-        progress = ProgressBar(self.__io.output, file_count)
+        stats = DataLayer.instance.backup_get_stats(bck_id)
+        progress = ProgressBar(self.__io.output, stats['#files'] + (stats['#dirs'] or 0))
 
         file_count = 0
         link_count = 0
         dir_count = 0
-        for rows in DataLayer.instance.backup_yield_tree():
-            for row in rows:
-                if row['bbt_dir'] is None:
-                    row['bbt_dir'] = ''
+        with Metrics.instance.phase('populate') as metrics:
+            for rows in DataLayer.instance.backup_yield_tree(bck_id):
+                counts = self.__populate_rows(rows, backup_clone_path, backup_original_path, progress)
+                file_count += counts[0]
+                link_count += counts[1]
+                dir_count += counts[2]
 
-                target_clone = os.path.join(backup_clone_path, row['bbt_dir'], row['bbt_name'])
+            progress.finish()
+            metrics['entries'] = file_count + link_count + dir_count
 
-                if row['bpl_inode_original']:
-                    # Entry is a file linked to the pool.
-                    source_clone = os.path.join(top_clone_path, row['bpl_dir'], row['bpl_name'])
-                    self.__io.log_very_verbose(f'Linking to <fso>{source_clone}</fso> from <fso>{target_clone}</fso>')
-                    os.link(source_clone, target_clone)
-                    link_count += 1
+        DataLayer.instance.backup_set_in_progress(bck_id, 0)
 
-                elif row['bbt_inode_original']:
-                    # Entry is a file not linked to the pool.
-                    source_original = os.path.join(backup_original_path, row['bbt_dir'], row['bbt_name'])
-                    self.__io.log_very_verbose(f'Copying <fso>{source_original}</fso> to <fso>{target_clone}</fso>')
-                    shutil.copy2(source_original, target_clone)
-                    file_count += 1
-                else:
-                    # Entry is a directory
-                    os.mkdir(target_clone)
-                    dir_count += 1
+        self.__io.write_line('')
+        self.__io.write_line(f' Number of files copied       : {file_count}')
+        self.__io.write_line(f' Number of hardlinks created  : {link_count}')
+        self.__io.write_line(f' Number of directories created: {dir_count}')
+        self.__io.write_line('')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __scan_chunks(backend: ScannerBackend, backup_original_path: Path, writer: BackupChunkWriter) \
+            -> Tuple[int, int]:
+        """
+        Scans the host backup into chunks. Returns the number of found directories and files. This method runs in the
+        scanning thread of the pipeline.
+
+        @param ScannerBackend backend: The scanner backend.
+        @param Path backup_original_path: The path to the host backup in the original.
+        @param BackupChunkWriter writer: The chunk writer.
+        """
+        progress = ProgressBar(NullOutput())
+        try:
+            return backend.scan_backup(backup_original_path, writer, progress)
+        finally:
+            progress.finish()
+            writer.close()
 
-                progress.advance()
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __timed(function: Callable, *args) -> Tuple[Any, float]:
+        """
+        Calls a function and returns the result of the function and the wall time in seconds of the call.
+
+        @param callable function: The function.
+        @param args: The arguments of the function.
+        """
+        start = time.monotonic()
+        result = function(*args)
+
+        return result, time.monotonic() - start
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __clone_backup_pipelined(self) -> None:
+        """
+        Scans the host backup, copies the required pool files, and populates the host backup in a pipeline of chunks of
+        directories. The scanner backend runs in a thread. The required pool files of a chunk are copied by the workers
+        of the I/O governor and, as soon as these are copied, the entries of the chunk are populated by another thread
+        while the next chunk is being scanned and its pool files are being copied. The metadata database is accessed by
+        the main thread only. If the pool index is up to date, the populating thread looks up the pool files of the
+        entries of a chunk in the pool index, otherwise the main thread joins the entries with the pool metadata. The
+        time spent copying and populating is recorded under the pool_copy and populate phases.
+        """
+        self.__io.sub_title('Clone backup (pipelined)')
+
+        hst_id = DataLayer.instance.get_host_id(self.__host)
+        bck_id = DataLayer.instance.get_bck_id(hst_id, int(self.__backup_no))
+        DataLayer.instance.backup_empty(bck_id)
+        DataLayer.instance.backup_set_in_progress(bck_id, 1)
+
+        backup_clone_path = Config.instance.backup_clone_path(self.__host, self.__backup_no)
+        if backup_clone_path.exists():
+            shutil.rmtree(backup_clone_path)
+        backup_clone_path.mkdir(parents=True, exist_ok=True)
+
+        backup_original_path = Config.instance.backup_original_path(self.__host, self.__backup_no)
+        backend = ScannerBackend.get(self.__io, backup_original_path)
+        writer = BackupChunkWriter()
+        pool_index = PoolIndex.open(Config.instance.pool_index_path, Config.instance.last_pool_scan)
+        if pool_index is None:
+            self.__io.log_verbose(' Pool index is missing or out of date')
 
-        progress.finish()
+        self.__io.write_line(f' Scanning <fso>{backup_original_path}</fso>')
+        self.__io.write_line('')
+
+        progress = ProgressBar(self.__io.output,
+                               int(BackupInfoScanner.get_backup_info(backup_original_path, 'nFiles') or 0))
+
+        pool_file_count = 0
+        total_size = 0
+        copy_time = 0.0
+        populate_time = 0.0
+        counts = [0, 0, 0]
+        with Metrics.instance.phase('pipeline') as metrics:
+            with ThreadPoolExecutor(max_workers=1) as scan_executor, \
+                    ThreadPoolExecutor(max_workers=1) as populate_executor, \
+                    ThreadPoolExecutor(max_workers=IoGovernor.instance.max_workers) as copy_executor:
+                scan_future = scan_executor.submit(self.__scan_chunks, backend, backup_original_path, writer)
+                populate_future = None
+                try:
+                    for chunk in writer.chunks():
+                        DataLayer.instance.backup_insert_tree(bck_id, chunk)
+                        min_seq = chunk[0][0]
+                        max_seq = chunk[-1][0]
+                        if DataLayer.instance.backup_prepare_required_clone_pool_files_chunk(bck_id, min_seq, max_seq):
+                            (chunk_file_count, chunk_size), duration = self.__timed(self.__copy_required_pool_files,
+                                                                                    copy_executor,
+                                                                                    progress,
+                                                                                    False)
+                            pool_file_count += chunk_file_count
+                            total_size += chunk_size
+                            copy_time += duration
+
+                        # Chunks are populated in scan order (i.e. a directory before its entries), one at a time.
+                        if populate_future is not None:
+                            chunk_counts, duration = populate_future.result()
+                            counts = list(map(sum, zip(counts, chunk_counts)))
+                            populate_time += duration
+                        if pool_index is not None:
+                            populate_future = populate_executor.submit(self.__timed,
+                                                                       self.__populate_chunk,
+                                                                       chunk,
+                                                                       pool_index,
+                                                                       backup_clone_path,
+                                                                       backup_original_path,
+                                                                       progress)
+                        else:
+                            rows = [row for batch in DataLayer.instance.backup_yield_tree(bck_id, min_seq, max_seq)
+                                    for row in batch]
+                            populate_future = populate_executor.submit(self.__timed,
+                                                                       self.__populate_rows,
+                                                                       rows,
+                                                                       backup_clone_path,
+                                                                       backup_original_path,
+                                                                       progress)
+
+                    if populate_future is not None:
+                        chunk_counts, duration = populate_future.result()
+                        counts = list(map(sum, zip(counts, chunk_counts)))
+                        populate_time += duration
+                finally:
+                    writer.cancel()
+
+                dir_count, file_count = scan_future.result()
+
+            if pool_index is not None:
+                pool_index.close()
+
+            progress.finish()
+            metrics['entries'] = sum(counts)
+            metrics['bytes'] = total_size
+
+        Metrics.instance.record('pool_copy', copy_time, pool_file_count, total_size)
+        Metrics.instance.record('populate', populate_time, sum(counts), 0)
+
+        DataLayer.instance.backup_set_in_progress(bck_id, 0)
+
+        self.__io.write_line('')
+        self.__io.write_line(f' Files found                  : {file_count}')
+        self.__io.write_line(f' Directories found            : {dir_count}')
+        self.__io.write_line(f' Number of pool files copied  : {pool_file_count}')
+        self.__io.write_line(f' Total bytes copied           : {sizeof_fmt(total_size)} ({total_size}B)')
+        self.__io.write_line(f' Number of files copied       : {counts[0]}')
+        self.__io.write_line(f' Number of hardlinks created  : {counts[1]}')
+        self.__io.write_line(f' Number of directories created: {counts[2]}')
+        self.__io.write_line('')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __scan_host_backup_v4(self, csv_path: Path) -> None:
+        """
+        Scans the attrib files of a BackupPC v4 backup of a host.
+
+        @param csv_path: The path to the CSV file.
+        """
+        self.__io.sub_title('Original backup')
+
+        with Metrics.instance.phase('backup_scan') as metrics:
+            scanner = BackupV4Scanner(self.__io)
+            scanner.scan_directory(self.__host, self.__backup_no, csv_path)
+            metrics['entries'] = scanner.attrib_count + scanner.file_count
+
+        self.__io.write_line('')
+        self.__io.write_line(f' Attrib files found:    {scanner.attrib_count}')
+        self.__io.write_line(f' Pool references found: {scanner.file_count}')
+        self.__io.write_line('')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __import_host_scan_csv_v4(self, csv_path: Path) -> None:
+        """
+        Imports the CSV file with the pool files referenced by a BackupPC v4 host backup into the SQLite database.
+
+        @param csv_path: The path to the CSV file.
+        """
+        self.__io.log_very_verbose(f' Importing <fso>{csv_path}</fso>')
+
+        with Metrics.instance.phase('backup_import') as metrics:
+            metrics['entries'] = DataLayer.instance.import_csv('IMP_BACKUP_POOL', ['imp_dir', 'imp_name'], csv_path)
+
+        count = DataLayer.instance.backup_count_unknown_pool_files_v4()
+        if count:
+            raise FileNotFoundError(f'{count} pool files of host backup {self.__host}/{self.__backup_no} are not '
+                                    'found in the pool metadata')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __copy_host_backup_v4(self) -> None:
+        """
+        Copies the directories of a BackupPC v4 host backup. These directories hold only the (empty) attrib files and
+        the metadata of the host backup, the content of all files is in the pool.
+        """
+        self.__io.sub_title('Clone backup')
+        self.__io.write_line(' Copying ...')
+        self.__io.write_line('')
+
+        hst_id = DataLayer.instance.get_host_id(self.__host)
+        bck_id = DataLayer.instance.get_bck_id(hst_id, int(self.__backup_no))
+        DataLayer.instance.backup_set_in_progress(bck_id, 1)
+
+        backup_clone_path = Config.instance.backup_clone_path(self.__host, self.__backup_no)
+        if backup_clone_path.exists():
+            shutil.rmtree(backup_clone_path)
+        backup_clone_path.mkdir(parents=True, exist_ok=True)
+
+        backup_original_path = Config.instance.backup_original_path(self.__host, self.__backup_no)
+        progress = ProgressBar(self.__io.output)
+
+        file_count = 0
+        dir_count = 0
+        with Metrics.instance.phase('populate') as metrics:
+            for dir_path, dir_names, file_names in os.walk(backup_original_path):
+                clone_dir_path = os.path.join(backup_clone_path, os.path.relpath(dir_path, backup_original_path))
+                for dir_name in dir_names:
+                    os.mkdir(os.path.join(clone_dir_path, dir_name))
+                    dir_count += 1
+                for file_name in file_names:
+                    if dir_path == str(backup_original_path) and file_name == 'backuppc-clone.csv':
+                        continue
+                    original_file_path = os.path.join(dir_path, file_name)
+                    clone_file_path = os.path.join(clone_dir_path, file_name)
+                    with IoGovernor.instance.operation(os.path.getsize(original_file_path)):
+                        shutil.copy2(original_file_path, clone_file_path)
+                        self.__durability.sync_file(clone_file_path)
+                    file_count += 1
+                progress.count = file_count + dir_count
+
+            progress.finish()
+            metrics['entries'] = file_count + dir_count
 
         DataLayer.instance.backup_set_in_progress(bck_id, 0)
 
         self.__io.write_line('')
         self.__io.write_line(f' Number of files copied       : {file_count}')
-        self.__io.write_line(f' Number of hardlinks created  : {link_count}')
         self.__io.write_line(f' Number of directories created: {dir_count}')
         self.__io.write_line('')
 
     # ------------------------------------------------------------------------------------------------------------------
-    def clone_backup(self, host: str, backup_no: int) -> None:
+    def __scan_backup(self) -> Dict:
         """
-        Clones a backup of a host.
+        Scans the host backup (or imports its pre-scan) into the metadata database. Returns the work for cloning the
+        host backup.
         """
+        backup_original_path = Config.instance.backup_original_path(self.__host, self.__backup_no)
+        if BackupInfoScanner.is_backuppc_v4(backup_original_path):
+            csv_path = Config.instance.tmp_clone_path.joinpath(f'backup-{self.__host}-{self.__backup_no}.csv')
+            self.__scan_host_backup_v4(csv_path)
+            self.__import_host_scan_csv_v4(csv_path)
 
-        self.__host = host
-        self.__backup_no = backup_no
+            return DataLayer.instance.backup_get_plan_v4()
 
-        backup_original_path = Config.instance.backup_original_path(host, backup_no)
         pre_scan_csv_path = backup_original_path.joinpath('backuppc-clone.csv')
         if os.path.isfile(pre_scan_csv_path):
             self.__import_pre_scan_csv(pre_scan_csv_path)
         else:
-            csv_path = Config.instance.tmp_clone_path.joinpath(f'backup-{host}-{backup_no}.csv')
+            csv_path = Config.instance.tmp_clone_path.joinpath(f'backup-{self.__host}-{self.__backup_no}.csv')
             self.__scan_host_backup(csv_path)
             self.__import_host_scan_csv(csv_path)
 
-        self.__update_clone_pool()
+        hst_id = DataLayer.instance.get_host_id(self.__host)
+        bck_id = DataLayer.instance.get_bck_id(hst_id, self.__backup_no)
+
+        return DataLayer.instance.backup_get_plan(bck_id)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def plan_backup(self, host: str, backup_no: int) -> Dict:
+        """
+        Scans a backup of a host and shows the plan for cloning the backup without cloning the backup. Returns the
+        plan.
+
+        @param str host: The host of the backup.
+        @param int backup_no: The number of the backup.
+        """
+        self.__host = host
+        self.__backup_no = backup_no
+
+        planner = ClonePlanner(self.__io)
+        plan = planner.plan(self.__scan_backup())
+        planner.write(plan)
+
+        # Remove the metadata of the scanned (but not cloned) backup.
+        if not BackupInfoScanner.is_backuppc_v4(Config.instance.backup_original_path(host, backup_no)):
+            hst_id = DataLayer.instance.get_host_id(host)
+            DataLayer.instance.backup_delete(DataLayer.instance.get_bck_id(hst_id, backup_no))
+
+        return plan
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def clone_backup(self, host: str, backup_no: int) -> None:
+        """
+        Clones a backup of a host. Before copying any file the plan for cloning the backup is checked against the free
+        space and inodes of the clone. In pipelined mode the work is known only after the host backup has been scanned
+        completely, hence the plan is estimated from the backupInfo file of the host backup.
+
+        @param str host: The host of the backup.
+        @param int backup_no: The number of the backup.
+        """
+        self.__host = host
+        self.__backup_no = backup_no
+
+        backup_original_path = Config.instance.backup_original_path(host, backup_no)
+        if Config.instance.copy_pipeline and \
+                not BackupInfoScanner.is_backuppc_v4(backup_original_path) and \
+                not os.path.isfile(backup_original_path.joinpath('backuppc-clone.csv')):
+            planner = ClonePlanner(self.__io)
+            plan = planner.estimate(host, backup_no)
+            if plan is not None:
+                planner.write(plan)
+                planner.check(plan)
+            self.__clone_backup_pipelined()
+            return
+
+        planner = ClonePlanner(self.__io)
+        plan = planner.plan(self.__scan_backup())
+        planner.write(plan)
+        planner.check(plan)
+
+        if BackupInfoScanner.is_backuppc_v4(Config.instance.backup_original_path(host, backup_no)):
+            self.__update_clone_pool(DataLayer.instance.backup_prepare_required_clone_pool_files_v4())
+            self.__copy_host_backup_v4()
+            return
+
+        hst_id = DataLayer.instance.get_host_id(self.__host)
+        bck_id = DataLayer.instance.get_bck_id(hst_id, self.__backup_no)
+        self.__update_clone_pool(DataLayer.instance.backup_prepare_required_clone_pool_files([bck_id]))
+        self.__clone_backup()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def copy_pool_files(self, backups: List[Tuple[str, int]]) -> None:
+        """
+        Scans a batch of BackupPC v3 host backups and copies the pool files required by any of these host backups to
+        the clone pool in one pass. A pool file required by several host backups is copied once and all pool files
+        are read in a single sweep over the original pool. Afterwards, each host backup must be populated with
+        populate_backup. Before copying any file the plan for cloning the batch is checked against the free space and
+        inodes of the clone.
+
+        @param list[tuple[str,int]] backups: The hosts and numbers of the backups.
+        """
+        work = {'#pool_files': 0, '#links': 0, '#files': 0, '#dirs': 0, 'pool_bytes': None, 'file_bytes': 0}
+        bck_ids = []
+        for host, backup_no in backups:
+            self.__host = host
+            self.__backup_no = backup_no
+
+            self.__io.sub_title(f'Backup {host}/{backup_no}')
+            backup_work = self.__scan_backup()
+            for key in ['#links', '#files', '#dirs']:
+                work[key] += backup_work[key]
+            if work['file_bytes'] is not None and backup_work['file_bytes'] is not None:
+                work['file_bytes'] += backup_work['file_bytes']
+            else:
+                work['file_bytes'] = None
+
+            hst_id = DataLayer.instance.get_host_id(host)
+            bck_ids.append(DataLayer.instance.get_bck_id(hst_id, backup_no))
+
+        file_count = DataLayer.instance.backup_prepare_required_clone_pool_files(bck_ids)
+        work['#pool_files'] = file_count
+        work['pool_bytes'] = DataLayer.instance.backup_get_required_clone_pool_bytes()
+
+        planner = ClonePlanner(self.__io)
+        plan = planner.plan(work)
+        planner.write(plan)
+        planner.check(plan)
+
+        self.__update_clone_pool(file_count)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def populate_backup(self, host: str, backup_no: int) -> None:
+        """
+        Populates a BackupPC v3 host backup of which the required pool files have been copied with copy_pool_files.
+
+        @param str host: The host of the backup.
+        @param int backup_no: The number of the backup.
+        """
+        self.__host = host
+        self.__backup_no = backup_no
+
         self.__clone_backup()
 
 # ----------------------------------------------------------------------------------------------------------------------
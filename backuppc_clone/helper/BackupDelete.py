@@ -3,6 +3,7 @@ import os
 from backuppc_clone.Config import Config
 from backuppc_clone.DataLayer import DataLayer
 from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Metrics import Metrics
 
 
 class BackupDelete:
@@ -68,7 +69,9 @@ class BackupDelete:
         self.__host = host
         self.__backup_no = backup_no
 
-        self.__delete_metadata()
-        self.__delete_files()
+        with Metrics.instance.phase('backup_delete') as metrics:
+            self.__delete_metadata()
+            self.__delete_files()
+            metrics['entries'] = 1
 
 # ----------------------------------------------------------------------------------------------------------------------
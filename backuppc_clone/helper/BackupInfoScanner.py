@@ -5,6 +5,7 @@ from typing import Dict, List
 from backuppc_clone.CloneIO import CloneIO
 from backuppc_clone.Config import Config
 from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.Metrics import Metrics
 
 
 class BackupInfoScanner:
@@ -59,25 +60,26 @@ class BackupInfoScanner:
                 for host_child in host_dir.iterdir():
                     if host_child.is_dir():
                         backup_dir = host_dir.joinpath(host_child)
-                        if self.__is_a_backuppc_v4(host_child):
+                        if re.match(r'^\d+$', host_child.name):
                             backups.append({'bob_host':     pc_child.name,
                                             'bob_number':   int(host_child.name),
                                             'bob_end_time': self.get_backup_info(backup_dir, 'endTime'),
                                             'bob_level':    self.get_backup_info(backup_dir, 'level'),
-                                            'bob_type':     self.get_backup_info(backup_dir, 'type')})
+                                            'bob_type':     self.get_backup_info(backup_dir, 'type'),
+                                            'bob_n_files':  self.get_backup_info(backup_dir, 'nFiles'),
+                                            'bob_size':     self.get_backup_info(backup_dir, 'size'),
+                                            'bob_size_new': self.get_backup_info(backup_dir, 'sizeNew')})
 
         return backups
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __is_a_backuppc_v4(self, path: Path) -> bool:
+    @staticmethod
+    def is_backuppc_v4(path: Path) -> bool:
         """
         Returns whether a path is a BackupPC V4 backup.
 
         :param path: The path.
         """
-        if not re.match(r'^\d+$', path.name):
-            return False
-
         for child in path.iterdir():
             if re.match(r'^attrib_[0-9a-f]+$', child.name):
                 return True
@@ -98,7 +100,10 @@ class BackupInfoScanner:
                                                       backup['bob_number'],
                                                       backup['bob_end_time'],
                                                       backup['bob_level'],
-                                                      backup['bob_type'])
+                                                      backup['bob_type'],
+                                                      backup['bob_n_files'],
+                                                      backup['bob_size'],
+                                                      backup['bob_size_new'])
 
         stats = DataLayer.instance.original_backup_get_stats()
 
@@ -111,7 +116,9 @@ class BackupInfoScanner:
         """
         Scans information about backups.
         """
-        backups = self.__scan_for_backups()
-        self.__import_backups(backups)
+        with Metrics.instance.phase('backup_info_scan') as metrics:
+            backups = self.__scan_for_backups()
+            self.__import_backups(backups)
+            metrics['entries'] = len(backups)
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -1,11 +1,12 @@
 import csv
-import os
 import shutil
 from pathlib import Path
+from typing import List
 
 from backuppc_clone.CloneIO import CloneIO
 from backuppc_clone.Config import Config
 from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.helper.ScannerBackend import ScannerBackend
 from backuppc_clone.ProgressBar import ProgressBar
 
 
@@ -13,6 +14,17 @@ class BackupScanner:
     """
     Helper class for scanning backup directories.
     """
+    column_names: List[str] = ['bbt_seq',
+                               'bbt_inode_original',
+                               'bbt_dir',
+                               'bbt_name',
+                               'bbt_size',
+                               'bbt_nlink',
+                               'bbt_mtime']
+    """
+    The columns of the CSV files with the entries of a host backup. Pre-scans written by older versions have the first
+    four columns only.
+    """
 
     # ------------------------------------------------------------------------------------------------------------------
     def __init__(self, io: CloneIO):
@@ -37,11 +49,6 @@ class BackupScanner:
         The file count.
         """
 
-        self.__entry_seq: int = 0
-        """
-        The entry sequence number.
-        """
-
         self.progress: ProgressBar | None = None
         """
         The progress counter.
@@ -64,37 +71,17 @@ class BackupScanner:
         return self.__file_count
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __scan_directory_helper(self, parent_dir_path: Path, dir_name: Path | None, csv_writer) -> None:
+    @staticmethod
+    def csv_column_names(csv_path: Path) -> List[str]:
         """
-        Scans recursively a list of directories and stores filenames and directories in CSV format.
+        Returns the columns of a CSV file with the entries of a host backup.
 
-        @param parent_dir_path: The path to the parent directory.
-        @param dir_name: The name of the directory.
-        @param csv_writer: The CSV writer.
+        @param csv_path: The path to the CSV file.
         """
-        target_path = parent_dir_path.joinpath(dir_name) if dir_name else parent_dir_path
-
-        first_file = True
-        sub_dir_names = []
-        for entry in os.scandir(target_path):
-            if entry.is_file():
-                self.__file_count += 1
-                if first_file:
-                    first_file = False
-                    self.__entry_seq += 1
-                csv_writer.writerow((self.__entry_seq, entry.inode(), dir_name, entry.name))
-
-                if entry.name not in ['attrib', 'backupInfo', 'backuppc-clone.csv']:
-                    self.progress.advance()
+        with open(csv_path, 'r') as csv_file:
+            row = next(csv.reader(csv_file), None)
 
-            elif entry.is_dir():
-                sub_dir_names.append(entry.name)
-
-        for sub_dir_name in sorted(sub_dir_names):
-            self.__entry_seq += 1
-            self.__dir_count += 1
-            csv_writer.writerow((self.__entry_seq, None, dir_name, sub_dir_name))
-            self.__scan_directory_helper(parent_dir_path, dir_name.joinpath(sub_dir_name), csv_writer)
+        return BackupScanner.column_names[:len(row)] if row else BackupScanner.column_names
 
     # ------------------------------------------------------------------------------------------------------------------
     def scan_directory(self, host: str, backup_no: int, csv_path: Path) -> None:
@@ -105,12 +92,9 @@ class BackupScanner:
         @param backup_no: The backup number.
         @param csv_path: The path to the CSV file.
         """
-        self.__dir_count = 0
-        self.__file_count = 0
-        self.__entry_seq = 0
-
         backup_dir = Config.instance.backup_original_path(host, backup_no)
 
+        backend = ScannerBackend.get(self.__io, backup_dir)
         file_count = int(BackupInfoScanner.get_backup_info(backup_dir, 'nFiles'))
         self.progress = ProgressBar(self.__io.output, file_count)
 
@@ -118,7 +102,7 @@ class BackupScanner:
             csv_writer = csv.writer(csv_file)
             self.__io.write_line(f' Scanning <fso>{backup_dir}</fso>')
             self.__io.write_line('')
-            self.__scan_directory_helper(backup_dir, None, csv_writer)
+            self.__dir_count, self.__file_count = backend.scan_backup(backup_dir, csv_writer, self.progress)
             self.progress.finish()
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -129,15 +113,12 @@ class BackupScanner:
         @param str host: The host name
         @param int backup_no: The backup number.
         """
-        self.__dir_count = 0
-        self.__file_count = 0
-        self.__entry_seq = 0
-
         backup_original_path = Config.instance.backup_original_path(host, backup_no)
 
         csv_filename1 = Config.instance.tmp_clone_path.joinpath(f'backup-{host}-{backup_no}.csv')
         csv_filename2 = backup_original_path.joinpath('backuppc-clone.csv')
 
+        backend = ScannerBackend.get(self.__io, backup_original_path)
         file_count = int(BackupInfoScanner.get_backup_info(backup_original_path, 'nFiles'))
         self.progress = ProgressBar(self.__io.output, file_count)
 
@@ -145,7 +126,7 @@ class BackupScanner:
             csv_writer = csv.writer(csv_file)
             self.__io.write_line(f' Scanning <fso>{backup_original_path}</fso>')
             self.__io.write_line('')
-            self.__scan_directory_helper(backup_original_path, None, csv_writer)
+            self.__dir_count, self.__file_count = backend.scan_backup(backup_original_path, csv_writer, self.progress)
             self.progress.finish()
 
         shutil.move(csv_filename1, csv_filename2)
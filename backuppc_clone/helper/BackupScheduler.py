@@ -0,0 +1,199 @@
+import math
+import os
+from typing import Dict, List, Set, Tuple
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Config import Config
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.helper.BackupScanner import BackupScanner
+from backuppc_clone.helper.ClonePlanner import ClonePlanner
+from backuppc_clone.Metrics import Metrics
+from backuppc_clone.misc import sizeof_fmt
+
+
+class BackupScheduler:
+    """
+    Selects the next host backup to clone.
+
+    In cost order the cost of cloning each pending host backup is estimated and the cheapest host backup is cloned
+    first, such that the number of host backups cloned per hour is maximized when catching up. The cost is the expected
+    duration (see ClonePlanner.estimate_duration) of copying the pool files missing in the clone and populating the host
+    backup, or, if no throughput has been recorded yet, the bytes to copy. With a pre-scan of a host backup the sizes
+    (or, for pre-scans of older versions, the number) of the missing pool files are summed in the metadata database
+    once per pool synchronization, i.e. the cost is not recomputed after cloning other host backups until the next pool
+    synchronization.
+    Otherwise, the bytes to copy are estimated from the backupInfo file of the host backup: the size of the files that
+    were new to the original pool if the host has a cloned backup, and the size of all files if not. Host backups
+    without sizes come last.
+
+    In age order the full backups are cloned before the incremental backups and the most recent backups first.
+
+    In batch mode the next host backups in either order are cloned together, see BackupClone.copy_pool_files.
+    """
+    orders: List[str] = ['cost', 'age']
+    """
+    The available orders.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO):
+        """
+        Object constructor.
+
+        @param CloneIO io: The output style.
+        """
+        self.__io: CloneIO = io
+        """
+        The output style.
+        """
+
+        self.__order: str = Config.instance.schedule_order
+        """
+        The order in which backups are cloned.
+        """
+
+        if self.__order not in BackupScheduler.orders:
+            raise BackupPcCloneException('Unknown schedule order {}, available orders: {}'.
+                                         format(self.__order, ', '.join(BackupScheduler.orders)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __estimate_work(backup: Dict, average_file_size: float) -> Dict:
+        """
+        Returns the estimated bytes to copy and entries to populate for cloning a host backup.
+
+        @param dict backup: The metadata of the host backup.
+        @param float average_file_size: The estimated average size of a pool file.
+        """
+        backup_original_path = Config.instance.backup_original_path(backup['bob_host'], backup['bob_number'])
+        pre_scan_csv_path = backup_original_path.joinpath('backuppc-clone.csv')
+        if os.path.isfile(pre_scan_csv_path):
+            pool_sync = Config.instance.last_pool_scan
+            stats = DataLayer.instance.schedule_work_get(backup['bob_host'], backup['bob_number'], pool_sync)
+            if stats is None:
+                DataLayer.instance.import_csv('IMP_PRE_SCAN',
+                                              BackupScanner.csv_column_names(pre_scan_csv_path),
+                                              pre_scan_csv_path)
+                stats = DataLayer.instance.backup_get_pre_scan_stats()
+                DataLayer.instance.schedule_work_set(backup['bob_host'], backup['bob_number'], pool_sync, stats)
+
+            if stats['#bytes'] is not None:
+                return {'bytes':   stats['#bytes'],
+                        'entries': stats['#entries']}
+
+            return {'bytes':   int(stats['#files'] * average_file_size),
+                    'entries': stats['#entries']}
+
+        size = backup['bob_size_new'] if backup['hst_cloned'] else backup['bob_size']
+
+        return {'bytes':   int(size) if size is not None else None,
+                'entries': int(backup['bob_n_files'] or 0)}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __sort(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        Returns host backups sorted by their cost, the cheapest host backup first.
+
+        @param list[dict] candidates: The metadata of the host backups to clone.
+        """
+        average_file_size = ClonePlanner.average_file_size()
+        DataLayer.instance.schedule_work_delete_stale(Config.instance.last_pool_scan)
+
+        costs = []
+        with Metrics.instance.phase('schedule') as metrics:
+            for backup in candidates:
+                work = self.__estimate_work(backup, average_file_size)
+                if work['bytes'] is None:
+                    cost = math.inf
+                    self.__io.log_verbose(f' Backup {backup['bob_host']}/{backup['bob_number']}: size unknown')
+                else:
+                    duration = ClonePlanner.estimate_duration(work['bytes'], work['entries'])
+                    cost = duration if duration is not None else work['bytes']
+                    self.__io.log_verbose(f' Backup {backup['bob_host']}/{backup['bob_number']}: '
+                                          f'{sizeof_fmt(work['bytes'])} to copy, {work['entries']} entries' +
+                                          (f', expected duration {duration:.1f}s' if duration is not None else ''))
+                costs.append(cost)
+
+            metrics['entries'] = len(candidates)
+
+        # The sort is stable, hence host backups with equal costs remain in age order.
+        return [backup for _, backup in sorted(zip(costs, candidates), key=lambda item: item[0])]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __batch(backups: List[Dict], count: int) -> List[Dict]:
+        """
+        Returns the first host backups that can be cloned in one batch. A batch holds either one BackupPC v4 host
+        backup or BackupPC v3 host backups only.
+
+        @param list[dict] backups: The metadata of the host backups to clone in order of preference.
+        @param int count: The maximum number of host backups in the batch.
+        """
+        if count == 1 or not backups:
+            return backups[:1]
+
+        batch = []
+        for backup in backups:
+            if BackupInfoScanner.is_backuppc_v4(Config.instance.backup_original_path(backup['bob_host'],
+                                                                                     backup['bob_number'])):
+                if not batch:
+                    return [backup]
+            else:
+                batch.append(backup)
+                if len(batch) == count:
+                    break
+
+        return batch
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __next_backups(self, end_time: int, count: int, excluded: Set[Tuple[str, int]]) -> List[Dict]:
+        """
+        Returns the metadata of the next host backups to clone that ended before a time.
+
+        @param int end_time: Only backups that ended before this time are selected. -1 for all backups.
+        @param int count: The maximum number of host backups.
+        @param set[tuple[str,int]] excluded: The hosts and numbers of the host backups not to select.
+        """
+        if self.__order == 'age' and count == 1 and not excluded:
+            backup = DataLayer.instance.backup_get_next(end_time)
+            return [backup] if backup else []
+
+        candidates = [backup for backup in DataLayer.instance.backup_get_candidates(end_time)
+                      if (backup['bob_host'], backup['bob_number']) not in excluded]
+        if self.__order == 'age':
+            return self.__batch(candidates, count)
+
+        if len(candidates) <= 1:
+            return candidates
+
+        return self.__batch(self.__sort(candidates), count)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def next_backups(self, count: int, excluded: Set[Tuple[str, int]] | None = None) -> List[Dict]:
+        """
+        Returns the metadata of the next host backups to clone, at most a given number. Host backups that ended before
+        the last scan of the pool are preferred because they do not require a resynchronization of the pool.
+
+        @param int count: The maximum number of host backups.
+        @param set[tuple[str,int]]|None excluded: The hosts and numbers of the host backups not to select, e.g. host
+                                                  backups that have been deferred.
+        """
+        excluded = excluded or set()
+        backups = self.__next_backups(Config.instance.last_pool_scan, count, excluded)
+        if not backups:
+            backups = self.__next_backups(-1, count, excluded)
+
+        return backups
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def next_backup(self) -> Dict | None:
+        """
+        Returns the metadata of the next host backup to clone.
+        """
+        backups = self.next_backups(1)
+
+        return backups[0] if backups else None
+
+# ----------------------------------------------------------------------------------------------------------------------
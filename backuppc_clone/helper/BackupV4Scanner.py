@@ -0,0 +1,123 @@
+import csv
+import os
+import re
+from pathlib import Path
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Config import Config
+from backuppc_clone.helper.AttribFile import AttribFile
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.ProgressBar import ProgressBar
+
+
+class BackupV4Scanner:
+    """
+    Helper class for scanning BackupPC v4 host backups. Instead of walking every file of a host backup only the attrib
+    files are read. The pool files referenced by a host backup (the attrib files themselves and the content of the
+    entries in the attrib files) are stored in CSV format.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO):
+        """
+        Object constructor.
+
+        @param CloneIO io: The output style.
+        """
+        self.__io: CloneIO = io
+        """
+        The output style.
+        """
+
+        self.__attrib_count: int = 0
+        """
+        The number of found attrib files.
+        """
+
+        self.__file_count: int = 0
+        """
+        The number of found references to pool files.
+        """
+
+        self.__compress: bool = True
+        """
+        Whether the pool files of the host backup are compressed.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def attrib_count(self) -> int:
+        """
+        Returns the number of found attrib files.
+        """
+        return self.__attrib_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def file_count(self) -> int:
+        """
+        Returns the number of found references to pool files.
+        """
+        return self.__file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __read_attrib_file(self, path: str, digest: bytes) -> bytes:
+        """
+        Returns the decompressed content of an attrib file. The attrib file in a directory of a host backup is empty
+        and its name holds the digest of the content in the pool.
+
+        @param path: The path to the attrib file in the host backup.
+        @param digest: The digest of the attrib file.
+        """
+        if os.path.getsize(path) > 0:
+            with open(path, 'rb') as file:
+                data = file.read()
+        else:
+            dir_name, file_name = AttribFile.pool_path(digest, self.__compress)
+            with open(os.path.join(Config.instance.top_original_path, dir_name, file_name), 'rb') as file:
+                data = file.read()
+
+        return AttribFile.decompress(data) if self.__compress else data
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def scan_directory(self, host: str, backup_no: int, csv_path: Path) -> None:
+        """
+        Scans the attrib files of a host backup and stores the pool files referenced by the host backup in CSV format.
+
+        @param host: The host name
+        @param backup_no: The backup number.
+        @param csv_path: The path to the CSV file.
+        """
+        self.__attrib_count = 0
+        self.__file_count = 0
+
+        backup_dir = Config.instance.backup_original_path(host, backup_no)
+        self.__compress = int(BackupInfoScanner.get_backup_info(backup_dir, 'compress') or 0) > 0
+
+        file_count = int(BackupInfoScanner.get_backup_info(backup_dir, 'nFiles') or 0)
+        progress = ProgressBar(self.__io.output, file_count)
+
+        with open(csv_path, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            self.__io.write_line(f' Scanning <fso>{backup_dir}</fso>')
+            self.__io.write_line('')
+
+            for dir_path, _, file_names in os.walk(backup_dir):
+                for file_name in file_names:
+                    match = re.match(r'^attrib[0-9a-f]*_([0-9a-f]{32,})$', file_name)
+                    if not match:
+                        continue
+
+                    digest = bytes.fromhex(match.group(1))
+                    csv_writer.writerow(AttribFile.pool_path(digest, self.__compress))
+                    self.__attrib_count += 1
+
+                    for entry in AttribFile.parse(self.__read_attrib_file(os.path.join(dir_path, file_name), digest)):
+                        if entry['digest']:
+                            csv_writer.writerow(AttribFile.pool_path(entry['digest'], entry['compress'] > 0))
+                            self.__file_count += 1
+                        progress.count += 1
+
+            progress.finish()
+
+# ----------------------------------------------------------------------------------------------------------------------
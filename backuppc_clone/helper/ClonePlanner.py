@@ -0,0 +1,208 @@
+import os
+from typing import Dict
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Config import Config
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.exception.BackupDoesNotFitException import BackupDoesNotFitException
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.Metrics import Metrics
+from backuppc_clone.misc import sizeof_fmt
+
+
+class ClonePlanner:
+    """
+    Plans the cloning of a scanned host backup: computes the bytes and inodes required on the filesystem of the clone
+    and the expected duration and compares these with the free blocks and inodes of the filesystem of the clone and
+    the configured maximum duration.
+
+    The work is computed from the metadata database only. The bytes to copy are summed from the sizes recorded by the
+    scan of the host backup. When the sizes are unknown (BackupPC v4 host backups and pre-scans of older versions) the
+    bytes to copy are estimated with the average size of the pool files copied before, or, on a new clone, the average
+    size of the files on the filesystem of the original pool. A host backup cloned in a pipeline is not scanned before
+    cloning, hence its work is estimated from its backupInfo file. The duration is estimated with the throughput of the
+    last runs of the pool_copy and populate phases.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO):
+        """
+        Object constructor.
+
+        @param CloneIO io: The output style.
+        """
+
+        self.__io: CloneIO = io
+        """
+        The output style.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def average_file_size() -> float:
+        """
+        Returns the estimated average size of a pool file.
+        """
+        size = DataLayer.instance.pool_get_average_size()
+        if size is not None:
+            return size
+
+        stats = os.statvfs(Config.instance.top_original_path)
+        used_inodes = stats.f_files - stats.f_ffree
+
+        return (stats.f_blocks - stats.f_bfree) * stats.f_frsize / max(used_inodes, 1)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def estimate_duration(copy_bytes: int, entries: int) -> float | None:
+        """
+        Returns the estimated duration in seconds of copying pool files and populating a host backup based on the
+        throughput of the last runs of the pool_copy and populate phases. Returns None if no throughput is known.
+
+        @param int copy_bytes: The number of bytes of pool files to copy.
+        @param int entries: The number of entries of the host backup to populate.
+        """
+        history = Metrics.instance.history
+        copy_rate = history.get('pool_copy', {}).get('bytes_per_sec', 0.0)
+        populate_rate = history.get('populate', {}).get('entries_per_sec', 0.0)
+
+        if (copy_bytes and not copy_rate) or (entries and not populate_rate):
+            return None
+
+        return (copy_bytes / copy_rate if copy_bytes else 0.0) + (entries / populate_rate if entries else 0.0)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __duration_fmt(duration: float | None) -> str:
+        """
+        Returns a duration in human-readable format.
+
+        @param float|None duration: The duration in seconds.
+        """
+        if duration is None:
+            return 'unknown (no throughput recorded yet)'
+
+        minutes = int(duration) // 60
+
+        return f'{minutes // 60}h{minutes % 60:02d}m'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def plan(self, work: Dict) -> Dict:
+        """
+        Returns the plan for cloning a scanned host backup.
+
+        @param dict work: The work as selected by DataLayer.backup_get_plan.
+        """
+        stats = os.statvfs(Config.instance.top_clone_path)
+
+        copy_files = work['#pool_files'] + work['#files']
+        exact = work.get('pool_bytes') is not None and work.get('file_bytes') is not None
+        if exact:
+            pool_bytes = work['pool_bytes']
+            copy_bytes = pool_bytes + work['file_bytes']
+        else:
+            average_file_size = self.average_file_size()
+            pool_bytes = int(work['#pool_files'] * average_file_size)
+            copy_bytes = int(copy_files * average_file_size)
+        inodes = copy_files + work['#dirs']
+        # On average half a block is wasted per file and each directory requires at least one block.
+        blocks = copy_bytes + (copy_files // 2 + work['#dirs']) * stats.f_frsize
+
+        reserve = Config.instance.plan_reserve
+        free_bytes = stats.f_bavail * stats.f_frsize - int(reserve * stats.f_blocks * stats.f_frsize)
+        # Some filesystems (e.g. btrfs) allocate inodes dynamically and report no inodes at all.
+        free_inodes = stats.f_favail - int(reserve * stats.f_files) if stats.f_files else None
+
+        duration = self.estimate_duration(pool_bytes, work['#links'] + work['#files'] + work['#dirs'])
+
+        return {'#pool_files': work['#pool_files'],
+                '#links':      work['#links'],
+                '#files':      work['#files'],
+                '#dirs':       work['#dirs'],
+                'bytes':       copy_bytes,
+                'exact':       exact,
+                'blocks':      blocks,
+                'inodes':      inodes,
+                'free_bytes':  free_bytes,
+                'free_inodes': free_inodes,
+                'duration':    duration}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def estimate(self, host: str, backup_no: int) -> Dict | None:
+        """
+        Returns the plan for cloning a host backup that has not been scanned estimated from the backupInfo file of the
+        host backup: the files new to the original pool are copied when the host has a cloned backup, else all files.
+        Directories are not included. Returns None if the backupInfo file holds no file counts and sizes.
+
+        @param str host: The host of the backup.
+        @param int backup_no: The number of the backup.
+        """
+        backup_original_path = Config.instance.backup_original_path(host, backup_no)
+        if DataLayer.instance.host_has_cloned_backup(host):
+            n_copy = BackupInfoScanner.get_backup_info(backup_original_path, 'nFilesNew')
+            size = BackupInfoScanner.get_backup_info(backup_original_path, 'sizeNew')
+        else:
+            n_copy = BackupInfoScanner.get_backup_info(backup_original_path, 'nFiles')
+            size = BackupInfoScanner.get_backup_info(backup_original_path, 'size')
+        n_files = BackupInfoScanner.get_backup_info(backup_original_path, 'nFiles')
+        if n_copy is None or size is None or n_files is None:
+            return None
+
+        plan = self.plan({'#pool_files': int(n_copy),
+                          '#files':      0,
+                          '#links':      int(n_files),
+                          '#dirs':       0,
+                          'pool_bytes':  int(size),
+                          'file_bytes':  0})
+        plan['exact'] = False
+
+        return plan
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def write(self, plan: Dict) -> None:
+        """
+        Shows a plan.
+
+        @param dict plan: The plan.
+        """
+        self.__io.sub_title('Plan')
+
+        self.__io.write_line(f' Pool files to copy          : {plan['#pool_files']}')
+        self.__io.write_line(f' Other files to copy         : {plan['#files']}')
+        self.__io.write_line(f' Hardlinks to create         : {plan['#links']}')
+        self.__io.write_line(f' Directories to create       : {plan['#dirs']}')
+        if plan['exact']:
+            self.__io.write_line(f' Bytes to copy               : {sizeof_fmt(plan['bytes'])}')
+        else:
+            self.__io.write_line(f' Bytes to copy (estimated)   : {sizeof_fmt(plan['bytes'])}')
+        self.__io.write_line(f' Disk space required         : {sizeof_fmt(plan['blocks'])}')
+        self.__io.write_line(f' Disk space available        : {sizeof_fmt(max(plan['free_bytes'], 0))}')
+        self.__io.write_line(f' Inodes required             : {plan['inodes']}')
+        if plan['free_inodes'] is not None:
+            self.__io.write_line(f' Inodes available            : {max(plan['free_inodes'], 0)}')
+        self.__io.write_line(f' Expected duration           : {self.__duration_fmt(plan['duration'])}')
+        self.__io.write_line('')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def check(plan: Dict) -> None:
+        """
+        Raises an exception if a host backup does not fit on the filesystem of the clone or is expected to take longer
+        than the configured maximum duration.
+
+        @param dict plan: The plan.
+        """
+        if plan['blocks'] > plan['free_bytes']:
+            raise BackupDoesNotFitException(f'Not enough disk space on the clone: {sizeof_fmt(plan['blocks'])} '
+                                            f'required, {sizeof_fmt(max(plan['free_bytes'], 0))} available')
+
+        if plan['free_inodes'] is not None and plan['inodes'] > plan['free_inodes']:
+            raise BackupDoesNotFitException(f'Not enough inodes on the clone: {plan['inodes']} required, '
+                                            f'{max(plan['free_inodes'], 0)} available')
+
+        max_duration = Config.instance.plan_max_duration
+        if max_duration and plan['duration'] is not None and plan['duration'] > max_duration:
+            raise BackupDoesNotFitException(f'Expected duration {ClonePlanner.__duration_fmt(plan['duration'])} '
+                                            f'exceeds the maximum duration {ClonePlanner.__duration_fmt(max_duration)}')
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,302 @@
+import hashlib
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Config import Config
+from backuppc_clone.DataLayer import DataLayer
+from backuppc_clone.helper.BackupInfoScanner import BackupInfoScanner
+from backuppc_clone.helper.BackupV4Scanner import BackupV4Scanner
+from backuppc_clone.helper.FileCopy import FileCopy
+from backuppc_clone.helper.RateLimiter import RateLimiter
+from backuppc_clone.Metrics import Metrics
+from backuppc_clone.misc import sizeof_fmt
+from backuppc_clone.ProgressBar import ProgressBar
+
+
+class CloneVerify:
+    """
+    Verifies the content of the clone against the original.
+    """
+    block_size: int = 1024 * 1024
+    """
+    The size of the blocks read from the files.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, io: CloneIO, workers: int, rate: float, use_digest: bool = True):
+        """
+        Object constructor.
+
+        @param CloneIO io: The output style.
+        @param int workers: The number of worker threads.
+        @param float rate: The maximum number of bytes read per second (from the original and the clone together). 0
+                           for no limit.
+        @param bool use_digest: If True pool files are verified against their digests recorded while copying (if
+                                available) instead of against the original pool.
+        """
+        self.__io: CloneIO = io
+        """
+        The output style.
+        """
+
+        self.__workers: int = workers
+        """
+        The number of worker threads.
+        """
+
+        self.__rate_limiter: RateLimiter = RateLimiter(rate)
+        """
+        The limiter of the number of bytes read per second.
+        """
+
+        self.__use_digest: bool = use_digest
+        """
+        Whether pool files are verified against their recorded digests.
+        """
+
+        self.__drop_cache: bool = Config.instance.copy_drop_cache
+        """
+        Whether the cached pages of a verified file are dropped after reading.
+        """
+
+        self.__mismatches: List[Tuple[str, str]] = []
+        """
+        The reason and the path of each file of the clone that does not match the original.
+        """
+
+        self.__skip_count: int = 0
+        """
+        The number of files that no longer exist in the original.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def mismatches(self) -> List[Tuple[str, str]]:
+        """
+        Returns the reason and the path of each file of the clone that does not match the original.
+        """
+        return self.__mismatches
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def sample_size(population: int, confidence: float, tolerance: float) -> int:
+        """
+        Returns the size of a random sample such that with the given confidence at least one corrupt file is found
+        when the given fraction of the files is corrupt.
+
+        @param int population: The number of files.
+        @param float confidence: The confidence, e.g. 0.99.
+        @param float tolerance: The fraction of corrupt files, e.g. 0.01.
+        """
+        if tolerance >= 1.0:
+            return min(population, 1)
+
+        return min(population, math.ceil(math.log(1.0 - confidence) / math.log(1.0 - tolerance)))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __scan_backup_v4(self, host: str, backup_no: int) -> None:
+        """
+        Scans the attrib files of a BackupPC v4 host backup and adds the referenced pool files to IMP_BACKUP_POOL.
+
+        @param str host: The name of the host.
+        @param int backup_no: The backup number.
+        """
+        csv_path = Config.instance.tmp_clone_path.joinpath(f'verify-{host}-{backup_no}.csv')
+        scanner = BackupV4Scanner(self.__io)
+        scanner.scan_directory(host, backup_no, csv_path)
+        DataLayer.instance.import_csv('IMP_BACKUP_POOL', ['imp_dir', 'imp_name'], csv_path, False)
+        csv_path.unlink()
+        self.__io.write_line('')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __prepare(self, host: str | None, backup_no: int | None) -> None:
+        """
+        Prepares the files to be verified.
+
+        @param str|None host: The name of the host or None for the whole clone.
+        @param int|None backup_no: The backup number or None for all backups of the host.
+        """
+        DataLayer.instance.verify_truncate()
+
+        backups = DataLayer.instance.verify_select_backups(host, backup_no)
+        if host is not None:
+            for backup in backups:
+                backup_clone_path = Config.instance.backup_clone_path(backup['hst_name'], backup['bck_number'])
+                backup_original_path = Config.instance.backup_original_path(backup['hst_name'], backup['bck_number'])
+                if BackupInfoScanner.is_backuppc_v4(backup_clone_path):
+                    if backup_original_path.is_dir():
+                        self.__scan_backup_v4(backup['hst_name'], backup['bck_number'])
+                    else:
+                        self.__io.warning(f"Original backup {backup['hst_name']}/{backup['bck_number']} not found")
+
+        DataLayer.instance.verify_prepare_pool_files(str(Config.instance.top_original_path),
+                                                     str(Config.instance.top_clone_path),
+                                                     self.__use_digest,
+                                                     host is None)
+        DataLayer.instance.verify_prepare_backup_files(str(Config.instance.pc_original_path),
+                                                       str(Config.instance.top_clone_path.joinpath('pc')))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __digest(self, file) -> bytes:
+        """
+        Reads a file in blocks and returns the SHA-256 digest of its content.
+
+        @param file: The file object.
+        """
+        digest = hashlib.sha256()
+        block_size = self.block_size
+        while True:
+            block = file.read(block_size)
+            if not block:
+                if self.__drop_cache:
+                    FileCopy.dont_need(file.fileno())
+                return digest.digest()
+            self.__rate_limiter.acquire(len(block))
+            digest.update(block)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __verify_file_digest(self, clone_path: str, size: int, digest: bytes) -> Tuple[str | None, int]:
+        """
+        Verifies a file of the clone against its digest recorded while copying. Returns the reason of a mismatch (or
+        None if the file matches) and the number of bytes read.
+
+        @param str clone_path: The path to the file in the clone.
+        @param int size: The recorded size of the file.
+        @param bytes digest: The recorded digest of the file.
+        """
+        try:
+            with open(clone_path, 'rb') as clone_file:
+                if os.fstat(clone_file.fileno()).st_size != size:
+                    return 'size', 0
+
+                if self.__digest(clone_file) != digest:
+                    return 'content', size
+
+                return None, size
+
+        except FileNotFoundError:
+            return 'missing', 0
+
+        except OSError as error:
+            return f'error ({error.strerror})', 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __verify_file(self,
+                      original_path: str,
+                      clone_path: str,
+                      size: int | None,
+                      digest: bytes | None) -> Tuple[str | None, int]:
+        """
+        Verifies a file of the clone against the original or against its recorded digest. Returns the reason of a
+        mismatch (or None if the files match) and the number of bytes read.
+
+        @param str original_path: The path to the file in the original.
+        @param str clone_path: The path to the file in the clone.
+        @param int|None size: The recorded size of the file.
+        @param bytes|None digest: The recorded digest of the file or None if the file must be verified against the
+                                  original.
+        """
+        if digest is not None:
+            return self.__verify_file_digest(clone_path, size, digest)
+
+        try:
+            with open(original_path, 'rb') as original_file:
+                try:
+                    with open(clone_path, 'rb') as clone_file:
+                        size = os.fstat(original_file.fileno()).st_size
+                        if size != os.fstat(clone_file.fileno()).st_size:
+                            return 'size', 0
+
+                        if self.__digest(original_file) != self.__digest(clone_file):
+                            return 'content', 2 * size
+
+                        return None, 2 * size
+
+                except FileNotFoundError:
+                    return 'missing', 0
+
+        except FileNotFoundError:
+            # The file has been removed from the original (e.g. by BackupPC_nightly) after the last pool scan.
+            return 'skipped', 0
+
+        except OSError as error:
+            return f'error ({error.strerror})', 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def verify(self, host: str | None, backup_no: int | None, confidence: float | None, tolerance: float) -> int:
+        """
+        Verifies the content of the clone against the original. Returns the number of mismatches.
+
+        @param str|None host: The name of the host or None for the whole clone.
+        @param int|None backup_no: The backup number or None for all backups of the host.
+        @param float|None confidence: The confidence for random sampling or None for verifying all files.
+        @param float tolerance: The fraction of corrupt files that must be detected with the given confidence.
+        """
+        self.__io.sub_title('Preparing')
+
+        self.__prepare(host, backup_no)
+        stats = DataLayer.instance.verify_get_stats()
+        population = stats['#files']
+        self.__io.write_line(f' Files in scope: {population}')
+
+        if confidence is not None:
+            DataLayer.instance.verify_sample(self.sample_size(population, confidence, tolerance))
+            stats = DataLayer.instance.verify_get_stats()
+            self.__io.write_line(f" Sample size   : {stats['#files']}")
+        self.__io.write_line('')
+
+        self.__io.sub_title('Verifying')
+
+        progress = ProgressBar(self.__io.output, stats['#files'])
+        self.__mismatches = []
+        self.__skip_count = 0
+        file_count = 0
+        digest_count = 0
+        total_size = 0
+        with Metrics.instance.phase('verify') as metrics:
+            with ThreadPoolExecutor(max_workers=self.__workers) as executor:
+                for rows in DataLayer.instance.verify_yield_files():
+                    results = executor.map(lambda row: self.__verify_file(*row), rows)
+                    for (_, clone_path, _, digest), (reason, size) in zip(rows, results):
+                        if reason == 'skipped':
+                            self.__skip_count += 1
+                        elif reason is not None:
+                            self.__mismatches.append((reason, clone_path))
+                        else:
+                            file_count += 1
+                        if digest is not None:
+                            digest_count += 1
+                        total_size += size
+                        progress.count += 1
+                        progress.bytes += size
+
+            progress.finish()
+            metrics['entries'] = file_count + len(self.__mismatches)
+            metrics['bytes'] = total_size
+
+        metrics = Metrics.instance.phases['verify']
+
+        self.__io.write_line('')
+        self.__io.write_line(f' Number of files verified       : {file_count + len(self.__mismatches)}')
+        self.__io.write_line(f' Verified against their digests : {digest_count}')
+        self.__io.write_line(f' Number of mismatches           : {len(self.__mismatches)}')
+        self.__io.write_line(f' Number of files skipped        : {self.__skip_count}')
+        self.__io.write_line(f' Total bytes read               : {sizeof_fmt(total_size)} ({total_size}B)')
+        self.__io.write_line(f" Throughput                     : {metrics['entries_per_sec']:.0f} files/s, "
+                             f"{sizeof_fmt(metrics['bytes_per_sec'])}/s")
+        self.__io.write_line('')
+
+        if self.__mismatches:
+            self.__io.sub_title('Mismatches')
+            self.__io.listing(f'{reason}: <fso>{path}</fso>' for reason, path in self.__mismatches)
+        elif confidence is not None and population > stats['#files']:
+            self.__io.write_line(f' No mismatches found: with a confidence of {confidence:.1%} less than '
+                                 f'{tolerance:.1%} of the files in scope are corrupt.')
+            self.__io.write_line('')
+
+        return len(self.__mismatches)
+
+# ----------------------------------------------------------------------------------------------------------------------
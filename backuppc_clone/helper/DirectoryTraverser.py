@@ -0,0 +1,222 @@
+import collections
+import os
+import queue
+import subprocess
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+class DirectoryTraverser:
+    """
+    Traverses recursively a directory with different strategies and counts the directories and files.
+    """
+    strategies: List[str] = ['recursive', 'iterative', 'threaded', 'fwalk', 'find']
+    """
+    The names of the available strategies.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, stat: bool = False, workers: int = 8):
+        """
+        Object constructor.
+
+        @param bool stat: If True stat must be called for each entry.
+        @param int workers: The number of worker threads of the threaded strategy.
+        """
+        self.__stat: bool = stat
+        """
+        If True stat must be called for each entry.
+        """
+
+        self.__workers: int = workers
+        """
+        The number of worker threads of the threaded strategy.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __scan(self, path: str) -> Tuple[int, int, List[str]]:
+        """
+        Scans a single directory. Returns the number of subdirectories, the number of files, and the paths to the
+        subdirectories.
+
+        @param str path: The path to the directory.
+        """
+        dir_count = 0
+        file_count = 0
+        dirs = []
+        for entry in os.scandir(path):
+            if self.__stat and not entry.is_symlink():
+                entry.stat()
+
+            if entry.is_file():
+                file_count += 1
+
+            elif entry.is_dir():
+                dirs.append(entry.path)
+                dir_count += 1
+
+        return dir_count, file_count, dirs
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __traverse_recursive(self, path: str) -> Tuple[int, int]:
+        """
+        Traverses recursively a directory with os.scandir.
+
+        @param str path: The path to the directory.
+        """
+        dir_count, file_count, dirs = self.__scan(path)
+        for sub_path in dirs:
+            sub_dir_count, sub_file_count = self.__traverse_recursive(sub_path)
+            dir_count += sub_dir_count
+            file_count += sub_file_count
+
+        return dir_count, file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __traverse_iterative(self, path: str) -> Tuple[int, int]:
+        """
+        Traverses a directory with os.scandir and a queue of directories.
+
+        @param str path: The path to the directory.
+        """
+        dir_count = 0
+        file_count = 0
+        paths = collections.deque([path])
+        while paths:
+            sub_dir_count, sub_file_count, dirs = self.__scan(paths.popleft())
+            dir_count += sub_dir_count
+            file_count += sub_file_count
+            paths.extend(dirs)
+
+        return dir_count, file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __traverse_threaded(self, path: str) -> Tuple[int, int]:
+        """
+        Traverses a directory with os.scandir in worker threads sharing a queue of directories.
+
+        @param str path: The path to the directory.
+        """
+        paths = queue.Queue()
+        counts = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            dir_count = 0
+            file_count = 0
+            while True:
+                sub_path = paths.get()
+                if sub_path is None:
+                    paths.task_done()
+                    break
+
+                try:
+                    # After an error the remaining directories are drained without scanning.
+                    if not errors:
+                        sub_dir_count, sub_file_count, dirs = self.__scan(sub_path)
+                        dir_count += sub_dir_count
+                        file_count += sub_file_count
+                        for dir_path in dirs:
+                            paths.put(dir_path)
+                except OSError as error:
+                    with lock:
+                        errors.append(error)
+                finally:
+                    paths.task_done()
+
+            with lock:
+                counts.append((dir_count, file_count))
+
+        paths.put(path)
+        threads = [threading.Thread(target=worker) for _ in range(self.__workers)]
+        for thread in threads:
+            thread.start()
+
+        paths.join()
+        for _ in threads:
+            paths.put(None)
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        return sum(count[0] for count in counts), sum(count[1] for count in counts)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __traverse_fwalk(self, path: str) -> Tuple[int, int]:
+        """
+        Traverses a directory with os.fwalk, i.e. relative to file descriptors of directories.
+
+        @param str path: The path to the directory.
+        """
+        dir_count = 0
+        file_count = 0
+        for _, dirs, files, dir_fd in os.fwalk(path):
+            if self.__stat:
+                for name in files:
+                    os.stat(name, dir_fd=dir_fd, follow_symlinks=False)
+            dir_count += len(dirs)
+            file_count += len(files)
+
+        return dir_count, file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __traverse_find(self, path: str) -> Tuple[int, int]:
+        """
+        Traverses a directory with find and parses its output stream.
+
+        @param str path: The path to the directory.
+        """
+        # The size (%s) forces find to stat each entry, the type (%y) alone does not.
+        fmt = '%y %s\\n' if self.__stat else '%y\\n'
+        process = subprocess.Popen(['find', path, '-mindepth', '1', '-printf', fmt], stdout=subprocess.PIPE)
+
+        counts: Dict[int, int] = collections.Counter()
+        for line in process.stdout:
+            counts[line[0]] += 1
+        process.wait()
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, 'find')
+
+        return counts[ord('d')], counts[ord('f')]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def traverse(self, strategy: str, path: str) -> Tuple[int, int]:
+        """
+        Traverses a directory with a strategy. Returns the number of directories and files under the directory.
+
+        @param str strategy: The name of the strategy.
+        @param str path: The path to the directory.
+        """
+        methods: Dict[str, Callable[[str], Tuple[int, int]]] = {'recursive': self.__traverse_recursive,
+                                                                'iterative': self.__traverse_iterative,
+                                                                'threaded':  self.__traverse_threaded,
+                                                                'fwalk':     self.__traverse_fwalk,
+                                                                'find':      self.__traverse_find}
+
+        return methods[strategy](path)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def evict(path: str) -> None:
+        """
+        Advises the kernel to drop the cached pages of all files and directories under a directory. Note: the dentry
+        and inode caches can only be dropped by root, hence cold runs are colder but not cold.
+
+        @param str path: The path to the directory.
+        """
+        for _, _, files, dir_fd in os.fwalk(path):
+            os.posix_fadvise(dir_fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            for name in files:
+                try:
+                    fd = os.open(name, os.O_RDONLY | os.O_NOFOLLOW, dir_fd=dir_fd)
+                except OSError:
+                    continue
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                finally:
+                    os.close(fd)
+
+# ----------------------------------------------------------------------------------------------------------------------
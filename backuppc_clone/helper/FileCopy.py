@@ -0,0 +1,176 @@
+import errno
+import hashlib
+import mmap
+import os
+
+
+class FileCopy:
+    """
+    Copies files with (optionally) inline hashing, page cache management, and direct I/O.
+
+    Copying terabytes of pool files through the page cache evicts the dentry and inode caches the scans depend on. When
+    dropping the page cache is enabled the cached pages of the source and the target are dropped after each copy.
+    Note that the kernel drops clean pages only, pages of the target not yet written back remain cached (unless the
+    target has been flushed, e.g. in strict durability mode). Files of at least a given size are copied with O_DIRECT
+    bypassing the page cache entirely.
+    """
+    block_size: int = 1024 * 1024
+    """
+    The size of the blocks copied at once.
+    """
+
+    alignment: int = 4096
+    """
+    The alignment of the size of blocks for direct I/O.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, digest: bool = False, drop_cache: bool = False, direct_io_size: int = 0):
+        """
+        Object constructor.
+
+        @param bool digest: Whether to compute the SHA-256 digest of the content while copying.
+        @param bool drop_cache: Whether to drop the cached pages of the source and the target after each copy.
+        @param int direct_io_size: The minimal size of files copied with direct I/O. 0 for no direct I/O.
+        """
+        self.__digest: bool = digest
+        """
+        Whether to compute the SHA-256 digest of the content while copying.
+        """
+
+        self.__drop_cache: bool = drop_cache
+        """
+        Whether to drop the cached pages of the source and the target after each copy.
+        """
+
+        self.__direct_io_size: int = direct_io_size
+        """
+        The minimal size of files copied with direct I/O.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def will_need(path: str) -> None:
+        """
+        Advises the kernel to read a file into the page cache in the background. Errors are ignored, prefetching is
+        only a hint.
+
+        @param str path: The path to the file.
+        """
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def dont_need(fd: int) -> None:
+        """
+        Advises the kernel to drop the cached pages of an open file.
+
+        @param int fd: The file descriptor.
+        """
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __copy_buffered(self, source_path: str, target_path: str) -> bytes | None:
+        """
+        Copies a file through the page cache. Without hashing the content is copied within the kernel.
+
+        @param str source_path: The path to the source file.
+        @param str target_path: The path to the target file.
+        """
+        digest = hashlib.sha256() if self.__digest else None
+        with open(source_path, 'rb') as source_file, open(target_path, 'wb') as target_file:
+            if digest is None:
+                source_fd = source_file.fileno()
+                target_fd = target_file.fileno()
+                offset = 0
+                while True:
+                    sent = os.sendfile(target_fd, source_fd, offset, self.block_size)
+                    if not sent:
+                        break
+                    offset += sent
+            else:
+                buffer = bytearray(self.block_size)
+                view = memoryview(buffer)
+                while True:
+                    size = source_file.readinto(buffer)
+                    if not size:
+                        break
+                    digest.update(view[:size])
+                    target_file.write(view[:size])
+                target_file.flush()
+
+            if self.__drop_cache:
+                self.dont_need(source_file.fileno())
+                self.dont_need(target_file.fileno())
+
+        return digest.digest() if digest is not None else None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __copy_direct(self, source_path: str, target_path: str) -> bytes | None:
+        """
+        Copies a file with direct I/O. The last block is padded to the alignment and the target is truncated
+        afterwards.
+
+        @param str source_path: The path to the source file.
+        @param str target_path: The path to the target file.
+        """
+        digest = hashlib.sha256() if self.__digest else None
+        with mmap.mmap(-1, self.block_size) as buffer:
+            view = memoryview(buffer)
+            try:
+                source_fd = os.open(source_path, os.O_RDONLY | os.O_DIRECT)
+                try:
+                    target_fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o600)
+                    try:
+                        total_size = 0
+                        while True:
+                            size = os.readv(source_fd, [buffer])
+                            if not size:
+                                break
+                            if digest is not None:
+                                digest.update(view[:size])
+                            aligned_size = -(-size // self.alignment) * self.alignment
+                            if os.write(target_fd, view[:aligned_size]) != aligned_size:
+                                raise OSError(errno.EIO, 'Short write', target_path)
+                            total_size += size
+                            if size < self.block_size:
+                                break
+                        os.ftruncate(target_fd, total_size)
+                    finally:
+                        os.close(target_fd)
+                finally:
+                    os.close(source_fd)
+            finally:
+                view.release()
+
+        return digest.digest() if digest is not None else None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def copy(self, source_path: str, target_path: str, size: int) -> bytes | None:
+        """
+        Copies the content of a file. Returns the SHA-256 digest of the content if hashing is enabled, otherwise None.
+        This method is thread safe.
+
+        @param str source_path: The path to the source file.
+        @param str target_path: The path to the target file.
+        @param int size: The size of the source file.
+        """
+        if self.__direct_io_size and size >= self.__direct_io_size:
+            try:
+                return self.__copy_direct(source_path, target_path)
+            except OSError as error:
+                # The filesystem does not support direct I/O (or its alignment requirements), fall back to buffered
+                # I/O.
+                if error.errno != errno.EINVAL:
+                    raise
+
+        return self.__copy_buffered(source_path, target_path)
+
+# ----------------------------------------------------------------------------------------------------------------------
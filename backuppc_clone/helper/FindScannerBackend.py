@@ -0,0 +1,211 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.helper.ScannerBackend import ScannerBackend
+from backuppc_clone.ProgressBar import ProgressBar
+
+
+class FindScannerBackend(ScannerBackend):
+    """
+    Scanner backend streaming the output of GNU find from a subprocess and parsing the output in large chunks. Avoids
+    the per entry overhead of DirEntry objects and Path objects in Python.
+
+    Like the native backend symbolic links to files are reported as files. Unlike the native backend symbolic links
+    to directories are not followed (BackupPC does not store symbolic links in its pools and host backups). Inodes are
+    written as reported by find, i.e. as decimal strings.
+    """
+    name = 'find'
+
+    chunk_size: int = 1024 * 1024
+    """
+    The number of bytes read at once from the output of find.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        self.__dir_count: int = 0
+        """
+        The directory count.
+        """
+
+        self.__entry_seq: int = 0
+        """
+        The entry sequence number.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __read(path: Path, directives: List[str]) -> Iterator[List[str]]:
+        """
+        Runs find on a directory and yields chunks of its output as flat lists of fields. Each entry under the
+        directory has one field per directive, e.g. the path to the parent directory, the name, the type, and the
+        inode. Chunks are decoded at once like os.fsdecode decodes a single path.
+
+        @param path: The path to the directory.
+        @param directives: The directives of -printf of find.
+        """
+        encoding = sys.getfilesystemencoding()
+        errors = sys.getfilesystemencodeerrors()
+        field_count = len(directives)
+
+        process = subprocess.Popen(['find', str(path), '-mindepth', '1', '-printf', '\\0'.join(directives) + '\\0'],
+                                   stdout=subprocess.PIPE)
+        pending = b''
+        carry = []
+        while True:
+            chunk = process.stdout.read(FindScannerBackend.chunk_size)
+            if not chunk:
+                break
+
+            buffer = pending + chunk
+            end = buffer.rfind(b'\0')
+            if end == -1:
+                pending = buffer
+                continue
+
+            fields = carry + buffer[:end].decode(encoding, errors).split('\0')
+            pending = buffer[end + 1:]
+            cut = len(fields) - len(fields) % field_count
+            carry = fields[cut:]
+            del fields[cut:]
+
+            yield fields
+
+        process.stdout.close()
+        process.wait()
+        if process.returncode != 0 or pending or carry:
+            raise BackupPcCloneException(f'Scanning {path} with find failed with exit status {process.returncode}')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __is_file(parent: str, name: str) -> bool:
+        """
+        Returns whether a symbolic link points to a file.
+
+        @param parent: The path to the parent directory of the symbolic link.
+        @param name: The name of the symbolic link.
+        """
+        return os.path.isfile(os.path.join(parent, name))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def scan_pool(self, parent_path: Path, dir_name: Path, csv_writer, progress: ProgressBar) -> int:
+        """
+        Scans recursively a directory of a pool and writes the inode, the directory (relative to the parent
+        directory), and the name of each file in CSV format. Advances the progress by one per directory. Returns the
+        number of found files.
+
+        @param parent_path: The path to the parent directory.
+        @param dir_name: The name of the directory relative to the parent directory.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        path = parent_path.joinpath(dir_name)
+
+        # The directories relative to the parent directory as written by the native backend. find reports a directory
+        # before its entries.
+        dir_names: Dict[str, str] = {str(path): str(dir_name)}
+        file_count = 0
+
+        for fields in self.__read(path, ['%h', '%f', '%y', '%i']):
+            entries = list(zip(fields[0::4], fields[1::4], fields[2::4], fields[3::4]))
+            for parent, name, kind, _ in entries:
+                if kind == 'd':
+                    base = dir_names[parent]
+                    dir_names[f'{parent}/{name}'] = name if base == '.' else f'{base}/{name}'
+                    progress.count += 1
+
+            rows = [(inode, dir_names[parent], name) for parent, name, kind, inode in entries if kind == 'f']
+            rows.extend((inode, dir_names[parent], name) for parent, name, kind, inode in entries
+                        if kind == 'l' and self.__is_file(parent, name))
+
+            csv_writer.writerows(rows)
+            file_count += len(rows)
+
+        # The directory itself.
+        progress.count += 1
+
+        return file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __close_backup_dir(self, dir_name: str | None, files: List[Tuple], csv_writer) -> None:
+        """
+        Writes the files of a directory of a host backup of which all entries have been found.
+
+        @param dir_name: The name of the directory relative to the host backup.
+        @param files: The files of the directory.
+        @param csv_writer: The CSV writer.
+        """
+        if files:
+            self.__entry_seq += 1
+            csv_writer.writerows([(self.__entry_seq, inode, dir_name, name, size, nlink, mtime)
+                                  for inode, name, size, nlink, mtime in files])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def scan_backup(self, backup_path: Path, csv_writer, progress: ProgressBar) -> Tuple[int, int]:
+        """
+        Scans recursively a host backup and writes the entry sequence number, the inode, the directory (relative to
+        the host backup), and the name of each file and directory, and the size, the number of links, and the mtime of
+        each file in CSV format. Directories are visited depth first in the order of find. A directory is written as
+        soon as it is found and the files of a directory are written as soon as find has left the directory. Sets the
+        progress to the number of found files. Returns the number of found directories and files.
+
+        @param backup_path: The path to the host backup.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        self.__dir_count = 0
+        self.__entry_seq = 0
+
+        # find reports the entries of a directory and its subdirectories contiguously, hence only the files of the
+        # directories on the path to the current directory are kept: tuples (path as reported by find, directory
+        # relative to the host backup, files).
+        stack: List[Tuple[str, str | None, List[Tuple]]] = [(str(backup_path), None, [])]
+        file_count = 0
+        for fields in self.__read(backup_path, ['%h', '%f', '%y', '%i', '%s', '%n', '%Ts']):
+            for parent, name, kind, inode, size, nlink, mtime in zip(fields[0::7],
+                                                                     fields[1::7],
+                                                                     fields[2::7],
+                                                                     fields[3::7],
+                                                                     fields[4::7],
+                                                                     fields[5::7],
+                                                                     fields[6::7]):
+                if kind == 'l' and self.__is_file(parent, name):
+                    # Like the native backend report the size, links, and mtime of the target.
+                    stat = os.stat(os.path.join(parent, name))
+                    kind, size, nlink, mtime = 'f', stat.st_size, stat.st_nlink, int(stat.st_mtime)
+
+                if kind != 'f' and kind != 'd':
+                    continue
+
+                while stack[-1][0] != parent:
+                    _, dir_name, files = stack.pop()
+                    self.__close_backup_dir(dir_name, files, csv_writer)
+                    if not stack:
+                        raise BackupPcCloneException(f'Unexpected entry {parent}/{name} in output of find')
+
+                _, dir_name, files = stack[-1]
+                if kind == 'f':
+                    files.append((inode, name, size, nlink, mtime))
+                    file_count += 1
+                else:
+                    self.__entry_seq += 1
+                    self.__dir_count += 1
+                    csv_writer.writerow((self.__entry_seq, None, dir_name, name, None, None, None))
+                    stack.append((f'{parent}/{name}', f'{dir_name}/{name}' if dir_name else name, []))
+
+            progress.count = file_count
+
+        while stack:
+            _, dir_name, files = stack.pop()
+            self.__close_backup_dir(dir_name, files, csv_writer)
+
+        return self.__dir_count, file_count
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,148 @@
+import os
+from pathlib import Path
+from typing import Tuple
+
+from backuppc_clone.helper.ScannerBackend import ScannerBackend
+from backuppc_clone.IoGovernor import IoGovernor
+from backuppc_clone.ProgressBar import ProgressBar
+
+
+class NativeScannerBackend(ScannerBackend):
+    """
+    Scanner backend using os.scandir.
+    """
+    name = 'native'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        """
+        Object constructor.
+        """
+        self.__dir_count: int = 0
+        """
+        The directory count.
+        """
+
+        self.__file_count: int = 0
+        """
+        The file count.
+        """
+
+        self.__entry_seq: int = 0
+        """
+        The entry sequence number.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __scan_pool_helper(self, parent_path: Path, dir_name: Path, csv_writer, progress: ProgressBar) -> None:
+        """
+        Scans recursively a directory of a pool.
+
+        @param parent_path: The path to the parent directory.
+        @param dir_name: The name of the directory.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        rows = []
+        sub_dir_names = []
+        with IoGovernor.instance.operation():
+            for entry in os.scandir(parent_path.joinpath(dir_name)):
+                if entry.is_file():
+                    rows.append((entry.inode(), dir_name, entry.name))
+
+                elif entry.is_dir():
+                    sub_dir_names.append(entry.name)
+
+        # The rows are written without holding a slot of the I/O governor, the writer might block.
+        self.__file_count += len(rows)
+        csv_writer.writerows(rows)
+
+        for sub_dir_name in sub_dir_names:
+            self.__scan_pool_helper(parent_path, dir_name.joinpath(sub_dir_name), csv_writer, progress)
+
+        progress.count += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def scan_pool(self, parent_path: Path, dir_name: Path, csv_writer, progress: ProgressBar) -> int:
+        """
+        Scans recursively a directory of a pool and writes the inode, the directory (relative to the parent
+        directory), and the name of each file in CSV format. Advances the progress by one per directory. Returns the
+        number of found files.
+
+        @param parent_path: The path to the parent directory.
+        @param dir_name: The name of the directory relative to the parent directory.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        self.__file_count = 0
+        self.__scan_pool_helper(parent_path, dir_name, csv_writer, progress)
+
+        return self.__file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __scan_backup_helper(self, parent_dir_path: Path, dir_name: Path | None, csv_writer, progress: ProgressBar) \
+            -> None:
+        """
+        Scans recursively a directory of a host backup.
+
+        @param parent_dir_path: The path to the parent directory.
+        @param dir_name: The name of the directory.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        target_path = parent_dir_path.joinpath(dir_name) if dir_name else parent_dir_path
+
+        rows = []
+        sub_dir_names = []
+        with IoGovernor.instance.operation():
+            for entry in os.scandir(target_path):
+                if entry.is_file():
+                    if not rows:
+                        self.__entry_seq += 1
+                    stat = entry.stat()
+                    rows.append((self.__entry_seq,
+                                 entry.inode(),
+                                 dir_name,
+                                 entry.name,
+                                 stat.st_size,
+                                 stat.st_nlink,
+                                 int(stat.st_mtime)))
+
+                elif entry.is_dir():
+                    sub_dir_names.append(entry.name)
+
+        # The rows are written without holding a slot of the I/O governor, the writer (e.g. a BackupChunkWriter of a
+        # pipeline) might block until the consumer, which needs a slot as well, has caught up.
+        self.__file_count += len(rows)
+        csv_writer.writerows(rows)
+
+        # Update the progress once per directory. Note: the file count includes the attrib files of BackupPC.
+        progress.count = self.__file_count
+
+        for sub_dir_name in sorted(sub_dir_names):
+            self.__entry_seq += 1
+            self.__dir_count += 1
+            csv_writer.writerow((self.__entry_seq, None, dir_name, sub_dir_name, None, None, None))
+            sub_dir_path = dir_name.joinpath(sub_dir_name) if dir_name else Path(sub_dir_name)
+            self.__scan_backup_helper(parent_dir_path, sub_dir_path, csv_writer, progress)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def scan_backup(self, backup_path: Path, csv_writer, progress: ProgressBar) -> Tuple[int, int]:
+        """
+        Scans recursively a host backup and writes the entry sequence number, the inode, the directory (relative to
+        the host backup), and the name of each file and directory, and the size, the number of links, and the mtime of
+        each file in CSV format. Directories are visited depth first in sorted order. Sets the progress to the number of
+        found files. Returns the number of found directories and files.
+
+        @param backup_path: The path to the host backup.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        self.__dir_count = 0
+        self.__file_count = 0
+        self.__entry_seq = 0
+        self.__scan_backup_helper(backup_path, None, csv_writer, progress)
+
+        return self.__dir_count, self.__file_count
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,185 @@
+import bisect
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+from backuppc_clone.DataLayer import DataLayer
+
+
+class PoolIndex:
+    """
+    A read-only index of the original pool in a file next to the metadata database. Maps the inode numbers of the
+    original pool to the paths of the pool files.
+
+    The file consists of a header (magic, the timestamp of the pool synchronization the file was built for, and the
+    number of pool files), the sorted inode numbers, the offsets of the paths, and the paths. The file is mapped into
+    memory and an inode number is found by a binary search on the mapped inode numbers. Hence, all processes (e.g. the
+    forked children of the auto command) and threads that open the index share the pages of the file through the page
+    cache and the index can be used without accessing the metadata database.
+    """
+    magic: bytes = b'BKCPIDX1'
+    """
+    The magic at the start of the file.
+    """
+
+    __header: struct.Struct = struct.Struct('=8sQQ')
+    """
+    The layout of the header of the file.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, path: Path):
+        """
+        Object constructor. Maps a pool index file into memory.
+
+        @param Path path: The path to the pool index file.
+        """
+        with open(path, 'rb') as handle:
+            self.__mmap: mmap.mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            """
+            The mapped file.
+            """
+
+        magic, stamp, count = self.__header.unpack_from(self.__mmap)
+        if magic != self.magic:
+            self.__mmap.close()
+            raise ValueError(f'{path} is not a pool index file')
+
+        self.__stamp: int = stamp
+        """
+        The timestamp of the pool synchronization the index was built for.
+        """
+
+        self.__count: int = count
+        """
+        The number of pool files in the index.
+        """
+
+        start = self.__header.size
+        self.__inodes: memoryview = memoryview(self.__mmap)[start:start + 8 * self.__count].cast('Q')
+        """
+        The sorted inode numbers of the pool files.
+        """
+
+        start += 8 * self.__count
+        self.__offsets: memoryview = memoryview(self.__mmap)[start:start + 8 * (self.__count + 1)].cast('Q')
+        """
+        The offsets of the paths of the pool files relative to the start of the paths.
+        """
+
+        self.__paths_start: int = start + 8 * (self.__count + 1)
+        """
+        The offset of the paths of the pool files in the file.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def count(self) -> int:
+        """
+        Returns the number of pool files in the index.
+        """
+        return self.__count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def stamp(self) -> int:
+        """
+        Returns the timestamp of the pool synchronization the index was built for.
+        """
+        return self.__stamp
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def build(path: Path, stamp: int) -> int:
+        """
+        Builds the pool index file from the pool metadata in one pass over the index on the inode numbers of the pool.
+        The file is replaced atomically, processes that have mapped the previous file keep using the previous file.
+        Returns the number of pool files in the index.
+
+        @param Path path: The path to the pool index file.
+        @param int stamp: The timestamp of the pool synchronization.
+        """
+        count = 0
+        offset = 0
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as handle, \
+                tempfile.TemporaryFile(dir=path.parent) as offsets, \
+                tempfile.TemporaryFile(dir=path.parent) as paths:
+            handle.write(PoolIndex.__header.pack(PoolIndex.magic, stamp, 0))
+            for rows in DataLayer.instance.pool_yield_index():
+                handle.write(struct.pack(f'={len(rows)}Q', *(row[0] for row in rows)))
+                buffer = bytearray()
+                for _, bpl_dir, bpl_name in rows:
+                    offsets.write(struct.pack('=Q', offset + len(buffer)))
+                    buffer += f'{bpl_dir}/{bpl_name}'.encode()
+                paths.write(buffer)
+                offset += len(buffer)
+                count += len(rows)
+            offsets.write(struct.pack('=Q', offset))
+
+            offsets.seek(0)
+            shutil.copyfileobj(offsets, handle)
+            paths.seek(0)
+            shutil.copyfileobj(paths, handle)
+
+            handle.seek(0)
+            handle.write(PoolIndex.__header.pack(PoolIndex.magic, stamp, count))
+
+        os.replace(tmp_path, path)
+
+        return count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def open(path: Path, stamp: int):
+        """
+        Returns the pool index if the pool index file exists and has been built for a pool synchronization. Returns
+        None otherwise.
+
+        @param Path path: The path to the pool index file.
+        @param int stamp: The timestamp of the pool synchronization.
+
+        :rtype: PoolIndex|None
+        """
+        try:
+            pool_index = PoolIndex(path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+        if pool_index.stamp != stamp:
+            pool_index.close()
+            return None
+
+        return pool_index
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def lookup(self, inode: int) -> Tuple[str, str] | None:
+        """
+        Returns the directory and name of the pool file with an inode number relative to the top directory. Returns
+        None if the inode number is not in the pool. This method is thread safe.
+
+        @param int inode: The inode number of the file in the original.
+        """
+        index = bisect.bisect_left(self.__inodes, inode)
+        if index == self.__count or self.__inodes[index] != inode:
+            return None
+
+        path = self.__mmap[self.__paths_start + self.__offsets[index]:self.__paths_start + self.__offsets[index + 1]]
+        bpl_dir, _, bpl_name = path.decode().rpartition('/')
+
+        return bpl_dir, bpl_name
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def close(self) -> None:
+        """
+        Unmaps the pool index file.
+        """
+        self.__inodes.release()
+        self.__offsets.release()
+        self.__mmap.close()
+
+# ----------------------------------------------------------------------------------------------------------------------
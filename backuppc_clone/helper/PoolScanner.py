@@ -1,9 +1,9 @@
 import csv
-import os
 from pathlib import Path
 from typing import List
 
 from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.helper.ScannerBackend import ScannerBackend
 from backuppc_clone.ProgressBar import ProgressBar
 
 
@@ -55,29 +55,6 @@ class PoolScanner:
 
         return 1
 
-    # ------------------------------------------------------------------------------------------------------------------
-    def __scan_directory_helper2(self, parent_path1: Path, dir_name: Path, csv_writer) -> None:
-        """
-        Scans recursively a list of directories and stores filenames and directories in CSV format.
-
-        @param parent_path: The name of the parent directory.
-        @param dir_name: The name of the directory.
-        @param csv_writer: The CSV writer.
-        """
-        sub_dir_names = []
-        for entry in os.scandir(parent_path1.joinpath(dir_name)):
-            if entry.is_file():
-                self.__file_count += 1
-                csv_writer.writerow((entry.inode(), dir_name, entry.name))
-
-            elif entry.is_dir():
-                sub_dir_names.append(entry.name)
-
-        for sub_dir_name in sub_dir_names:
-            self.__scan_directory_helper2(parent_path1,  dir_name.joinpath(sub_dir_name), csv_writer)
-
-        self.__progress.advance()
-
     # ------------------------------------------------------------------------------------------------------------------
     def __scan_directory_helper1(self, parent_path: Path, dir_name: Path, csv_writer) -> None:
         """
@@ -92,10 +69,11 @@ class PoolScanner:
         self.__io.write_line(f' Scanning <fso>{dir_target}</fso>')
         self.__io.write_line('')
 
+        backend = ScannerBackend.get(self.__io, dir_target)
         dir_count = self.__get_number_of_pool_dirs(dir_target)
-        self.__progress = ProgressBar(self.__io, dir_count)
+        self.__progress = ProgressBar(self.__io, dir_count, 'directories')
 
-        self.__scan_directory_helper2(parent_path, dir_name, csv_writer)
+        self.__file_count += backend.scan_pool(parent_path, dir_name, csv_writer, self.__progress)
 
         self.__progress.finish()
         self.__io.write_line('')
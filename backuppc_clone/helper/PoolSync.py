@@ -5,7 +5,9 @@ from pathlib import Path
 from backuppc_clone.Config import Config
 from backuppc_clone.DataLayer import DataLayer
 from backuppc_clone.ProgressBar import ProgressBar
+from backuppc_clone.helper.PoolIndex import PoolIndex
 from backuppc_clone.helper.PoolScanner import PoolScanner
+from backuppc_clone.Metrics import Metrics
 from backuppc_clone.CloneIO import CloneIO
 
 
@@ -41,21 +43,23 @@ class PoolSync:
 
         top_dir_clone = Config.instance.top_clone_path
         count = 0
-        for rows in DataLayer.instance.clone_pool_obsolete_files_yield():
-            for row in rows:
-                try:
-                    path = os.path.join(top_dir_clone, row['bpl_dir'], row['bpl_name'])
-                    self.__io.log_very_verbose(f'Removing <fso>{path}</fso>')
-                    os.remove(path)
-                    count += 1
-                except FileNotFoundError:
-                    # Nothing to do.
-                    pass
-
-                DataLayer.instance.pool_delete_row(row['bpl_id'])
-                progress.advance()
-
-        progress.finish()
+        with Metrics.instance.phase('pool_remove_obsolete') as metrics:
+            for rows in DataLayer.instance.clone_pool_obsolete_files_yield():
+                for bpl_id, bpl_dir, bpl_name in rows:
+                    try:
+                        path = os.path.join(top_dir_clone, bpl_dir, bpl_name)
+                        self.__io.log_very_verbose(f'Removing <fso>{path}</fso>')
+                        os.remove(path)
+                        count += 1
+                    except FileNotFoundError:
+                        # Nothing to do.
+                        pass
+
+                    DataLayer.instance.pool_delete_row(bpl_id)
+                    progress.count += 1
+
+            progress.finish()
+            metrics['entries'] = count
 
         self.__io.write_line('')
         self.__io.write_line(f' Files removed: {count}')
@@ -70,8 +74,10 @@ class PoolSync:
         """
         self.__io.sub_title('Original pool')
 
-        scanner = PoolScanner(self.__io)
-        scanner.scan_directory(Config.instance.top_original_path, ['pool', 'cpool'], csv_path)
+        with Metrics.instance.phase('pool_scan_original') as metrics:
+            scanner = PoolScanner(self.__io)
+            scanner.scan_directory(Config.instance.top_original_path, ['pool', 'cpool'], csv_path)
+            metrics['entries'] = scanner.count
 
         self.__io.write_line(f' Files found: {scanner.count}')
         self.__io.write_line('')
@@ -85,22 +91,33 @@ class PoolSync:
         """
         self.__io.sub_title('Clone pool')
 
-        scanner = PoolScanner(self.__io)
-        scanner.scan_directory(Config.instance.top_clone_path, ['pool', 'cpool'], csv_path)
+        with Metrics.instance.phase('pool_scan_clone') as metrics:
+            scanner = PoolScanner(self.__io)
+            scanner.scan_directory(Config.instance.top_clone_path, ['pool', 'cpool'], csv_path)
+            metrics['entries'] = scanner.count
 
         self.__io.write_line(f' Files found: {scanner.count}')
         self.__io.write_line('')
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __import_csv(self, csv_path: Path) -> None:
+    def __import_csv(self, csv_path: Path, phase: str) -> None:
         """
         Imports to CSV file with entries of the original pool into the SQLite database.
 
         @param csv_path: The path to the CSV file.
+        @param phase: The name of the phase for the metrics.
         """
         self.__io.log_verbose(f' Importing <fso>{csv_path}</fso> into <dbo>IMP_POOL</dbo>')
 
-        DataLayer.instance.import_csv('IMP_POOL', ['imp_inode', 'imp_dir', 'imp_name'], csv_path)
+        with Metrics.instance.phase(phase) as metrics:
+            metrics['entries'] = DataLayer.instance.import_csv('IMP_POOL',
+                                                               ['imp_inode', 'imp_dir', 'imp_name'],
+                                                               csv_path,
+                                                               presort=True)
+
+        metrics = Metrics.instance.phases[phase]
+        self.__io.log_verbose(f" Imported {metrics['entries']} rows in {metrics['duration']:.1f}s "
+                              f"({metrics['entries_per_sec']:.0f} rows/s)")
 
     # ------------------------------------------------------------------------------------------------------------------
     def __update_database_original(self) -> None:
@@ -126,23 +143,41 @@ class PoolSync:
         self.__io.write_line(f' Rows removed: {row_count}')
         self.__io.write_line('')
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def __build_pool_index(self) -> None:
+        """
+        Rebuilds the pool index file from the updated pool metadata.
+        """
+        self.__io.write_line(f' Building <fso>{Config.instance.pool_index_path}</fso>')
+        self.__io.write_line('')
+
+        with Metrics.instance.phase('pool_index') as metrics:
+            count = PoolIndex.build(Config.instance.pool_index_path, Config.instance.last_pool_scan)
+            metrics['entries'] = count
+
+        self.__io.write_line(f' Files indexed: {count}')
+        self.__io.write_line('')
+
     # ------------------------------------------------------------------------------------------------------------------
     def synchronize(self) -> None:
         """
-        Inventories the original pool, prunes the clone pool and maintains the database.
+        Inventories the original pool, prunes the clone pool and maintains the database. The pool index is rebuilt
+        only when host backups are cloned in a pipeline.
         """
         Config.instance.last_pool_scan = int(time.time())
 
         csv_path = Config.instance.tmp_clone_path.joinpath('pool.csv')
 
         self.__scan_clone_pool(csv_path)
-        self.__import_csv(csv_path)
+        self.__import_csv(csv_path, 'pool_import_clone')
         self.__update_database_clone()
 
         self.__scan_original_pool(csv_path)
-        self.__import_csv(csv_path)
+        self.__import_csv(csv_path, 'pool_import_original')
         self.__clone_pool_remove_obsolete()
         self.__update_database_original()
+        if Config.instance.copy_pipeline:
+            self.__build_pool_index()
 
 
 # ----------------------------------------------------------------------------------------------------------------------
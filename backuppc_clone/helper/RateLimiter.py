@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread safe limiter of the rate of an activity, e.g. the number of bytes read per second.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rate: float):
+        """
+        Object constructor.
+
+        @param float rate: The maximum rate in units per second. 0 for no limit.
+        """
+        self.__rate: float = rate
+        """
+        The maximum rate in units per second.
+        """
+
+        self.__available: float = time.monotonic()
+        """
+        The (monotonic) time at which the next unit is available.
+        """
+
+        self.__lock: threading.Lock = threading.Lock()
+        """
+        The lock for updating the time at which the next unit is available.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def rate(self) -> float:
+        """
+        Returns the maximum rate in units per second.
+        """
+        return self.__rate
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        """
+        Sets the maximum rate in units per second.
+
+        @param float rate: The maximum rate in units per second. 0 for no limit.
+        """
+        self.__rate = rate
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def acquire(self, amount: int) -> None:
+        """
+        Acquires a number of units. Blocks until the units are available.
+
+        @param int amount: The number of units.
+        """
+        rate = self.__rate
+        if rate <= 0:
+            return
+
+        with self.__lock:
+            now = time.monotonic()
+            # Unused capacity of the past is not saved up, hence no bursts after an idle period.
+            start = max(now, self.__available)
+            self.__available = start + amount / rate
+
+        if start > now:
+            time.sleep(start - now)
+
+# ----------------------------------------------------------------------------------------------------------------------
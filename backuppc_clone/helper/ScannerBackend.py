@@ -0,0 +1,164 @@
+import abc
+import csv
+import os
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+from cleo.io.outputs.null_output import NullOutput
+
+from backuppc_clone.CloneIO import CloneIO
+from backuppc_clone.Config import Config
+from backuppc_clone.exception.BackupPcCloneException import BackupPcCloneException
+from backuppc_clone.IoGovernor import IoGovernor
+from backuppc_clone.ProgressBar import ProgressBar
+
+
+class ScannerBackend(metaclass=abc.ABCMeta):
+    """
+    Abstract parent class for backends scanning the pools and host backups. All backends write identical records, but
+    the order of the records of a host backup depends on the backend.
+    """
+    name: str = ''
+    """
+    The name of the backend.
+    """
+
+    min_sample_size: int = 1000
+    """
+    The minimal number of files in the sample for selecting a backend automatically. On smaller samples the native
+    backend is selected.
+    """
+
+    __selected = None
+    """
+    The backend selected for this process.
+
+    :type __selected: backuppc_clone.helper.ScannerBackend.ScannerBackend|None
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @abc.abstractmethod
+    def scan_pool(self, parent_path: Path, dir_name: Path, csv_writer, progress: ProgressBar) -> int:
+        """
+        Scans recursively a directory of a pool and writes the inode, the directory (relative to the parent
+        directory), and the name of each file in CSV format. Advances the progress by one per directory. Returns the
+        number of found files.
+
+        @param parent_path: The path to the parent directory.
+        @param dir_name: The name of the directory relative to the parent directory.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @abc.abstractmethod
+    def scan_backup(self, backup_path: Path, csv_writer, progress: ProgressBar) -> Tuple[int, int]:
+        """
+        Scans recursively a host backup and writes the entry sequence number, the inode, the directory (relative to
+        the host backup), and the name of each file and directory, and the size, the number of links, and the mtime of
+        each file in CSV format. Directories are visited depth first. A directory is written before its entries and the
+        files of a directory share one entry sequence number. Sets the progress to the number of found files. Returns
+        the number of found directories and files.
+
+        @param backup_path: The path to the host backup.
+        @param csv_writer: The CSV writer.
+        @param progress: The progress bar.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __sample_path(path: Path) -> Path:
+        """
+        Returns the path to a small subdirectory of a directory for benchmarking the backends.
+
+        @param path: The path to the directory.
+        """
+        for _ in range(2):
+            sub_dir_names = sorted(entry.name for entry in os.scandir(path) if entry.is_dir())
+            if not sub_dir_names:
+                break
+            path = path.joinpath(sub_dir_names[0])
+
+        return path
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def __benchmark(io: CloneIO, backends: Dict[str, type], path: Path) -> Tuple[str, int]:
+        """
+        Scans a small subdirectory of a directory with each backend. Returns the name of the fastest backend and the
+        number of files in the subdirectory.
+
+        @param io: The output style.
+        @param backends: The available backends.
+        @param path: The path to the directory.
+        """
+        sample_path = ScannerBackend.__sample_path(path)
+        durations = {name: float('inf') for name in backends}
+        file_count = 0
+        with open(os.devnull, 'w') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            # Two alternating rounds such that no backend benefits systematically from a cache warmed by another
+            # backend.
+            for _ in range(2):
+                for name, backend_class in backends.items():
+                    progress = ProgressBar(NullOutput())
+                    start = time.perf_counter()
+                    try:
+                        file_count = backend_class().scan_pool(sample_path.parent,
+                                                               Path(sample_path.name),
+                                                               csv_writer,
+                                                               progress)
+                        durations[name] = min(durations[name], time.perf_counter() - start)
+                    except (OSError, BackupPcCloneException):
+                        pass
+                    progress.finish()
+
+        name = min(durations, key=durations.get)
+        io.log_verbose('Fastest scanner backend {} ({} on {} files in <fso>{}</fso>)'.
+                       format(name,
+                              ', '.join(f'{key} {duration:.3f}s' for key, duration in durations.items()),
+                              file_count,
+                              sample_path))
+
+        return name, file_count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def get(io: CloneIO, path: Path):
+        """
+        Returns the scanner backend of this process. When the configured backend is auto the fastest backend on a
+        small subdirectory of the directory to be scanned is selected (if the subdirectory is large enough for a
+        meaningful comparison). When the I/O is throttled by the I/O governor auto selects the native backend.
+
+        @param io: The output style.
+        @param path: The path to the directory to be scanned.
+
+        :rtype: backuppc_clone.helper.ScannerBackend.ScannerBackend
+        """
+        if ScannerBackend.__selected is None:
+            from backuppc_clone.helper.FindScannerBackend import FindScannerBackend
+            from backuppc_clone.helper.NativeScannerBackend import NativeScannerBackend
+
+            backends = {NativeScannerBackend.name: NativeScannerBackend,
+                        FindScannerBackend.name:   FindScannerBackend}
+
+            name = Config.instance.scanner_backend
+            if name == 'auto' and IoGovernor.instance.throttling:
+                # The I/O of the find backend runs in a subprocess and can not be governed.
+                name = NativeScannerBackend.name
+            elif name == 'auto':
+                name, file_count = ScannerBackend.__benchmark(io, backends, path)
+                if file_count < ScannerBackend.min_sample_size:
+                    name = NativeScannerBackend.name
+            elif name not in backends:
+                raise BackupPcCloneException('Unknown scanner backend {}, available backends: {}, auto'.
+                                             format(name, ', '.join(backends)))
+
+            ScannerBackend.__selected = backends[name]()
+
+        return ScannerBackend.__selected
+
+# ----------------------------------------------------------------------------------------------------------------------
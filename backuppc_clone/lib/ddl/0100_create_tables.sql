@@ -37,6 +37,9 @@ CREATE TABLE BKC_BACKUP_TREE (
   bbt_inode_original INTEGER,
   bbt_dir TEXT,
   bbt_name TEXT,
+  bbt_size INTEGER,
+  bbt_nlink INTEGER,
+  bbt_mtime INTEGER,
   PRIMARY KEY (bbt_id)
 );
 
@@ -45,14 +48,27 @@ COMMENT ON COLUMN BKC_BACKUP_TREE.bbt_inode_original
 The inode number in the original pool
 */
 
+/*
+COMMENT ON COLUMN BKC_BACKUP_TREE.bbt_nlink
+The number of links of the file in the original at the scan. A file with one link is not in the pool
+*/
+
 CREATE TABLE BKC_ORIGINAL_BACKUP (
   bob_host TEXT NOT NULL,
   bob_number INTEGER NOT NULL,
   bob_end_time INTEGER,
   bob_level INTEGER,
-  bob_type TEXT
+  bob_type TEXT,
+  bob_n_files INTEGER,
+  bob_size INTEGER,
+  bob_size_new INTEGER
 );
 
+/*
+COMMENT ON COLUMN BKC_ORIGINAL_BACKUP.bob_size_new
+The total size of the files of the backup that were new to the original pool
+*/
+
 CREATE TABLE BKC_PARAMETER (
   prm_code TEXT NOT NULL,
   prm_description TEXT NOT NULL,
@@ -67,49 +83,28 @@ CREATE TABLE BKC_POOL (
   bpl_name TEXT NOT NULL,
   bpl_size INTEGER,
   bpl_mtime INTEGER,
+  bpl_digest BLOB,
   PRIMARY KEY (bpl_id)
 );
 
-CREATE TABLE IMP_POOL (
-  imp_inode INTEGER NOT NULL,
-  imp_dir TEXT NOT NULL,
-  imp_name TEXT NOT NULL,
-  PRIMARY KEY (imp_inode)
-);
-
-CREATE TABLE TMP_BACKUP_TREE (
-  bpl_inode_original INTEGER,
-  bpl_dir TEXT,
-  bpl_name TEXT,
-  bbt_seq INTEGER,
-  bbt_inode_original INTEGER,
-  bbt_dir TEXT,
-  bbt_name TEXT
-);
-
-CREATE TABLE TMP_CLONE_POOL_OBSOLETE (
-  bpl_id INTEGER NOT NULL,
-  bpl_dir TEXT NOT NULL,
-  bpl_name TEXT NOT NULL
-);
-
-CREATE TABLE TMP_CLONE_POOL_REQUIRED (
-  bpl_inode_original INTEGER,
-  bpl_dir TEXT,
-  bpl_name TEXT
-);
+/*
+COMMENT ON COLUMN BKC_POOL.bpl_digest
+The SHA-256 digest of the content of the pool file computed while copying the pool file (if enabled)
+*/
 
-CREATE TABLE TMP_ID (
-  tmp_id INTEGER NOT NULL,
-  PRIMARY KEY (tmp_id)
+CREATE TABLE BKC_SCHEDULE_WORK (
+  bsw_host TEXT NOT NULL,
+  bsw_number INTEGER NOT NULL,
+  bsw_pool_sync INTEGER NOT NULL,
+  bsw_entries INTEGER NOT NULL,
+  bsw_files INTEGER NOT NULL,
+  bsw_bytes INTEGER
 );
 
-CREATE TABLE TMP_POOL (
-  tmp_inode INTEGER NOT NULL,
-  tmp_dir TEXT NOT NULL,
-  tmp_name TEXT NOT NULL,
-  PRIMARY KEY (tmp_inode)
-);
+/*
+COMMENT ON COLUMN BKC_SCHEDULE_WORK.bsw_pool_sync
+The timestamp of the pool synchronization (LAST_POOL_SYNC) the work of cloning the host backup was computed for
+*/
 
 /*================================================================================*/
 /* CREATE INDEXES                                                                 */
@@ -121,7 +116,8 @@ CREATE UNIQUE INDEX IX_BKC_BACKUP1 ON BKC_BACKUP (hst_id, bck_number);
 
 CREATE INDEX IX_BKC_BACKUP2 ON BKC_BACKUP (bck_number);
 
-CREATE INDEX IX_BKC_BACKUP_TREE1 ON BKC_BACKUP_TREE (bck_id);
+CREATE INDEX IX_BKC_BACKUP_TREE1 ON BKC_BACKUP_TREE (bck_id, bbt_seq, bbt_inode_original, bbt_nlink, bbt_size, bbt_dir,
+                                                    bbt_name);
 
 CREATE INDEX IX_BKC_BACKUP_TREE2 ON BKC_BACKUP_TREE (bbt_inode_original);
 
@@ -133,6 +129,8 @@ CREATE UNIQUE INDEX IX_BKC_POOL1 ON BKC_POOL (bpl_inode_clone);
 
 CREATE UNIQUE INDEX IX_BKC_POOL2 ON BKC_POOL (bpl_inode_original);
 
+CREATE UNIQUE INDEX IX_BKC_SCHEDULE_WORK1 ON BKC_SCHEDULE_WORK (bsw_host, bsw_number);
+
 /*================================================================================*/
 /* CREATE FOREIGN KEYS                                                            */
 /*================================================================================*/
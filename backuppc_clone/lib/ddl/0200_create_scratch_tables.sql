@@ -0,0 +1,67 @@
+/*================================================================================*/
+/* DDL SCRIPT                                                                     */
+/*================================================================================*/
+/*  Title    : BackupPC Clone                                                     */
+/*  FileName : backuppc-clone.ecm                                                 */
+/*  Platform : SQLite 3                                                           */
+/*  Version  :                                                                    */
+/*================================================================================*/
+/*================================================================================*/
+/* CREATE SCRATCH TABLES                                                          */
+/*================================================================================*/
+
+/* Executed by DataLayer.connect on the attached scratch database SCR.            */
+
+CREATE TABLE SCR.IMP_BACKUP_POOL (
+  imp_dir TEXT NOT NULL,
+  imp_name TEXT NOT NULL
+);
+
+CREATE TABLE SCR.IMP_POOL (
+  imp_inode INTEGER NOT NULL,
+  imp_dir TEXT NOT NULL,
+  imp_name TEXT NOT NULL,
+  PRIMARY KEY (imp_inode)
+);
+
+CREATE TABLE SCR.IMP_PRE_SCAN (
+  bbt_seq INTEGER,
+  bbt_inode_original INTEGER,
+  bbt_dir TEXT,
+  bbt_name TEXT,
+  bbt_size INTEGER,
+  bbt_nlink INTEGER,
+  bbt_mtime INTEGER
+);
+
+CREATE TABLE SCR.TMP_CLONE_POOL_OBSOLETE (
+  bpl_id INTEGER NOT NULL,
+  bpl_dir TEXT NOT NULL,
+  bpl_name TEXT NOT NULL
+);
+
+CREATE TABLE SCR.TMP_CLONE_POOL_REQUIRED (
+  bpl_inode_original INTEGER,
+  bpl_dir TEXT,
+  bpl_name TEXT,
+  bpl_size INTEGER
+);
+
+CREATE TABLE SCR.TMP_ID (
+  tmp_id INTEGER NOT NULL,
+  PRIMARY KEY (tmp_id)
+);
+
+CREATE TABLE SCR.TMP_POOL (
+  tmp_inode INTEGER NOT NULL,
+  tmp_dir TEXT NOT NULL,
+  tmp_name TEXT NOT NULL,
+  PRIMARY KEY (tmp_inode)
+);
+
+CREATE TABLE SCR.TMP_VERIFY (
+  vfy_original_path TEXT NOT NULL,
+  vfy_clone_path TEXT NOT NULL,
+  vfy_size INTEGER,
+  vfy_digest BLOB
+);
@@ -1,3 +1,6 @@
+import math
+
+
 def sizeof_fmt(num: int, suffix: str = 'B') -> str:
     """
     Returns the size in bytes in human-readable format.
@@ -13,3 +16,25 @@ def sizeof_fmt(num: int, suffix: str = 'B') -> str:
         num /= 1024.0
 
     return '%.1f%s%s' % (num, 'Yi', suffix)
+
+
+def time_fmt(secs: float) -> str:
+    """
+    Returns a duration in human-readable format, e.g. 5 secs, 3 mins, or 2 hrs.
+
+    @param float secs: The duration in seconds.
+
+    :rtype: str
+    """
+    if secs < 1:
+        return '< 1 sec'
+
+    for threshold, unit, divisor in [(60, 'sec', 1), (3600, 'min', 60), (86400, 'hr', 3600)]:
+        if secs < threshold:
+            break
+    else:
+        unit, divisor = 'day', 86400
+
+    count = math.ceil(secs / divisor)
+
+    return f'{count} {unit}' if count == 1 else f'{count} {unit}s'